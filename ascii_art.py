@@ -6,18 +6,24 @@ Beautiful ASCII art scenes and decorations for the text adventure game.
 
 import time
 
+from metrics import RENDER_BYTES
+from tracing import TRACER
+
 
 class AsciiArt:
     """Collection of ASCII art for various game scenes."""
     
-    def __init__(self):
-        pass
+    def __init__(self, animate=True):
+        self.animate = animate
         
     def display_with_delay(self, art, delay=0.1):
         """Display ASCII art with a slight delay for dramatic effect."""
-        for line in art.split('\n'):
-            print(line)
-            time.sleep(delay)
+        RENDER_BYTES.inc(len(art.encode()), "ascii_art")
+        with TRACER.span("render.ascii_art", chars=len(art)):
+            for line in art.split('\n'):
+                print(line)
+                if self.animate:
+                    time.sleep(delay)
             
     def display_title(self):
         """Display the main title ASCII art."""
@@ -0,0 +1,330 @@
+"""
+Benchmarks for Mystic Quest
+===========================
+Times the engine's hot paths so regressions show up: save/load/list at
+growing slot counts, ASCII art and menu rendering, GameSystems
+construction, headless playthroughs of each scene, and combat and event
+sampling.
+
+Every case is warmed up, then timed over several repeats, and reported as
+percentiles of the per-operation time. Results can be written as JSON and
+compared against an earlier run:
+
+    python benchmarks.py --json results.json
+    python benchmarks.py --compare results.json
+    python benchmarks.py --only save --slots 10,1000,100000
+    python benchmarks.py --only systems --memory
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from companion_ai import decide_for_parties
+from game_systems import GameSystems
+from headless_engine import HeadlessEngine, NullOutput
+from memory_profile import format_leak_check, leak_check, play_session, session_footprint
+from spell_engine import StatusEffects, TickScheduler
+from scenes.intro import IntroScene
+from scenes.forest import ForestScene
+from scenes.cave import CaveScene
+from scenes.boss import BossScene
+from scenes.ending import EndingScene
+from scenes.treasure import TreasureScene
+from scenes.mystical_library import MysticalLibraryScene
+from scenes.time_nexus import TimeNexusScene
+from scenes.adventurer_crossroads import AdventurerCrossroadsScene
+
+
+def percentile(sorted_values, fraction):
+    """Get a percentile from already sorted values."""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(name, operation, number=1, warmup=3, repeats=20, units=None):
+    """Time an operation and summarize the time per call.
+
+    Each repeat runs the operation ``number`` times. ``units`` is an
+    optional callable giving the work done per call (such as bytes
+    rendered), reported as a rate. A call that raises fails the case, so a
+    crash can't pass for a speed-up.
+    """
+    timings = []
+    try:
+        for _ in range(warmup):
+            operation()
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for _ in range(number):
+                operation()
+            timings.append((time.perf_counter() - started) / number)
+    except Exception as error:
+        return {"name": name, "failed": f"{type(error).__name__}: {error}"}
+    timings.sort()
+    result = {
+        "name": name,
+        "repeats": repeats,
+        "number": number,
+        "min": timings[0],
+        "mean": sum(timings) / len(timings),
+        "p50": percentile(timings, 0.5),
+        "p90": percentile(timings, 0.9),
+        "p99": percentile(timings, 0.99),
+        "max": timings[-1],
+        "ops_per_second": 1 / timings[len(timings) // 2] if timings[len(timings) // 2] else float("inf")
+    }
+    if units:
+        result["units_per_second"] = units() * result["ops_per_second"]
+    return result
+
+
+def quiet(operation):
+    """Wrap an operation so its printed output is discarded."""
+    def run():
+        with contextlib.redirect_stdout(NullOutput()):
+            return operation()
+    return run
+
+
+def rendered_bytes(operation):
+    """Get the number of bytes an operation prints."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        operation()
+    return len(output.getvalue().encode())
+
+
+def random_policy(seed):
+    """Policy answering prompts at random with a fixed seed."""
+    chooser = random.Random(seed)
+    return lambda prompt, options: chooser.choice(options)
+
+
+def bench_save(options):
+    """SaveSystem save, load and list at each slot count."""
+    results = []
+    for slots in options.slots:
+        directory = tempfile.mkdtemp(prefix="mystic_bench_")
+        try:
+            engine = HeadlessEngine()
+            save_system = engine.save_system
+            save_system.save_directory = directory
+            save_system.save_game("template")
+            with open(os.path.join(directory, "template.json")) as f:
+                template = f.read()
+            for slot in range(slots - 1):
+                with open(os.path.join(directory, f"slot_{slot}.json"), 'w') as f:
+                    f.write(template)
+            results.append(measure(f"save.save_game[{slots}]", lambda: save_system.save_game("template"),
+                                   number=20, warmup=options.warmup, repeats=options.repeats))
+            results.append(measure(f"save.load_game[{slots}]", lambda: save_system.load_game("template"),
+                                   number=20, warmup=options.warmup, repeats=options.repeats))
+            results.append(measure(f"save.list_saves[{slots}]", save_system.list_saves,
+                                   warmup=1, repeats=max(3, options.repeats // 4)))
+        finally:
+            shutil.rmtree(directory)
+    return results
+
+
+def bench_render(options):
+    """ASCII art and menu screen rendering throughput."""
+    engine = HeadlessEngine()
+    art = engine.ascii_art
+    art_methods = [getattr(art, name) for name in dir(art)
+                   if name.startswith("display_") and name != "display_with_delay"]
+
+    def render_all_art():
+        for method in art_methods:
+            method()
+
+    screens = [("render.ascii_art[all]", render_all_art, 20)]
+    for screen in ("display_title", "display_game_status", "display_adventure_menu", "display_character_info"):
+        screens.append((f"render.{screen}", getattr(engine, screen), 50))
+    results = []
+    for name, render, number in screens:
+        size = rendered_bytes(render)
+        results.append(measure(name, quiet(render), number=number, warmup=options.warmup,
+                               repeats=options.repeats, units=lambda: size))
+    return results
+
+
+def bench_systems(options):
+    """Construction cost of a session's game systems."""
+    return [
+        measure("systems.GameSystems()", lambda: GameSystems(None), number=200,
+                warmup=options.warmup, repeats=options.repeats),
+        measure("systems.HeadlessEngine()", HeadlessEngine, number=50,
+                warmup=options.warmup, repeats=options.repeats)
+    ]
+
+
+def bench_scenes(options):
+    """Headless playthrough of each scene with seeded random choices."""
+    scenes = [
+        (IntroScene, "play", ()), (ForestScene, "play", ()), (CaveScene, "play", ()),
+        (BossScene, "play", ()), (TreasureScene, "play", ()), (MysticalLibraryScene, "play", ()),
+        (TimeNexusScene, "play", ()), (AdventurerCrossroadsScene, "play", ()),
+        (EndingScene, "play", ("peaceful_victory",))
+    ]
+    results = []
+    for scene_class, method, args in scenes:
+        seeds = iter(range(1 << 30))
+
+        def play():
+            seed = next(seeds)
+            engine = HeadlessEngine(random_policy(seed), seed=seed)
+            engine.play_scene(scene_class, method, *args)
+        results.append(measure(f"scene.{scene_class.__name__}", play, number=10,
+                               warmup=options.warmup, repeats=options.repeats))
+    return results
+
+
+def bench_sampling(options):
+    """Combat resolution, event and loot sampling throughput."""
+    systems = HeadlessEngine().systems
+    combat_random = random.Random(0)
+    enemies = [{"name": "Shadow Wolf", "health": 60, "attack": 10, "agility": 11}]
+    time_system = systems.time_system
+
+    party_random = random.Random(1)
+    parties = [{"companions": [{"ability": party_random.choice(["tracking", "healing", "knowledge", "stealth"]),
+                                "loyalty": party_random.randint(0, 100)} for _ in range(2)],
+                "wounded": party_random.random() < 0.3, "weakened": party_random.random() < 0.5}
+               for _ in range(10000)]
+
+    ticks = TickScheduler()
+    afflicted = [StatusEffects(ticks, {"name": str(index), "health": 10 ** 9, "max_health": 10 ** 9})
+                 for index in range(5000)]
+
+    def tick_statuses():
+        # Reapply so every entity carries burning, poison and regeneration throughout
+        for status in afflicted:
+            status.apply("burning", 3)
+            status.apply("poisoned", 3)
+            status.apply("regenerating", 1)
+        ticks.advance_to(ticks.now + 1)
+
+    def schedule_and_advance():
+        for hours in range(1, 21):
+            time_system.schedule_event(hours, "bench_tick", {"hours": hours})
+        time_system.advance_time(20)
+
+    return [
+        measure("combat.auto_resolve", lambda: systems.combat_system.auto_resolve(systems, enemies, combat_random),
+                number=100, warmup=options.warmup, repeats=options.repeats),
+        measure("events.trigger_random_event", systems.random_events.trigger_random_event,
+                number=10000, warmup=options.warmup, repeats=options.repeats),
+        measure("events.schedule_and_advance[20]", schedule_and_advance,
+                number=100, warmup=options.warmup, repeats=options.repeats),
+        measure("loot.roll_many[10000]", lambda: systems.loot_system.roll_many("tier:rare", 10000, rng=combat_random),
+                number=10, warmup=options.warmup, repeats=options.repeats),
+        measure("companions.decide_for_parties[10000]", lambda: decide_for_parties(parties, combat_random),
+                number=5, warmup=options.warmup, repeats=options.repeats),
+        measure("spells.apply_and_tick[5000]", tick_statuses,
+                number=5, warmup=options.warmup, repeats=options.repeats)
+    ]
+
+
+SUITES = {
+    "save": bench_save,
+    "render": bench_render,
+    "systems": bench_systems,
+    "scenes": bench_scenes,
+    "sampling": bench_sampling
+}
+
+
+def memory_report(options):
+    """Per-session footprint by part, and a leak check over many sessions."""
+    footprint = session_footprint(play_session(0))
+    return {
+        "footprint": footprint,
+        "session_bytes": sum(footprint.values()),
+        "leak_check": leak_check(options.memory_sessions)
+    }
+
+
+def format_results(results, baseline=None, threshold=0.1):
+    """Format results as a table, marking failures and regressions against a baseline.
+
+    Returns (table, regressions, failures).
+    """
+    lines = [f"{'benchmark':<40} {'p50':>10} {'p90':>10} {'p99':>10} {'ops/s':>12}"]
+    regressions = 0
+    failures = 0
+    for result in results:
+        if "failed" in result:
+            lines.append(f"{result['name']:<40} FAILED: {result['failed']}")
+            failures += 1
+            continue
+        line = (f"{result['name']:<40} {result['p50'] * 1e6:>8.1f}us {result['p90'] * 1e6:>8.1f}us "
+                f"{result['p99'] * 1e6:>8.1f}us {result['ops_per_second']:>12.1f}")
+        if "units_per_second" in result:
+            line += f"  {result['units_per_second'] / 1e6:.1f} MB/s"
+        previous = (baseline or {}).get(result["name"])
+        if previous and "p50" in previous:
+            change = result["p50"] / previous["p50"] - 1
+            line += f"  {change:+.0%}"
+            if change > threshold:
+                line += " REGRESSION"
+                regressions += 1
+        lines.append(line)
+    return "\n".join(lines), regressions, failures
+
+
+def main():
+    """Run the benchmark suites from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark Mystic Quest's hot paths.")
+    parser.add_argument("--only", action="append", choices=sorted(SUITES), help="run only these suites")
+    parser.add_argument("--slots", default="10,1000,10000", help="save slot counts, comma separated")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against results from an earlier --json run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="p50 slowdown counted as a regression")
+    parser.add_argument("--memory", action="store_true", help="also report per-session memory and check for leaks")
+    parser.add_argument("--memory-sessions", type=int, default=50, help="sessions played by the leak check")
+    options = parser.parse_args()
+    options.slots = [int(slots) for slots in options.slots.split(",")]
+
+    results = []
+    for suite in options.only or SUITES:
+        results.extend(SUITES[suite](options))
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = {result["name"]: result for result in json.load(f)["results"]}
+    table, regressions, failures = format_results(results, baseline, options.threshold)
+    print(table)
+
+    report = {"python": sys.version.split()[0], "results": results}
+    if options.memory:
+        report["memory"] = memory_report(options)
+        print(f"\nsession footprint: {report['memory']['session_bytes'] / 1024:.1f} KiB")
+        for name, size in list(report["memory"]["footprint"].items())[:5]:
+            print(f"  {name:<30} {size / 1024:>7.1f} KiB")
+        print(format_leak_check(report["memory"]["leak_check"]))
+        if report["memory"]["leak_check"]["leaking"]:
+            regressions += 1
+
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if failures:
+        print(f"\n{failures} benchmark(s) failed")
+    if regressions:
+        print(f"\n{regressions} regression(s) over {options.threshold:.0%}")
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Companion AI for Mystic Quest
+=============================
+How companions decide what to do in battle and while exploring, and how
+their loyalty responds to the player's choices.
+
+Decisions are made for many companions at once. Each companion's situation
+is reduced to a small integer key (its ability plus a few yes/no facts),
+and a precomputed decision table maps every key to an action, so choosing
+actions for a whole party, or for thousands of simulated parties, is one
+pass of table lookups over columns of companion data.
+"""
+
+import random
+
+
+ABILITIES = ("tracking", "healing", "knowledge", "stealth")
+
+# Battle actions
+STRIKE, TRACK, AMBUSH, HEAL, WEAKEN, HESITATE = range(6)
+ACTION_NAMES = ("strike", "track", "ambush", "heal", "weaken", "hesitate")
+
+MAX_LOYALTY = 100
+HESITATE_LOYALTY = 25  # Companions below this loyalty may hold back in battle
+WOUNDED = 0.5  # Health fraction below which healers heal instead of fighting
+
+# Companion type -> {choice tag or "battle": loyalty change}
+LOYALTY_RULES = {
+    "guardian": {"battle": 3, "treasure": 1, "peaceful": -1},
+    "magical": {"peaceful": 4, "wisdom": 2, "battle": -1},
+    "wise": {"wisdom": 5, "peaceful": 1, "treasure": -2},
+    "stealth": {"treasure": 4, "battle": 1, "peaceful": -1}
+}
+
+# Ability -> (chance at full loyalty, kind, value) of helping on arrival somewhere
+EXPLORATION_FINDS = {
+    "tracking": (0.4, "loot", "tier:common"),
+    "healing": (0.6, "heal", 10),
+    "knowledge": (0.5, "experience", 15),
+    "stealth": (0.2, "loot", "tier:rare")
+}
+
+
+def choose_action(ability, wounded, weakened, hesitant):
+    """The battle policy for one situation."""
+    if hesitant:
+        return HESITATE
+    if ability == "healing" and wounded:
+        return HEAL
+    if ability == "knowledge" and not weakened:
+        return WEAKEN
+    if ability == "stealth":
+        return AMBUSH
+    if ability == "tracking":
+        return TRACK
+    return STRIKE
+
+
+# Index: ability index << 3 | wounded << 2 | weakened << 1 | hesitant
+DECISION_TABLE = [STRIKE] * (len(ABILITIES) << 3)
+for ability_index, table_ability in enumerate(ABILITIES):
+    for situation in range(8):
+        DECISION_TABLE[ability_index << 3 | situation] = choose_action(
+            table_ability, situation >> 2 & 1, situation >> 1 & 1, situation & 1)
+
+
+def decide_actions(abilities, loyalties, wounded, weakened, rolls):
+    """Choose battle actions for many companions at once.
+
+    Every argument is a column with one entry per companion: ability
+    indexes, loyalties, whether their side has someone wounded, whether
+    their target is already weakened, and a random number in [0, 1). A
+    companion hesitates when its roll is under its hesitation chance, which
+    rises from zero at HESITATE_LOYALTY to one half at no loyalty.
+    """
+    table = DECISION_TABLE
+    spread = 2 * HESITATE_LOYALTY
+    return [table[ability << 3 | hurt << 2 | weak << 1 | (roll * spread < HESITATE_LOYALTY - loyalty)]
+            for ability, loyalty, hurt, weak, roll in zip(abilities, loyalties, wounded, weakened, rolls)]
+
+
+def decide_for_parties(parties, rng=random):
+    """Choose battle actions for the companions of many parties in one batch.
+
+    Each party is a dict with "companions" (dicts with "ability" and
+    "loyalty"), "wounded" and "weakened". Returns one list of actions per
+    party, in companion order.
+    """
+    abilities, loyalties, wounded, weakened, sizes = [], [], [], [], []
+    for party in parties:
+        companions = party["companions"]
+        sizes.append(len(companions))
+        abilities.extend(ABILITIES.index(companion["ability"]) for companion in companions)
+        loyalties.extend(companion["loyalty"] for companion in companions)
+        wounded.extend([int(party["wounded"])] * len(companions))
+        weakened.extend([int(party["weakened"])] * len(companions))
+    draw = rng.random
+    actions = decide_actions(abilities, loyalties, wounded, weakened, [draw() for _ in abilities])
+    decided = []
+    start = 0
+    for size in sizes:
+        decided.append(actions[start:start + size])
+        start += size
+    return decided
+
+
+def loyalty_changes(companion_types, signals):
+    """Get the loyalty change for each companion type from a set of signals (choice tags or "battle")."""
+    return [sum(LOYALTY_RULES.get(companion_type, {}).get(signal, 0) for signal in signals)
+            for companion_type in companion_types]
+
+
+def exploration_finds(companions, rng=random):
+    """Decide which companions find something on arrival somewhere.
+
+    Returns [(companion, kind, value)]; the chance scales with loyalty.
+    """
+    finds = []
+    for companion in companions:
+        chance, kind, value = EXPLORATION_FINDS[companion["ability"]]
+        if rng.random() < chance * companion["loyalty"] / MAX_LOYALTY:
+            finds.append((companion, kind, value))
+    return finds
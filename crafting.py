@@ -0,0 +1,146 @@
+"""
+Crafting for Mystic Quest
+=========================
+Recipes that turn inventory items into new ones, kept in a recipe book
+indexed by ingredients.
+
+Each recipe is filed under one key ingredient, the one fewest recipes used
+when it was added. A recipe can only be crafted while its key ingredient is
+held, so finding what an inventory can craft checks the recipes filed under
+the items held instead of every recipe in the book. Recipes are also
+indexed by their exact ingredient multiset for "what do these make" lookups.
+"""
+
+from collections import Counter
+
+
+# Recipe id -> (name, {ingredient item id: quantity}, result item id, result quantity)
+RECIPE_DATABASE = {
+    "greater_healing_potion": ("Greater Healing Potion", {"healing_potion": 2, "fairy_dust": 1},
+                               "greater_healing_potion", 1),
+    "dragonfire_amulet": ("Dragonfire Amulet", {"dragon_scale": 1, "magic_crystal": 1}, "dragonfire_amulet", 1),
+    "shadow_cloak": ("Shadow Cloak", {"elven_cloak": 1, "shadow_gem": 1}, "shadow_cloak", 1),
+    "arcane_crystal": ("Arcane Crystal", {"magic_crystal": 2, "wisdom_scroll": 1}, "arcane_crystal", 1),
+    "potion_brewing": ("Brew Healing Potions", {"fairy_dust": 1, "wisdom_scroll": 1}, "healing_potion", 3),
+    "dragonscale_mail": ("Dragonscale Mail", {"dragon_scale": 3}, "dragonscale_mail", 1),
+    "shadow_hood": ("Shadow Hood", {"shadow_gem": 1, "fairy_dust": 2}, "shadow_hood", 1)
+}
+
+
+def ingredient_key(ingredients):
+    """Get the hashable multiset of an {item id: quantity} mapping."""
+    return frozenset(ingredients.items())
+
+
+class RecipeBook:
+    """Recipes indexed by key ingredient and by ingredient multiset."""
+
+    def __init__(self):
+        self.recipes = {}  # Recipe id -> recipe dict
+        self.by_ingredients = {}  # Ingredient multiset -> [recipe ids]
+        self.by_key_ingredient = {}  # Item id -> {recipe ids filed under it}
+        self.uses = Counter()  # Item id -> recipes using it
+
+    def add_recipe(self, recipe_id, name, ingredients, result, quantity=1):
+        """Add a recipe, such as one from a mod."""
+        if recipe_id in self.recipes:
+            raise ValueError(f"Recipe {recipe_id} already exists")
+        if not ingredients or any(count < 1 for count in ingredients.values()):
+            raise ValueError(f"Recipe {recipe_id} needs positive ingredient quantities")
+        if quantity < 1:
+            raise ValueError(f"Recipe {recipe_id} must make at least one item")
+        key_ingredient = min(ingredients, key=lambda item_id: (self.uses[item_id], item_id))
+        recipe = {
+            "name": name,
+            "ingredients": dict(ingredients),
+            "result": result,
+            "quantity": quantity,
+            "key_ingredient": key_ingredient
+        }
+        self.recipes[recipe_id] = recipe
+        self.by_ingredients.setdefault(ingredient_key(ingredients), []).append(recipe_id)
+        self.by_key_ingredient.setdefault(key_ingredient, set()).add(recipe_id)
+        self.uses.update(ingredients.keys())
+        return recipe
+
+    def remove_recipe(self, recipe_id):
+        """Remove a recipe from the book and its indexes."""
+        recipe = self.recipes.pop(recipe_id)
+        matches = self.by_ingredients[ingredient_key(recipe["ingredients"])]
+        matches.remove(recipe_id)
+        if not matches:
+            del self.by_ingredients[ingredient_key(recipe["ingredients"])]
+        self.by_key_ingredient[recipe["key_ingredient"]].discard(recipe_id)
+        self.uses.subtract(recipe["ingredients"].keys())
+
+    def match(self, ingredients):
+        """Get the recipes made from exactly these ingredients."""
+        return list(self.by_ingredients.get(ingredient_key(ingredients), ()))
+
+    def times_craftable(self, recipe_id, items):
+        """Get how many times a recipe can be crafted from {item id: quantity}."""
+        return min(items.get(item_id, 0) // count
+                   for item_id, count in self.recipes[recipe_id]["ingredients"].items())
+
+    def craftable(self, items):
+        """Get [(recipe id, times)] for every recipe the items can craft at least once."""
+        found = []
+        for item_id in items:
+            for recipe_id in self.by_key_ingredient.get(item_id, ()):
+                times = self.times_craftable(recipe_id, items)
+                if times:
+                    found.append((recipe_id, times))
+        return sorted(found)
+
+
+def build_recipe_book(recipes=RECIPE_DATABASE):
+    """Build a recipe book from a recipe table."""
+    book = RecipeBook()
+    for recipe_id, (name, ingredients, result, quantity) in recipes.items():
+        book.add_recipe(recipe_id, name, ingredients, result, quantity)
+    return book
+
+
+# Shared by every session; mods add their recipes here
+RECIPE_BOOK = build_recipe_book()
+
+
+class CraftingSystem:
+    """Crafts items from the player's inventory."""
+
+    def __init__(self, systems, recipe_book=RECIPE_BOOK):
+        self.systems = systems
+        self.recipe_book = recipe_book
+
+    def available_recipes(self):
+        """Get [(recipe id, times)] for what the inventory can craft right now."""
+        return self.recipe_book.craftable(self.systems.inventory_system.items)
+
+    def craft(self, recipe_id, times=1):
+        """Craft a recipe a number of times at once; None crafts as many as possible.
+
+        Returns (success, message). Nothing is used up unless every craft
+        succeeds.
+        """
+        if recipe_id not in self.recipe_book.recipes:
+            return False, "Unknown recipe!"
+        inventory = self.systems.inventory_system
+        recipe = self.recipe_book.recipes[recipe_id]
+        available = self.recipe_book.times_craftable(recipe_id, inventory.items)
+        if times is None:
+            times = available
+        if times < 1 or times > available:
+            return False, "Not enough ingredients!"
+
+        # The result must fit in the slots and weight the ingredients leave
+        changes = {item_id: -count * times for item_id, count in recipe["ingredients"].items()}
+        changes[recipe["result"]] = changes.get(recipe["result"], 0) + recipe["quantity"] * times
+        can_hold, reason = inventory.can_hold(changes)
+        if not can_hold:
+            return False, reason
+
+        for item_id, count in recipe["ingredients"].items():
+            inventory.remove_item(item_id, count * times)
+        inventory.add_item(recipe["result"], recipe["quantity"] * times)
+        result_name = inventory.item_database[recipe["result"]]["name"]
+        return True, f"🔨 Crafted {recipe['quantity'] * times} {result_name}(s)!"
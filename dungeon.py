@@ -0,0 +1,304 @@
+"""
+Dungeon Generator for Mystic Quest
+==================================
+Procedural dungeon floors: a graph of rooms with encounters and loot,
+generated from a seed so that the same seed always gives the same floor.
+
+Generated floors never change, so they are shared through a cache keyed by
+seed and depth that drops the least recently used floor when full. While
+the player explores one floor, the floor below is generated on a background
+thread, so descending never waits for generation.
+"""
+
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from loot import compile_table
+
+
+# Enemy templates as (name, health, attack, agility) at depth 1
+DUNGEON_ENEMIES = [
+    ("Crystal Spider", 30, 7, 13),
+    ("Cave Troll", 60, 11, 5),
+    ("Gloom Bat Swarm", 25, 6, 16),
+    ("Stone Golem", 80, 9, 3),
+    ("Shadow Wisp", 35, 10, 12)
+]
+
+# The guardian waiting at the stairs of every floor
+STAIR_GUARDIAN = ("Depth Warden", 90, 12, 8)
+
+ROOM_KINDS = [
+    "glittering crystal grotto", "flooded passage", "collapsed shrine", "echoing cavern",
+    "fungus-lit hollow", "abandoned mine shaft", "narrow fissure", "underground lake shore"
+]
+
+ENCOUNTER_CHANCE = 0.35
+LOOT_CHANCE = 0.25
+BASE_ROOMS = 8
+ROOMS_PER_DEPTH = 6
+MAX_ROOMS = 200
+
+
+class Floor:
+    """One generated floor. Its contents never change once generated.
+
+    Rooms are numbered from 0, the entrance. ``exits`` lists the rooms each
+    room leads to; ``encounters`` and ``loot`` hold an enemy template or an
+    item id for each room, or None.
+    """
+
+    def __init__(self, seed, depth, kinds, exits, encounters, loot, stairs):
+        self.seed = seed
+        self.depth = depth
+        self.kinds = kinds
+        self.exits = exits
+        self.encounters = encounters
+        self.loot = loot
+        self.entrance = 0
+        self.stairs = stairs
+
+    def room_count(self):
+        """Get the number of rooms on the floor."""
+        return len(self.exits)
+
+    def enemy(self, room):
+        """Get a fresh enemy dict for a room's encounter, or None."""
+        encounter = self.encounters[room]
+        if encounter is None:
+            return None
+        name, health, attack, agility = encounter
+        return {"name": name, "health": health, "attack": attack, "agility": agility}
+
+
+def generate_floor(seed, depth, rooms):
+    """Generate a floor of connected rooms from a seed.
+
+    Each room joins one of the few rooms made just before it, which winds
+    the floor into long passages, and a few extra tunnels add loops. The
+    stairs are in the room farthest from the entrance.
+    """
+    if rooms < 2:
+        raise ValueError("A floor needs at least two rooms")
+    rng = random.Random(seed * 1000003 + depth)
+    exits = [[] for _ in range(rooms)]
+    for room in range(1, rooms):
+        other = rng.randrange(max(0, room - 4), room)
+        exits[room].append(other)
+        exits[other].append(room)
+    for _ in range(rooms // 6):
+        room, other = rng.randrange(rooms), rng.randrange(rooms)
+        if room != other and other not in exits[room]:
+            exits[room].append(other)
+            exits[other].append(room)
+
+    # Breadth-first search from the entrance; the last room reached is farthest
+    distances = [-1] * rooms
+    distances[0] = 0
+    frontier = [0]
+    for room in frontier:
+        for other in exits[room]:
+            if distances[other] < 0:
+                distances[other] = distances[room] + 1
+                frontier.append(other)
+    stairs = frontier[-1]
+
+    scale = 1 + 0.25 * (depth - 1)
+    # Floors are shared, so room loot ignores any one player's luck
+    room_loot = compile_table("dungeon:room", 0)
+    encounters = [None] * rooms
+    loot = [None] * rooms
+    for room in range(1, rooms):
+        if room == stairs:
+            template = STAIR_GUARDIAN
+        elif rng.random() < ENCOUNTER_CHANCE:
+            template = rng.choice(DUNGEON_ENEMIES)
+        else:
+            template = None
+        if template:
+            name, health, attack, agility = template
+            encounters[room] = (name, int(health * scale), int(attack * scale), agility)
+        if rng.random() < LOOT_CHANCE:
+            loot[room] = room_loot.roll(rng)
+
+    kinds = tuple(rng.randrange(len(ROOM_KINDS)) for _ in range(rooms))
+    return Floor(seed, depth, kinds, tuple(tuple(room_exits) for room_exits in exits),
+                 tuple(encounters), tuple(loot), stairs)
+
+
+class FloorCache:
+    """Generated floors by (seed, depth, rooms), dropping the least recently used.
+
+    A floor is generated outside the lock so other sessions are not held
+    up, but only once: a caller that misses while the same floor is being
+    generated waits for that generation instead of starting another.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.floors = OrderedDict()
+        self.generating = {}  # Key -> Future of a floor being generated
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, seed, depth, rooms):
+        """Get a floor, generating it if it is not cached."""
+        key = (seed, depth, rooms)
+        with self.lock:
+            floor = self.floors.get(key)
+            if floor is not None:
+                self.floors.move_to_end(key)
+                self.hits += 1
+                return floor
+            future = self.generating.get(key)
+            generating = future is None
+            if generating:
+                future = self.generating[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not generating:
+            return future.result()
+        try:
+            floor = generate_floor(seed, depth, rooms)
+        except BaseException as error:
+            with self.lock:
+                del self.generating[key]
+            future.set_exception(error)
+            raise
+        with self.lock:
+            del self.generating[key]
+            self.floors[key] = floor
+            while len(self.floors) > self.capacity:
+                self.floors.popitem(last=False)
+        future.set_result(floor)
+        return floor
+
+
+# Floors are shared by every session, as are the threads generating them ahead
+FLOOR_CACHE = FloorCache()
+PREFETCHER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dungeon-prefetch")
+
+
+def rooms_at_depth(depth):
+    """Get the number of rooms on a floor; deeper floors are larger."""
+    return min(MAX_ROOMS, BASE_ROOMS + ROOMS_PER_DEPTH * depth)
+
+
+class DungeonSystem:
+    """The player's delve through procedurally generated floors.
+
+    Progress on the current floor is two bitsets of room numbers: rooms
+    whose encounter has been defeated and rooms whose loot has been taken.
+    """
+
+    def __init__(self, systems, cache=FLOOR_CACHE):
+        self.systems = systems
+        self.cache = cache
+        self.seed = None
+        self.depth = 0
+        self.room = 0
+        self.defeated = 0
+        self.looted = 0
+        self.prefetching = None  # (depth, future) for the floor below
+
+    def initialize(self):
+        """Start outside any dungeon."""
+        self.leave()
+
+    def in_dungeon(self):
+        """Check whether the player is inside a dungeon."""
+        return self.seed is not None
+
+    def enter(self, seed=None):
+        """Enter a dungeon at its first floor; the seed comes from the session RNG if not given."""
+        self.seed = self.systems.rng.getrandbits(32) if seed is None else seed
+        self.go_to_depth(1)
+        return self.floor()
+
+    def leave(self):
+        """Leave the dungeon."""
+        self.seed = None
+        self.depth = 0
+        self.room = 0
+        self.defeated = 0
+        self.looted = 0
+        self.prefetching = None
+
+    def floor(self):
+        """Get the current floor."""
+        return self.cache.get(self.seed, self.depth, rooms_at_depth(self.depth))
+
+    def go_to_depth(self, depth):
+        """Move to the entrance of a floor and start generating the one below."""
+        if self.prefetching and self.prefetching[0] == depth:
+            # Wait for the background generation instead of repeating it
+            self.prefetching[1].result()
+        self.depth = depth
+        self.defeated = 0
+        self.looted = 0
+        self.room = self.floor().entrance
+        self.prefetching = (depth + 1, PREFETCHER.submit(
+            self.cache.get, self.seed, depth + 1, rooms_at_depth(depth + 1)))
+
+    def at_stairs(self):
+        """Check whether the player stands at the stairs down."""
+        return self.room == self.floor().stairs
+
+    def descend(self):
+        """Take the stairs down to the next floor."""
+        if not self.at_stairs():
+            raise ValueError("There are no stairs in this room")
+        self.go_to_depth(self.depth + 1)
+        return self.floor()
+
+    def exits(self):
+        """Get the rooms the current room leads to."""
+        return self.floor().exits[self.room]
+
+    def move(self, room):
+        """Walk to a neighbouring room."""
+        if room not in self.exits():
+            raise ValueError(f"Room {self.room} does not lead to room {room}")
+        self.room = room
+
+    def encounter(self):
+        """Get the enemy waiting in the current room, or None once defeated."""
+        if self.defeated >> self.room & 1:
+            return None
+        return self.floor().enemy(self.room)
+
+    def defeat_encounter(self):
+        """Mark the current room's encounter defeated."""
+        self.defeated |= 1 << self.room
+
+    def room_loot(self):
+        """Get the item id of the loot in the current room, or None once taken."""
+        if self.looted >> self.room & 1:
+            return None
+        return self.floor().loot[self.room]
+
+    def take_loot(self):
+        """Mark the current room's loot taken."""
+        self.looted |= 1 << self.room
+
+    def get_save_data(self):
+        """Get the dungeon progress for saving; the floors are regenerated from the seed."""
+        if not self.in_dungeon():
+            return None
+        return {"seed": self.seed, "depth": self.depth, "room": self.room,
+                "defeated": self.defeated, "looted": self.looted}
+
+    def load_save_data(self, data):
+        """Restore dungeon progress from saved data."""
+        if not data:
+            self.leave()
+            return
+        self.seed = data["seed"]
+        self.go_to_depth(data["depth"])
+        self.room = data["room"]
+        self.defeated = data["defeated"]
+        self.looted = data["looted"]
@@ -0,0 +1,163 @@
+"""
+Equipment for Mystic Quest
+==========================
+Gear worn in equipment slots, granting stat bonuses and extra bonuses for
+wearing a complete set.
+
+The total bonus of everything worn is worked out once whenever gear is
+equipped or removed, and only the change from the previous total is applied
+to the player's stats. Combat and everything else read the stats as usual,
+so gear costs nothing per roll. Gear's effects, such as stealth, are held
+active in the effect system for as long as it is worn.
+"""
+
+
+EQUIPMENT_SLOTS = ("head", "body", "cloak", "amulet")
+
+# Set id -> (name, item ids, bonuses for wearing all of them)
+EQUIPMENT_SETS = {
+    "dragonfire": ("Dragonfire Regalia", ("dragonfire_amulet", "dragonscale_mail"),
+                   {"strength": 4, "max_health": 20}),
+    "nightwalker": ("Nightwalker's Guise", ("shadow_cloak", "shadow_hood"),
+                    {"agility": 4, "luck": 3})
+}
+
+# Item id -> set ids it belongs to
+SETS_BY_ITEM = {}
+for set_id, (_, set_items, _) in EQUIPMENT_SETS.items():
+    for set_item in set_items:
+        SETS_BY_ITEM.setdefault(set_item, []).append(set_id)
+
+
+class EquipmentSystem:
+    """The gear the player is wearing and the stat bonuses it grants.
+
+    ``equipped`` maps slot -> item id, and ``bonuses`` caches the total
+    bonus of the worn gear, which is already included in the player stats.
+    """
+
+    def __init__(self, systems):
+        self.systems = systems
+        self.equipped = {}
+        self.bonuses = {}
+        self.active_sets = []
+
+    def initialize(self):
+        """Start with nothing equipped."""
+        self.equipped = {}
+        self.bonuses = {}
+        self.active_sets = []
+
+    def slot_for(self, item_id):
+        """Get the slot an item is worn in, or None if it can't be worn."""
+        item = self.systems.inventory_system.item_database[item_id]
+        return item.get("slot") if item["type"] == "equipment" else None
+
+    def total_bonuses(self, equipped):
+        """Get (bonuses, complete set ids) for a set of worn gear."""
+        item_database = self.systems.inventory_system.item_database
+        bonuses = {}
+        for item_id in equipped.values():
+            for stat, bonus in item_database[item_id].get("bonuses", {}).items():
+                bonuses[stat] = bonuses.get(stat, 0) + bonus
+        worn = set(equipped.values())
+        active_sets = sorted({set_id for item_id in worn for set_id in SETS_BY_ITEM.get(item_id, ())
+                              if worn.issuperset(EQUIPMENT_SETS[set_id][1])})
+        for set_id in active_sets:
+            for stat, bonus in EQUIPMENT_SETS[set_id][2].items():
+                bonuses[stat] = bonuses.get(stat, 0) + bonus
+        return bonuses, active_sets
+
+    def worn_effects(self, equipped):
+        """Get the names of the effects granted by a set of worn gear."""
+        item_database = self.systems.inventory_system.item_database
+        effects = set()
+        for item_id in equipped.values():
+            effect = item_database[item_id].get("effect", ())
+            effects.update([effect] if isinstance(effect, str) else effect)
+        return effects
+
+    def refresh(self, equipped):
+        """Wear a new set of gear, applying only the change in bonuses and effects.
+
+        Returns the messages of effects that took hold.
+        """
+        bonuses, active_sets = self.total_bonuses(equipped)
+        stats = self.systems.stats_system.player_stats
+        for stat in set(bonuses) | set(self.bonuses):
+            stats[stat] = stats.get(stat, 0) + bonuses.get(stat, 0) - self.bonuses.get(stat, 0)
+        stats["health"] = min(stats["health"], stats["max_health"])
+        stats["mana"] = min(stats["mana"], stats["max_mana"])
+        effect_system = self.systems.effect_system
+        old_effects = self.worn_effects(self.equipped)
+        new_effects = self.worn_effects(equipped)
+        for effect_name in sorted(old_effects - new_effects):
+            effect_system.release(effect_name)
+        messages = [effect_system.hold(effect_name) for effect_name in sorted(new_effects - old_effects)]
+        self.equipped = equipped
+        self.bonuses = bonuses
+        self.active_sets = active_sets
+        return [message for message in messages if message]
+
+    def equip(self, item_id):
+        """Move an item from the inventory to its slot, swapping out what was there."""
+        inventory = self.systems.inventory_system
+        slot = self.slot_for(item_id)
+        if slot is None:
+            return False, f"{inventory.item_database[item_id]['name']} can't be equipped."
+        if inventory.items.get(item_id, 0) < 1:
+            return False, "You don't have that item!"
+        worn = self.equipped.get(slot)
+        changes = {item_id: -1}
+        if worn:
+            changes[worn] = changes.get(worn, 0) + 1
+        can_hold, reason = inventory.can_hold(changes)
+        if not can_hold:
+            return False, reason
+
+        inventory.remove_item(item_id)
+        if worn:
+            inventory.add_item(worn)
+        old_sets = self.active_sets
+        effect_messages = self.refresh(dict(self.equipped, **{slot: item_id}))
+        messages = [f"🛡️ Equipped {inventory.item_database[item_id]['name']}."] + effect_messages
+        messages.extend(f"✨ Set bonus: {EQUIPMENT_SETS[set_id][0]}!"
+                        for set_id in self.active_sets if set_id not in old_sets)
+        return True, " ".join(messages)
+
+    def unequip(self, slot):
+        """Move the item in a slot back to the inventory."""
+        inventory = self.systems.inventory_system
+        item_id = self.equipped.get(slot)
+        if item_id is None:
+            return False, "Nothing is equipped there."
+        success, message = inventory.add_item(item_id)
+        if not success:
+            return False, message
+        equipped = dict(self.equipped)
+        del equipped[slot]
+        self.refresh(equipped)
+        return True, f"Removed {inventory.item_database[item_id]['name']}."
+
+    def display_equipment(self):
+        """Display the worn gear and what it grants."""
+        item_database = self.systems.inventory_system.item_database
+        lines = ["🛡️ EQUIPMENT:", "=" * 30]
+        for slot in EQUIPMENT_SLOTS:
+            item_id = self.equipped.get(slot)
+            lines.append(f"{slot.title()}: {item_database[item_id]['name'] if item_id else '-'}")
+        if self.bonuses:
+            lines.append("Bonuses: " + ", ".join(f"{stat.replace('_', ' ').title()} {bonus:+d}"
+                                                 for stat, bonus in sorted(self.bonuses.items())))
+        for set_id in self.active_sets:
+            lines.append(f"Set: {EQUIPMENT_SETS[set_id][0]}")
+        return "\n".join(lines) + "\n"
+
+    def get_save_data(self):
+        """Get the worn item ids for saving; each item's slot comes from the item database."""
+        return [self.equipped[slot] for slot in EQUIPMENT_SLOTS if slot in self.equipped]
+
+    def load_save_data(self, item_ids):
+        """Restore worn gear. Saved stats and effects already include what it grants, so only the cache is rebuilt."""
+        self.equipped = {self.slot_for(item_id): item_id for item_id in item_ids or ()}
+        self.bonuses, self.active_sets = self.total_bonuses(self.equipped)
@@ -0,0 +1,330 @@
+"""
+Agent Environment for Mystic Quest
+==================================
+A Gym-style reset()/step() interface over the headless engine, for training
+and evaluating agents, plus a vectorized version that steps many
+environments in lockstep, optionally spread across subprocesses.
+
+Scenes are ordinary methods that ask for input, so each environment plays
+its episode on a worker thread that pauses at every prompt until step()
+hands it an action. Output from the episode is discarded.
+
+Observations are (stats, flags, scene_id): a tuple of player stats in
+STAT_FIELDS order, the story flag bitset and the index of the current scene
+in SCENES. Actions are indexes into the options of the current prompt,
+which info["options"] lists. The reward is the change in journey_value.
+"""
+
+import contextlib
+import multiprocessing
+import queue
+import random
+import sys
+import threading
+import time
+
+from headless_engine import HeadlessEngine, NullOutput, journey_value
+from memory_profile import MEMORY_PROFILER
+from scenes.intro import IntroScene
+from scenes.forest import ForestScene
+from scenes.cave import CaveScene
+from scenes.boss import BossScene
+from scenes.ending import EndingScene
+
+
+SCENES = ["intro", "forest", "cave", "boss", "ending"]
+STAT_FIELDS = ["level", "experience", "health", "max_health", "mana", "max_mana",
+               "strength", "intelligence", "agility", "luck"]
+
+
+class EpisodeAborted(BaseException):
+    """Unwinds an episode thread when its environment resets or closes.
+
+    Derived from BaseException so the scenes' input error handling does
+    not swallow it.
+    """
+
+
+def play_story(engine):
+    """Play the main story route, recording the current scene on the engine."""
+    engine.scene_id = SCENES.index("intro")
+    intro_choice = IntroScene(engine).play()
+    MEMORY_PROFILER.mark("scene.intro", engine)
+    if intro_choice == 1:
+        engine.scene_id = SCENES.index("forest")
+        result = ForestScene(engine).play()
+        MEMORY_PROFILER.mark("scene.forest", engine)
+    elif intro_choice == 2:
+        engine.scene_id = SCENES.index("cave")
+        result = CaveScene(engine).play()
+        MEMORY_PROFILER.mark("scene.cave", engine)
+    else:
+        result = "rest"
+    if result == "boss":
+        engine.scene_id = SCENES.index("boss")
+        result = BossScene(engine).play()
+        MEMORY_PROFILER.mark("scene.boss", engine)
+    engine.scene_id = SCENES.index("ending")
+    EndingScene(engine).play(result)
+    MEMORY_PROFILER.mark("scene.ending", engine)
+    return result
+
+
+def encode_observation(engine):
+    """Encode an engine's state as (stats, flags, scene_id)."""
+    stats = engine.systems.stats_system.player_stats
+    return tuple(stats[field] for field in STAT_FIELDS), engine.game_state.bits, engine.scene_id
+
+
+class MysticQuestEnv:
+    """One story episode behind a reset()/step() interface."""
+
+    def __init__(self, max_steps=200, reward=journey_value):
+        self.max_steps = max_steps
+        self.reward = reward
+        self.engine = None
+        self.thread = None
+        self.actions = None
+        self.prompts = None
+        self.options = None
+        self.steps = 0
+        self.score = 0
+
+    def reset(self, seed=None):
+        """Start a new episode, its randomness fixed by seed if given, and return (observation, info)."""
+        self.stop_episode()
+        self.actions = queue.SimpleQueue()
+        self.prompts = queue.SimpleQueue()
+        self.engine = HeadlessEngine(self.answer_prompt, max_decisions=self.max_steps + 1, seed=seed)
+        self.engine.scene_id = 0
+        self.steps = 0
+        self.score = self.reward(self.engine)
+        self.thread = threading.Thread(target=self.run_episode, daemon=True)
+        with contextlib.redirect_stdout(NullOutput()):
+            self.thread.start()
+            message = self.prompts.get()
+        observation, _, terminated, info = self.receive(message)
+        return observation, info
+
+    def step(self, action):
+        """Answer the current prompt with an option index.
+
+        Returns (observation, reward, terminated, truncated, info).
+        """
+        with contextlib.redirect_stdout(NullOutput()):
+            self.send_action(action)
+            return self.finish_step()
+
+    def send_action(self, action):
+        """Hand an action to the episode thread without waiting for it."""
+        if self.options is None:
+            raise ValueError("The episode is over; call reset() first")
+        if not 0 <= action < len(self.options):
+            raise ValueError(f"Action {action} is not one of the {len(self.options)} options")
+        self.steps += 1
+        self.actions.put(self.options[action])
+
+    def finish_step(self):
+        """Wait for the episode thread to reach its next prompt or the end."""
+        observation, reward, terminated, info = self.receive(self.prompts.get())
+        truncated = not terminated and self.steps >= self.max_steps
+        if truncated:
+            self.stop_episode()
+        return observation, reward, terminated, truncated, info
+
+    def receive(self, message):
+        """Turn a message from the episode thread into step results."""
+        if isinstance(message, BaseException):
+            self.options = None
+            raise message
+        score = self.reward(self.engine)
+        reward = score - self.score
+        self.score = score
+        observation = encode_observation(self.engine)
+        if message[0] == "done":
+            self.options = None
+            return observation, reward, True, {"result": message[1], "options": []}
+        _, prompt, self.options = message
+        return observation, reward, False, {"prompt": prompt, "options": self.options}
+
+    def answer_prompt(self, prompt, options):
+        """Engine policy: hand the prompt to step() and wait for its action."""
+        self.prompts.put(("prompt", prompt.strip(), options))
+        action = self.actions.get()
+        if action is EpisodeAborted:
+            raise EpisodeAborted()
+        return action
+
+    def run_episode(self):
+        """Episode thread: play the story and report how it ended."""
+        try:
+            self.prompts.put(("done", play_story(self.engine)))
+        except EpisodeAborted:
+            pass
+        except Exception as error:
+            self.prompts.put(error)
+
+    def stop_episode(self):
+        """Unwind the running episode thread, if any."""
+        if self.thread and self.thread.is_alive() and self.options is not None:
+            self.actions.put(EpisodeAborted)
+            self.thread.join()
+        self.thread = None
+        self.options = None
+
+    def close(self):
+        """Stop the environment."""
+        self.stop_episode()
+
+
+class VectorEnv:
+    """Several environments stepped in lockstep.
+
+    Finished environments reset automatically; the observation returned for
+    them is the first of the new episode and info["final_observation"]
+    holds the last one of the old. With a seed, environment index's episode
+    number n is seeded seed + index + seed_stride * n, so every episode of a
+    run can be replayed; seed_stride defaults to num_envs.
+    """
+
+    def __init__(self, num_envs, max_steps=200, seed=None, seed_stride=None):
+        self.envs = [MysticQuestEnv(max_steps) for _ in range(num_envs)]
+        self.seed = seed
+        self.seed_stride = seed_stride or num_envs
+        self.episode_counts = [0] * num_envs
+
+    def episode_seed(self, index):
+        """The seed for environment index's current episode, or None."""
+        if self.seed is None:
+            return None
+        return self.seed + index + self.seed_stride * self.episode_counts[index]
+
+    def reset(self):
+        """Reset every environment; returns (observations, infos)."""
+        self.episode_counts = [0] * len(self.envs)
+        results = [env.reset(self.episode_seed(index))
+                   for index, env in enumerate(self.envs)]
+        return [observation for observation, _ in results], [info for _, info in results]
+
+    def step(self, actions):
+        """Step every environment with its action.
+
+        Returns lists of observations, rewards, terminated and truncated
+        flags, and infos.
+        """
+        observations, rewards, terminateds, truncateds, infos = [], [], [], [], []
+        with contextlib.redirect_stdout(NullOutput()):
+            # Hand out every action first so the episode threads run together
+            for env, action in zip(self.envs, actions):
+                env.send_action(action)
+            results = [env.finish_step() for env in self.envs]
+        for index, (env, (observation, reward, terminated, truncated, info)) in enumerate(zip(self.envs, results)):
+            if terminated or truncated:
+                final_observation = observation
+                self.episode_counts[index] += 1
+                observation, info = env.reset(self.episode_seed(index))
+                info["final_observation"] = final_observation
+            observations.append(observation)
+            rewards.append(reward)
+            terminateds.append(terminated)
+            truncateds.append(truncated)
+            infos.append(info)
+        return observations, rewards, terminateds, truncateds, infos
+
+    def close(self):
+        """Stop every environment."""
+        for env in self.envs:
+            env.close()
+
+
+def run_vector_worker(connection, num_envs, max_steps, seed, seed_stride):
+    """Subprocess loop serving a VectorEnv over a pipe."""
+    sys.stdout = NullOutput()
+    vector_env = VectorEnv(num_envs, max_steps, seed, seed_stride)
+    while True:
+        command, data = connection.recv()
+        if command == "step":
+            connection.send(vector_env.step(data))
+        elif command == "reset":
+            connection.send(vector_env.reset())
+        else:
+            vector_env.close()
+            connection.close()
+            return
+
+
+class SubprocessVectorEnv:
+    """A VectorEnv whose environments are spread across subprocesses.
+
+    Each subprocess hosts a slice of the environments, so one message per
+    process carries a whole slice of actions.
+    """
+
+    def __init__(self, num_envs, num_processes=None, max_steps=200, seed=None):
+        num_processes = min(num_envs, num_processes or multiprocessing.cpu_count())
+        self.slices = []
+        self.connections = []
+        self.processes = []
+        start = 0
+        for index in range(num_processes):
+            count = num_envs // num_processes + (index < num_envs % num_processes)
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_vector_worker,
+                args=(child_end, count, max_steps, None if seed is None else seed + start, num_envs),
+                daemon=True)
+            process.start()
+            child_end.close()
+            self.slices.append((start, start + count))
+            self.connections.append(parent_end)
+            self.processes.append(process)
+            start += count
+
+    def reset(self):
+        """Reset every environment; returns (observations, infos)."""
+        for connection in self.connections:
+            connection.send(("reset", None))
+        observations, infos = [], []
+        for connection in self.connections:
+            slice_observations, slice_infos = connection.recv()
+            observations.extend(slice_observations)
+            infos.extend(slice_infos)
+        return observations, infos
+
+    def step(self, actions):
+        """Step every environment with its action, as VectorEnv.step."""
+        for connection, (start, end) in zip(self.connections, self.slices):
+            connection.send(("step", actions[start:end]))
+        results = ([], [], [], [], [])
+        for connection in self.connections:
+            for combined, part in zip(results, connection.recv()):
+                combined.extend(part)
+        return results
+
+    def close(self):
+        """Stop the subprocesses."""
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+
+
+def measure_throughput(vector_env, steps=2000):
+    """Step random actions and return the steps per second achieved."""
+    _, infos = vector_env.reset()
+    started = time.perf_counter()
+    taken = 0
+    while taken < steps:
+        actions = [random.randrange(len(info["options"])) for info in infos]
+        _, _, _, _, infos = vector_env.step(actions)
+        taken += len(actions)
+    return taken / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    single = VectorEnv(16, seed=0)
+    print(f"Threads:      {measure_throughput(single):8.0f} steps/s")
+    single.close()
+    spread = SubprocessVectorEnv(16, seed=0)
+    print(f"Subprocesses: {measure_throughput(spread):8.0f} steps/s")
+    spread.close()
@@ -0,0 +1,181 @@
+"""
+Story Flags for Mystic Quest
+============================
+Interns story flags to bit positions so the game state can be stored, tested
+and hashed as a single integer.
+"""
+
+from collections.abc import MutableMapping
+
+
+class FlagRegistry:
+    """Assigns every story flag a stable bit index."""
+    
+    def __init__(self, flag_names=()):
+        self.bit_index = {}
+        self.flag_names = []
+        for flag_name in flag_names:
+            self.register(flag_name)
+        # Flags registered later get process-dependent bits
+        self.stable_count = len(self.flag_names)
+        
+    def register(self, flag_name):
+        """Intern a flag and return its bit index."""
+        index = self.bit_index.get(flag_name)
+        if index is None:
+            index = len(self.flag_names)
+            self.bit_index[flag_name] = index
+            self.flag_names.append(flag_name)
+        return index
+        
+    def bit(self, flag_name):
+        """Get the single-bit mask for a flag."""
+        return 1 << self.register(flag_name)
+        
+    def mask(self, *flag_names):
+        """Get a mask with the bits of all the given flags set."""
+        mask = 0
+        for flag_name in flag_names:
+            mask |= 1 << self.register(flag_name)
+        return mask
+        
+    def names(self, bits):
+        """List the flags set in a bitset."""
+        names = []
+        index = 0
+        while bits:
+            if bits & 1:
+                names.append(self.flag_names[index])
+            bits >>= 1
+            index += 1
+        return names
+
+
+# Flags set by the story scenes. Order fixes the bit positions stored in
+# saves, so new flags must only ever be appended.
+STORY_FLAGS = [
+    "has_fairy_blessing", "has_fairy_wisdom", "gave_key_to_fairy", "has_treasure_key",
+    "passed_wolf_trial", "helped_spirit_wolf", "saw_future_visions", "inner_peace",
+    "treasure_master", "has_master_key", "infinite_wisdom", "found_treasure",
+    "examined_chamber", "found_secret_garden", "knows_complete_history", "knows_secret_paths",
+    "knows_prophecy", "has_artifacts", "can_pick_locks", "has_stealth",
+    "attempted_theft", "minor_theft", "cursed_by_greed", "showed_restraint",
+    "has_destiny_compass", "crystal_power", "knows_guardian_history", "knows_peace_ritual",
+    "saw_true_self", "studied_crystal", "knows_binding_spell", "resisted_temptation",
+    "found_via_crystals", "heard_crystal_song", "visited_shrine", "drank_sacred_water"
+]
+
+FLAG_REGISTRY = FlagRegistry(STORY_FLAGS)
+
+
+class GameState(MutableMapping):
+    """Dict-compatible game state backed by an integer bitset.
+    
+    Truthy flags are bits in ``bits``. Values other than True (such as
+    crystal_power = "balanced", or an explicit False) are also kept in
+    ``values`` so reads return exactly what was written, while truthy
+    ones still set their bit for mask tests.
+    """
+    
+    def __init__(self, initial=None, registry=FLAG_REGISTRY):
+        self.registry = registry
+        self.bits = 0
+        self.values = {}
+        if initial:
+            self.update(initial)
+            
+    def __getitem__(self, flag_name):
+        if flag_name in self.values:
+            return self.values[flag_name]
+        index = self.registry.bit_index.get(flag_name)
+        if index is not None and self.bits >> index & 1:
+            return True
+        raise KeyError(flag_name)
+        
+    def __setitem__(self, flag_name, value):
+        bit = self.registry.bit(flag_name)
+        if value:
+            self.bits |= bit
+        else:
+            self.bits &= ~bit
+        if value is True:
+            self.values.pop(flag_name, None)
+        else:
+            self.values[flag_name] = value
+            
+    def __delitem__(self, flag_name):
+        present = flag_name in self
+        self.values.pop(flag_name, None)
+        index = self.registry.bit_index.get(flag_name)
+        if index is not None:
+            self.bits &= ~(1 << index)
+        if not present:
+            raise KeyError(flag_name)
+            
+    def __contains__(self, flag_name):
+        if flag_name in self.values:
+            return True
+        index = self.registry.bit_index.get(flag_name)
+        return index is not None and bool(self.bits >> index & 1)
+        
+    def __iter__(self):
+        seen = set(self.values)
+        yield from self.values
+        for flag_name in self.registry.names(self.bits):
+            if flag_name not in seen:
+                yield flag_name
+                
+    def __len__(self):
+        return sum(1 for _ in self)
+        
+    def __repr__(self):
+        return f"GameState({dict(self)!r})"
+        
+    def __eq__(self, other):
+        if isinstance(other, GameState):
+            return self.bits == other.bits and self.values == other.values
+        return dict(self) == other
+        
+    def has_any(self, mask):
+        """Check whether any flag in the mask is set."""
+        return bool(self.bits & mask)
+        
+    def has_all(self, mask):
+        """Check whether every flag in the mask is set."""
+        return self.bits & mask == mask
+        
+    def copy(self):
+        """Get an independent copy of the state."""
+        state = GameState(registry=self.registry)
+        state.bits = self.bits
+        state.values = dict(self.values)
+        return state
+        
+    def state_key(self):
+        """Get a hashable key identifying this state."""
+        if not self.values:
+            return self.bits
+        return self.bits, tuple(sorted((name, repr(value)) for name, value in self.values.items()))
+        
+    def to_save_data(self):
+        """Get the state in a compact JSON-friendly form.
+        
+        Flags registered at runtime have no fixed bit, so they are saved by
+        name alongside the non-boolean values.
+        """
+        stable_mask = (1 << self.registry.stable_count) - 1
+        values = dict(self.values)
+        for flag_name in self.registry.names(self.bits & ~stable_mask):
+            values.setdefault(flag_name, True)
+        return {"flags": self.bits & stable_mask, "values": values}
+        
+    @classmethod
+    def from_save_data(cls, data, registry=FLAG_REGISTRY):
+        """Rebuild state from saved data, accepting older plain-dict saves."""
+        if "flags" not in data or not isinstance(data.get("flags"), int):
+            return cls(data, registry)
+        state = cls(registry=registry)
+        state.bits = data["flags"]
+        for flag_name, value in data.get("values", {}).items():
+            state[flag_name] = value
+        return state
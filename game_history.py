@@ -0,0 +1,206 @@
+"""
+Game History for Mystic Quest
+=============================
+Copy-on-write snapshots of the game state, so the timeline can be rewound,
+branched to explore other choices, and checkpointed cheaply.
+
+Each snapshot holds the state split into parts (flags, stats, inventory and
+so on) in an immutable form. A part that has not changed since the parent
+snapshot is shared with it rather than stored again, so a snapshot only
+costs as much as what changed. The inventory and the scheduled events,
+which count their own changes, are not even frozen again until they change.
+
+Only the most recent checkpoints are kept; older snapshots are cut out of
+the tree so they can be freed.
+"""
+
+from game_flags import GameState
+
+
+class FrozenDict(tuple):
+    """Immutable stand-in for a dict inside a snapshot."""
+
+
+def freeze(value):
+    """Get an immutable copy of a JSON-like value."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw(value):
+    """Get a mutable copy of a frozen value."""
+    if isinstance(value, FrozenDict):
+        return {key: thaw(item) for key, item in value}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+class Snapshot:
+    """One immutable point in the game's timeline."""
+
+    def __init__(self, label, parts, parent=None):
+        self.label = label
+        self.parts = parts
+        self.parent = parent
+        self.children = []
+        self.depth = parent.depth + 1 if parent else 0
+        if parent:
+            parent.children.append(self)
+
+    def changed_parts(self):
+        """List the parts this snapshot stores rather than shares."""
+        if not self.parent:
+            return list(self.parts)
+        return [name for name, part in self.parts.items() if self.parent.parts.get(name) is not part]
+
+
+class StateHistory:
+    """Tree of snapshots of an engine's state.
+
+    Checkpoints are added as children of the current snapshot. Restoring an
+    earlier snapshot and checkpointing again starts a new branch, leaving the
+    old one intact so it can be returned to.
+    """
+
+    def __init__(self, game_engine, max_checkpoints=50):
+        self.game = game_engine
+        self.max_checkpoints = max_checkpoints
+        self.current = None
+        self.checkpoints = []  # Most recent last
+        self.frozen = {}  # Part name -> (change count, frozen part) for parts that count changes
+
+    def frozen_part(self, name, version, build):
+        """Get a frozen part, reusing the last one if its change count is the same."""
+        cached = self.frozen.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+        part = build()
+        self.frozen[name] = (version, part)
+        return part
+
+    def capture_parts(self):
+        """Get the current state as a dict of frozen parts."""
+        game = self.game
+        game_state = game.game_state
+        parts = {
+            "player": (game.player_name, game.player_health, freeze(game.player_inventory)),
+            "flags": (game_state.bits, freeze(game_state.values))
+        }
+        if hasattr(game, 'locations_visited'):
+            parts["journey"] = (frozenset(game.locations_visited), tuple(game.choices_made),
+                                game.battles_won, game.spells_cast)
+        if hasattr(game, 'systems'):
+            systems = game.systems
+            time_system = systems.time_system
+            parts["stats"] = freeze(systems.stats_system.player_stats)
+            inventory = systems.inventory_system
+            parts["inventory"] = self.frozen_part("inventory", inventory.version,
+                                                  lambda: freeze(inventory.items))
+            parts["spells"] = tuple(systems.magic_system.known_spells)
+            parts["companions"] = freeze(systems.companion_system.companions)
+            parts["achievements"] = (frozenset(systems.achievement_system.unlocked_achievements),
+                                     freeze(systems.achievement_system.get_progress_data()))
+            parts["time"] = (time_system.game_time,
+                             self.frozen_part("events", time_system.events_version,
+                                              lambda: freeze(time_system.get_pending_events())))
+            parts["effects"] = freeze(systems.effect_system.active_effects)
+            parts["weather"] = systems.weather_system.current_weather
+            parts["location"] = systems.travel_system.location
+            parts["dungeon"] = freeze(systems.dungeon_system.get_save_data())
+            parts["equipment"] = tuple(systems.equipment_system.get_save_data())
+            parts["status"] = freeze(systems.player_status.get_save_data())
+            parts["riddles"] = freeze(systems.riddle_system.get_save_data())
+        return parts
+
+    def checkpoint(self, label):
+        """Snapshot the current state and make it the current point."""
+        parts = self.capture_parts()
+        if self.current:
+            # Share unchanged parts with the parent snapshot
+            previous = self.current.parts
+            for name, part in parts.items():
+                if previous.get(name) == part:
+                    parts[name] = previous[name]
+        self.current = Snapshot(label, parts, self.current)
+        self.checkpoints.append(self.current)
+        if len(self.checkpoints) > self.max_checkpoints:
+            self.evict(self.checkpoints.pop(0))
+        return self.current
+
+    def evict(self, snapshot):
+        """Cut a snapshot out of the tree, so it is freed once nothing else holds it."""
+        if snapshot.parent:
+            snapshot.parent.children.remove(snapshot)
+            snapshot.parent = None
+        for child in snapshot.children:
+            child.parent = None
+        snapshot.children = []
+
+    def restore(self, snapshot):
+        """Put the game back into the state of a snapshot."""
+        game = self.game
+        parts = snapshot.parts
+        game.player_name, game.player_health, inventory = parts["player"]
+        game.player_inventory = thaw(inventory)
+        bits, values = parts["flags"]
+        game_state = GameState(registry=game.game_state.registry)
+        game_state.bits = bits
+        game_state.values = thaw(values)
+        game.game_state = game_state
+        if "journey" in parts:
+            locations, choices, game.battles_won, game.spells_cast = parts["journey"]
+            game.locations_visited = set(locations)
+            game.choices_made = list(choices)
+        if "stats" in parts:
+            systems = game.systems
+            systems.stats_system.player_stats = thaw(parts["stats"])
+            systems.inventory_system.load_items(thaw(parts["inventory"]))
+            systems.magic_system.known_spells = list(parts["spells"])
+            systems.companion_system.companions = thaw(parts["companions"])
+            unlocked, progress = parts["achievements"]
+            systems.achievement_system.unlocked_achievements = set(unlocked)
+            systems.achievement_system.load_progress_data(thaw(progress))
+            game_time, events = parts["time"]
+            systems.time_system.set_time(game_time)
+            systems.player_status.load_save_data(thaw(parts["status"]), systems.stats_system.player_stats)
+            systems.time_system.load_pending_events(thaw(events))
+            systems.effect_system.active_effects = {
+                name: tuple(active) for name, active in thaw(parts["effects"]).items()
+            }
+            systems.weather_system.current_weather = parts["weather"]
+            systems.travel_system.location = parts["location"]
+            systems.dungeon_system.load_save_data(thaw(parts["dungeon"]))
+            systems.equipment_system.load_save_data(parts["equipment"])
+            systems.riddle_system.load_save_data(thaw(parts["riddles"]))
+            # The restored parts are the frozen form of what was just loaded
+            self.frozen["inventory"] = (systems.inventory_system.version, parts["inventory"])
+            self.frozen["events"] = (systems.time_system.events_version, events)
+        self.current = snapshot
+
+    def rewind(self, steps=1):
+        """Restore the snapshot a number of steps back along the timeline."""
+        snapshot = self.current
+        while snapshot and snapshot.parent and steps > 0:
+            snapshot = snapshot.parent
+            steps -= 1
+        if snapshot:
+            self.restore(snapshot)
+        return snapshot
+
+    def timeline(self):
+        """List the snapshots leading to the current one, oldest first."""
+        snapshots = []
+        snapshot = self.current
+        while snapshot:
+            snapshots.append(snapshot)
+            snapshot = snapshot.parent
+        snapshots.reverse()
+        return snapshots
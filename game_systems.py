@@ -4,26 +4,53 @@ Enhanced Game Systems for Mystic Quest
 Advanced gameplay mechanics including inventory, stats, weather, and more.
 """
 
+import bisect
+import heapq
 import random
 import json
 import os
+from collections.abc import MutableMapping
 from datetime import datetime
+from types import MappingProxyType
+
+from companion_ai import (AMBUSH, HEAL, HESITATE, MAX_LOYALTY, TRACK, WEAKEN, WOUNDED,
+                          decide_for_parties, exploration_finds, loyalty_changes)
+from crafting import CraftingSystem
+from dungeon import DungeonSystem
+from equipment import EquipmentSystem
+from loot import LootSystem
+from regeneration import RegenerationSystem
+from riddles import RiddleSystem
+from spell_engine import STATUS_EFFECTS, StatusEffects, TickScheduler
+from world_map import TravelSystem
 
 
 class GameSystems:
     """Advanced game systems for enhanced gameplay."""
     
-    def __init__(self, game_engine):
+    def __init__(self, game_engine, seed=None):
         self.game = game_engine
-        self.weather_system = WeatherSystem()
-        self.inventory_system = InventorySystem()
-        self.stats_system = StatsSystem()
-        self.achievement_system = AchievementSystem()
-        self.random_events = RandomEventSystem()
-        self.combat_system = CombatSystem()
+        self.rng = random.Random(seed)  # Per-session randomness, such as dungeon seeds
+        self.event_bus = EventBus()
+        self.weather_system = WeatherSystem(self.rng)
+        self.inventory_system = InventorySystem(self.event_bus)
+        self.stats_system = StatsSystem(self.event_bus, self.rng)
+        self.achievement_system = AchievementSystem(self.event_bus)
+        self.random_events = RandomEventSystem(self.rng)
+        self.combat_system = CombatSystem(self.rng)
         self.magic_system = MagicSystem()
-        self.companion_system = CompanionSystem()
+        self.companion_system = CompanionSystem(self.event_bus, self)
         self.time_system = TimeSystem()
+        # The player's statuses and spell cooldowns outside battle, in game hours
+        self.player_status = StatusEffects(self.time_system.ticks, self.stats_system.player_stats)
+        self.effect_system = EffectSystem(self)
+        self.regeneration_system = RegenerationSystem(self)
+        self.travel_system = TravelSystem(self)
+        self.dungeon_system = DungeonSystem(self)
+        self.loot_system = LootSystem(self)
+        self.crafting_system = CraftingSystem(self)
+        self.equipment_system = EquipmentSystem(self)
+        self.riddle_system = RiddleSystem(self)
         
     def initialize_player(self, name):
         """Initialize all player systems."""
@@ -32,12 +59,107 @@ class GameSystems:
         self.magic_system.initialize()
         self.companion_system.initialize()
         self.time_system.initialize()
+        self.player_status.load_save_data(None, self.stats_system.player_stats)
+        self.travel_system.initialize()
+        self.dungeon_system.initialize()
+        self.equipment_system.initialize()
+        self.riddle_system.initialize()
+
+
+class GameEvent:
+    """Event types published on the game event bus."""
+    
+    LOCATION_VISITED = "location_visited"
+    ITEM_COLLECTED = "item_collected"
+    BATTLE_WON = "battle_won"
+    SPELL_CAST = "spell_cast"
+    CHOICE_MADE = "choice_made"
+    LEVEL_UP = "level_up"
+    COMPANION_RECRUITED = "companion_recruited"
+    ALL = frozenset([
+        LOCATION_VISITED, ITEM_COLLECTED, BATTLE_WON, SPELL_CAST,
+        CHOICE_MADE, LEVEL_UP, COMPANION_RECRUITED
+    ])
+
+
+class EventBus:
+    """Publish/subscribe bus for gameplay events."""
+    
+    def __init__(self):
+        self.subscribers = {}
+        
+    def subscribe(self, event_type, handler):
+        """Call handler(event) whenever an event of this type is published."""
+        if event_type not in GameEvent.ALL:
+            raise ValueError(f"Unknown game event type: {event_type}")
+        self.subscribers.setdefault(event_type, []).append(handler)
+        
+    def publish(self, event_type, **payload):
+        """Publish an event to every subscriber of its type."""
+        if event_type not in GameEvent.ALL:
+            raise ValueError(f"Unknown game event type: {event_type}")
+        handlers = self.subscribers.get(event_type)
+        if handlers:
+            payload["type"] = event_type
+            for handler in handlers:
+                handler(payload)
+
+
+def content_table(entries):
+    """Make a read-only content table shared by every game session."""
+    return MappingProxyType({key: MappingProxyType(entry) for key, entry in entries.items()})
+
+
+class ContentDatabase(MutableMapping):
+    """One session's view of a shared content table.
+    
+    Reads fall through to the shared table, whose entries are read-only.
+    Entries added, replaced or removed during the session only change the
+    session's overlay, so the shared table is built once per process.
+    """
+    
+    def __init__(self, base):
+        self.base = base
+        self.overlay = {}
+        self.removed = set()
+        
+    def __getitem__(self, key):
+        if key in self.overlay:
+            return self.overlay[key]
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+        
+    def __setitem__(self, key, value):
+        self.overlay[key] = value
+        self.removed.discard(key)
+        
+    def __delitem__(self, key):
+        present = key in self
+        self.overlay.pop(key, None)
+        if key in self.base:
+            self.removed.add(key)
+        if not present:
+            raise KeyError(key)
+            
+    def __contains__(self, key):
+        return key in self.overlay or (key in self.base and key not in self.removed)
+        
+    def __iter__(self):
+        for key in self.base:
+            if key not in self.overlay and key not in self.removed:
+                yield key
+        yield from self.overlay
+        
+    def __len__(self):
+        return sum(1 for _ in self)
 
 
 class WeatherSystem:
     """Dynamic weather system that affects gameplay."""
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random
         self.current_weather = "clear"
         self.weather_types = {
             "clear": {"description": "☀️ Clear skies", "effect": "normal"},
@@ -50,7 +172,7 @@ class WeatherSystem:
         
     def change_weather(self):
         """Randomly change the weather."""
-        self.current_weather = random.choice(list(self.weather_types.keys()))
+        self.current_weather = self.rng.choice(list(self.weather_types.keys()))
         
     def get_weather_info(self):
         """Get current weather information."""
@@ -62,36 +184,144 @@ class WeatherSystem:
         return self.weather_types[self.current_weather]["effect"]
 
 
+ITEM_DATABASE = content_table({
+    "healing_potion": {"name": "Healing Potion", "type": "consumable", "rarity": "common", "effect": "heal_50", "description": "Restores 50 health points"},
+    "magic_crystal": {"name": "Magic Crystal", "type": "artifact", "rarity": "uncommon", "effect": "mana_boost", "description": "Increases magical power"},
+    "ancient_key": {"name": "Ancient Key", "type": "key", "rarity": "uncommon", "effect": "unlock", "description": "Opens mysterious doors"},
+    "elven_cloak": {"name": "Elven Cloak", "type": "equipment", "rarity": "rare", "slot": "cloak", "bonuses": {"agility": 3}, "effect": "stealth_boost", "description": "Grants enhanced stealth abilities"},
+    "dragon_scale": {"name": "Dragon Scale", "type": "material", "rarity": "rare", "weight": 1.5, "effect": "fire_resistance", "description": "Provides protection from fire"},
+    "wisdom_scroll": {"name": "Wisdom Scroll", "type": "consumable", "rarity": "uncommon", "weight": 0.2, "effect": "experience_boost", "description": "Grants additional experience"},
+    "fairy_dust": {"name": "Fairy Dust", "type": "material", "rarity": "common", "weight": 0.1, "effect": "magic_enhancement", "description": "Enhances magical abilities"},
+    "shadow_gem": {"name": "Shadow Gem", "type": "artifact", "rarity": "legendary", "effect": "dark_magic", "description": "Grants access to shadow magic"},
+    "greater_healing_potion": {"name": "Greater Healing Potion", "type": "consumable", "rarity": "uncommon", "effect": ["heal_50", "restore_health"], "description": "Restores 90 health points"},
+    "dragonfire_amulet": {"name": "Dragonfire Amulet", "type": "equipment", "rarity": "legendary", "slot": "amulet", "weight": 0.5, "bonuses": {"intelligence": 4, "max_mana": 15, "mana_regen": 1}, "effect": ["fire_resistance", "magic_enhancement"], "description": "Wards off fire and sharpens magic"},
+    "shadow_cloak": {"name": "Shadow Cloak", "type": "equipment", "rarity": "legendary", "slot": "cloak", "bonuses": {"agility": 5, "luck": 2}, "effect": "stealth_boost", "description": "Woven from shadow; hides you completely"},
+    "arcane_crystal": {"name": "Arcane Crystal", "type": "artifact", "rarity": "rare", "effect": ["mana_boost", "experience_boost"], "description": "Expands magical power and insight"},
+    "dragonscale_mail": {"name": "Dragonscale Mail", "type": "equipment", "rarity": "rare", "slot": "body", "weight": 8.0, "bonuses": {"max_health": 30, "strength": 2, "health_regen": 1}, "effect": "fire_resistance", "description": "Armour of overlapping dragon scales"},
+    "shadow_hood": {"name": "Shadow Hood", "type": "equipment", "rarity": "rare", "slot": "head", "weight": 1.0, "bonuses": {"intelligence": 2, "luck": 3}, "effect": "stealth_boost", "description": "A hood that drinks the light around your face"}
+})
+
+# Stack limit and weight for each item type; items may override the weight
+ITEM_TYPE_RULES = content_table({
+    "consumable": {"stack_limit": 20, "weight": 0.5},
+    "material": {"stack_limit": 50, "weight": 0.2},
+    "artifact": {"stack_limit": 5, "weight": 1.0},
+    "equipment": {"stack_limit": 1, "weight": 3.0},
+    "key": {"stack_limit": 10, "weight": 0.1}
+})
+
+RARITY_ORDER = ["common", "uncommon", "rare", "legendary"]
+
+
 class InventorySystem:
-    """Advanced inventory management system."""
+    """Advanced inventory management system.
     
-    def __init__(self):
+    Items stack up to their type's stack limit, and each stack takes one of
+    ``max_slots`` bag slots; everything carried counts towards
+    ``max_weight``. Sorted views by name and rarity, and name-sorted groups
+    by type, are kept up to date as items come and go, so displaying a
+    large inventory never sorts it.
+    """
+    
+    def __init__(self, event_bus=None):
+        self.event_bus = event_bus
         self.items = {}
-        self.max_capacity = 10
-        self.item_database = {
-            "healing_potion": {"name": "Healing Potion", "type": "consumable", "effect": "heal_50", "description": "Restores 50 health points"},
-            "magic_crystal": {"name": "Magic Crystal", "type": "artifact", "effect": "mana_boost", "description": "Increases magical power"},
-            "ancient_key": {"name": "Ancient Key", "type": "key", "effect": "unlock", "description": "Opens mysterious doors"},
-            "elven_cloak": {"name": "Elven Cloak", "type": "equipment", "effect": "stealth_boost", "description": "Grants enhanced stealth abilities"},
-            "dragon_scale": {"name": "Dragon Scale", "type": "material", "effect": "fire_resistance", "description": "Provides protection from fire"},
-            "wisdom_scroll": {"name": "Wisdom Scroll", "type": "consumable", "effect": "experience_boost", "description": "Grants additional experience"},
-            "fairy_dust": {"name": "Fairy Dust", "type": "material", "effect": "magic_enhancement", "description": "Enhances magical abilities"},
-            "shadow_gem": {"name": "Shadow Gem", "type": "artifact", "effect": "dark_magic", "description": "Grants access to shadow magic"}
-        }
+        self.max_slots = 24
+        self.max_weight = 80.0
+        self.slots_used = 0
+        self.weight = 0.0
+        self.item_database = ContentDatabase(ITEM_DATABASE)
+        self.by_name = []  # Sorted (name, item id)
+        self.by_rarity = []  # Sorted (-rarity rank, name, item id), rarest first
+        self.by_type = {}  # Type -> sorted (name, item id)
+        self.version = 0  # Counts changes, so unchanged contents can be shared
         
     def initialize(self):
         """Initialize inventory with starting items."""
+        self.load_items({})
         self.add_item("healing_potion", 2)
         
+    def stack_limit(self, item_id):
+        """Get how many of an item fit in one slot."""
+        return ITEM_TYPE_RULES[self.item_database[item_id]["type"]]["stack_limit"]
+        
+    def item_weight(self, item_id):
+        """Get the weight of one of an item."""
+        item = self.item_database[item_id]
+        return item.get("weight", ITEM_TYPE_RULES[item["type"]]["weight"])
+        
+    def slots_for(self, item_id, quantity):
+        """Get the slots a quantity of an item takes."""
+        return -(-quantity // self.stack_limit(item_id))
+        
+    def can_hold(self, changes):
+        """Check whether the inventory can take {item id: quantity change}.
+        
+        Returns (True, "") or (False, reason), without changing anything.
+        """
+        slots = self.slots_used
+        weight = self.weight
+        for item_id, change in changes.items():
+            held = self.items.get(item_id, 0)
+            if held + change < 0:
+                return False, "Not enough items!"
+            slots += self.slots_for(item_id, held + change) - self.slots_for(item_id, held)
+            weight += self.item_weight(item_id) * change
+        if slots > self.max_slots:
+            return False, "Inventory is full!"
+        if weight > self.max_weight + 1e-9:
+            return False, "That's too heavy to carry!"
+        return True, ""
+        
+    def view_keys(self, item_id):
+        """Get an item's sort keys for the name, rarity and type views."""
+        item = self.item_database[item_id]
+        rank = RARITY_ORDER.index(item.get("rarity", "common"))
+        return (item["name"], item_id), (-rank, item["name"], item_id), item["type"]
+        
+    def change_quantity(self, item_id, change):
+        """Apply a quantity change, keeping the totals and views in step."""
+        self.version += 1
+        held = self.items.get(item_id, 0)
+        self.slots_used += self.slots_for(item_id, held + change) - self.slots_for(item_id, held)
+        self.weight += self.item_weight(item_id) * change
+        name_key, rarity_key, item_type = self.view_keys(item_id)
+        if held == 0:
+            bisect.insort(self.by_name, name_key)
+            bisect.insort(self.by_rarity, rarity_key)
+            bisect.insort(self.by_type.setdefault(item_type, []), name_key)
+        if held + change > 0:
+            self.items[item_id] = held + change
+            return
+        del self.items[item_id]
+        for view, key in ((self.by_name, name_key), (self.by_rarity, rarity_key),
+                          (self.by_type[item_type], name_key)):
+            del view[bisect.bisect_left(view, key)]
+        if not self.by_type[item_type]:
+            del self.by_type[item_type]
+            
+    def load_items(self, items):
+        """Replace the inventory's contents, such as from a save."""
+        self.version += 1
+        self.items = {}
+        self.slots_used = 0
+        self.weight = 0.0
+        self.by_name = []
+        self.by_rarity = []
+        self.by_type = {}
+        for item_id, quantity in items.items():
+            if quantity > 0:
+                self.change_quantity(item_id, quantity)
+        
     def add_item(self, item_id, quantity=1):
         """Add an item to inventory."""
-        if len(self.items) >= self.max_capacity and item_id not in self.items:
-            return False, "Inventory is full!"
+        can_hold, reason = self.can_hold({item_id: quantity})
+        if not can_hold:
+            return False, reason
             
-        if item_id in self.items:
-            self.items[item_id] += quantity
-        else:
-            self.items[item_id] = quantity
+        self.change_quantity(item_id, quantity)
+        if self.event_bus:
+            self.event_bus.publish(GameEvent.ITEM_COLLECTED, item_id=item_id, quantity=quantity)
         return True, f"Added {quantity} {self.item_database[item_id]['name']}(s)"
         
     def remove_item(self, item_id, quantity=1):
@@ -99,31 +329,54 @@ class InventorySystem:
         if item_id not in self.items or self.items[item_id] < quantity:
             return False, "Not enough items!"
             
-        self.items[item_id] -= quantity
-        if self.items[item_id] <= 0:
-            del self.items[item_id]
+        self.change_quantity(item_id, -quantity)
         return True, f"Used {quantity} {self.item_database[item_id]['name']}(s)"
         
-    def display_inventory(self):
-        """Display current inventory."""
+    def sorted_items(self, order="name"):
+        """Get the held item ids sorted by "name" or by "rarity", rarest first."""
+        if order == "rarity":
+            return [item_id for _, _, item_id in self.by_rarity]
+        if order == "name":
+            return [item_id for _, item_id in self.by_name]
+        raise ValueError(f"Unknown inventory order: {order}")
+        
+    def grouped_items(self):
+        """Get {type: [item ids sorted by name]} for the held items."""
+        return {item_type: [item_id for _, item_id in group]
+                for item_type, group in sorted(self.by_type.items())}
+        
+    def display_inventory(self, order="type"):
+        """Display current inventory, grouped by type or sorted by name or rarity."""
         if not self.items:
             return "Your inventory is empty."
             
-        inventory_text = "📦 INVENTORY:\n"
-        inventory_text += "=" * 40 + "\n"
-        
-        for item_id, quantity in self.items.items():
-            item = self.item_database[item_id]
-            inventory_text += f"• {item['name']} x{quantity}\n"
-            inventory_text += f"  {item['description']}\n\n"
-            
-        return inventory_text
+        lines = [f"📦 INVENTORY: {self.slots_used}/{self.max_slots} slots, "
+                 f"{self.weight:.1f}/{self.max_weight:.0f} weight", "=" * 40]
+        if order == "type":
+            sections = [(item_type.title(), item_ids) for item_type, item_ids in self.grouped_items().items()]
+        else:
+            sections = [(None, self.sorted_items(order))]
+        for heading, item_ids in sections:
+            if heading:
+                lines.append(f"-- {heading} --")
+            for item_id in item_ids:
+                item = self.item_database[item_id]
+                lines.append(f"• {item['name']} x{self.items[item_id]} ({item.get('rarity', 'common')})")
+                lines.append(f"  {item['description']}\n")
+        return "\n".join(lines) + "\n"
 
 
 class StatsSystem:
     """Character progression and stats system."""
     
-    def __init__(self):
+    max_level = 100
+    # Total experience required to reach each level; index 0 is level 1
+    experience_curve = [level * 100 for level in range(max_level)]
+    level_up_stats = ["strength", "intelligence", "agility", "luck"]
+    
+    def __init__(self, event_bus=None, rng=None):
+        self.event_bus = event_bus
+        self.rng = rng or random
         self.player_stats = {
             "name": "",
             "level": 1,
@@ -142,28 +395,86 @@ class StatsSystem:
         """Initialize player stats."""
         self.player_stats["name"] = name
         
+    def level_for_experience(self, experience):
+        """Get the level a total amount of experience corresponds to."""
+        return min(self.max_level, bisect.bisect_right(self.experience_curve, experience))
+        
+    def experience_for_next_level(self, level):
+        """Get the total experience needed to advance past a level."""
+        if level >= self.max_level:
+            return self.experience_curve[-1]
+        return self.experience_curve[level]
+        
     def gain_experience(self, amount):
         """Gain experience and check for level up."""
-        self.player_stats["experience"] += amount
-        exp_needed = self.player_stats["level"] * 100
+        report = self.apply_experience(amount)
+        return report["levels_gained"] > 0, report["message"]
+        
+    def apply_experience(self, amount):
+        """Gain experience and resolve every level it earns in one step.
         
-        if self.player_stats["experience"] >= exp_needed:
-            return self.level_up()
-        return False, f"Gained {amount} experience!"
+        Returns a report dict with the old and new level, the stat gains
+        applied and a display message.
+        """
+        stats = self.player_stats
+        old_level = stats["level"]
+        stats["experience"] += amount
+        new_level = max(old_level, self.level_for_experience(stats["experience"]))
+        
+        report = self.apply_level_gains(new_level - old_level)
+        report["experience_gained"] = amount
+        if report["levels_gained"] == 0:
+            report["message"] = f"Gained {amount} experience!"
+        return report
         
     def level_up(self):
         """Level up the player."""
-        self.player_stats["level"] += 1
-        self.player_stats["max_health"] += 20
-        self.player_stats["max_mana"] += 10
-        self.player_stats["health"] = self.player_stats["max_health"]
-        self.player_stats["mana"] = self.player_stats["max_mana"]
+        report = self.apply_level_gains(1)
+        return True, report["message"]
         
-        # Random stat increase
-        stat_to_increase = random.choice(["strength", "intelligence", "agility", "luck"])
-        self.player_stats[stat_to_increase] += 2
+    def apply_level_gains(self, levels):
+        """Apply the stat gains for several levels at once."""
+        stats = self.player_stats
+        report = {
+            "old_level": stats["level"],
+            "new_level": stats["level"],
+            "levels_gained": levels,
+            "max_health_gain": 0,
+            "max_mana_gain": 0,
+            "stat_gains": {},
+            "message": ""
+        }
+        if levels <= 0:
+            report["levels_gained"] = 0
+            return report
+            
+        stats["level"] += levels
+        stats["max_health"] += 20 * levels
+        stats["max_mana"] += 10 * levels
+        stats["health"] = stats["max_health"]
+        stats["mana"] = stats["max_mana"]
         
-        return True, f"🎉 LEVEL UP! You are now level {self.player_stats['level']}!\n{stat_to_increase.title()} increased by 2!"
+        # Random stat increase for each level gained
+        for stat in self.rng.choices(self.level_up_stats, k=levels):
+            report["stat_gains"][stat] = report["stat_gains"].get(stat, 0) + 2
+        for stat, gain in report["stat_gains"].items():
+            stats[stat] += gain
+            
+        report["new_level"] = stats["level"]
+        report["max_health_gain"] = 20 * levels
+        report["max_mana_gain"] = 10 * levels
+        gains_text = ", ".join(f"{stat.title()} increased by {gain}"
+                               for stat, gain in report["stat_gains"].items())
+        report["message"] = f"🎉 LEVEL UP! You are now level {stats['level']}!\n{gains_text}!"
+        if self.event_bus:
+            self.event_bus.publish(GameEvent.LEVEL_UP, level=stats["level"])
+        return report
+        
+    def regenerate(self, health, mana):
+        """Restore health and mana regained over time, up to their maximums."""
+        stats = self.player_stats
+        stats["health"] = min(stats["max_health"], stats["health"] + health)
+        stats["mana"] = min(stats["max_mana"], stats["mana"] + mana)
         
     def display_stats(self):
         """Display player statistics."""
@@ -171,7 +482,7 @@ class StatsSystem:
         stats_text = f"""
 🏆 CHARACTER STATS - {stats['name']}
 {'=' * 40}
-Level: {stats['level']} | Experience: {stats['experience']}/{stats['level'] * 100}
+Level: {stats['level']} | Experience: {stats['experience']}/{self.experience_for_next_level(stats['level'])}
 Health: {stats['health']}/{stats['max_health']} ❤️
 Mana: {stats['mana']}/{stats['max_mana']} 💙
 
@@ -181,24 +492,97 @@ Agility: {stats['agility']} 🏃 | Luck: {stats['luck']} 🍀
         return stats_text
 
 
+ACHIEVEMENTS = content_table({
+    "first_steps": {"name": "First Steps", "description": "Begin your adventure", "icon": "👣"},
+    "explorer": {"name": "Explorer", "description": "Visit 5 different locations", "icon": "🗺️"},
+    "collector": {"name": "Collector", "description": "Collect 10 different items", "icon": "📦"},
+    "level_master": {"name": "Level Master", "description": "Reach level 5", "icon": "⭐"},
+    "spell_caster": {"name": "Spell Caster", "description": "Cast 10 spells", "icon": "🔮"},
+    "beast_friend": {"name": "Beast Friend", "description": "Befriend a magical creature", "icon": "🐺"},
+    "treasure_hunter": {"name": "Treasure Hunter", "description": "Find hidden treasure", "icon": "💎"},
+    "wise_one": {"name": "Wise One", "description": "Make 5 wisdom-based choices", "icon": "🦉"},
+    "warrior": {"name": "Warrior", "description": "Win 10 battles", "icon": "⚔️"},
+    "peacemaker": {"name": "Peacemaker", "description": "Resolve conflicts peacefully", "icon": "🕊️"}
+})
+
+# Rules: the event that advances each achievement and its target.
+# "distinct" counts unique payload values, "value" reads a payload
+# value directly and "tag" only counts choices carrying that tag.
+ACHIEVEMENT_RULES = content_table({
+    "explorer": {"event": GameEvent.LOCATION_VISITED, "distinct": "location", "target": 5},
+    "collector": {"event": GameEvent.ITEM_COLLECTED, "distinct": "item_id", "target": 10},
+    "level_master": {"event": GameEvent.LEVEL_UP, "value": "level", "target": 5},
+    "spell_caster": {"event": GameEvent.SPELL_CAST, "target": 10},
+    "beast_friend": {"event": GameEvent.COMPANION_RECRUITED, "target": 1},
+    "treasure_hunter": {"event": GameEvent.CHOICE_MADE, "tag": "treasure", "target": 1},
+    "wise_one": {"event": GameEvent.CHOICE_MADE, "tag": "wisdom", "target": 5},
+    "warrior": {"event": GameEvent.BATTLE_WON, "target": 10},
+    "peacemaker": {"event": GameEvent.CHOICE_MADE, "tag": "peaceful", "target": 1}
+})
+
+# Index rules by event so each event only re-evaluates its own rules
+ACHIEVEMENTS_BY_EVENT = {}
+for achievement_id, rule in ACHIEVEMENT_RULES.items():
+    ACHIEVEMENTS_BY_EVENT.setdefault(rule["event"], []).append(achievement_id)
+
+
 class AchievementSystem:
     """Track and display player achievements."""
     
-    def __init__(self):
+    def __init__(self, event_bus=None):
         self.unlocked_achievements = set()
-        self.achievements = {
-            "first_steps": {"name": "First Steps", "description": "Begin your adventure", "icon": "👣"},
-            "explorer": {"name": "Explorer", "description": "Visit 5 different locations", "icon": "🗺️"},
-            "collector": {"name": "Collector", "description": "Collect 10 different items", "icon": "📦"},
-            "level_master": {"name": "Level Master", "description": "Reach level 5", "icon": "⭐"},
-            "spell_caster": {"name": "Spell Caster", "description": "Cast 10 spells", "icon": "🔮"},
-            "beast_friend": {"name": "Beast Friend", "description": "Befriend a magical creature", "icon": "🐺"},
-            "treasure_hunter": {"name": "Treasure Hunter", "description": "Find hidden treasure", "icon": "💎"},
-            "wise_one": {"name": "Wise One", "description": "Make 5 wisdom-based choices", "icon": "🦉"},
-            "warrior": {"name": "Warrior", "description": "Win 10 battles", "icon": "⚔️"},
-            "peacemaker": {"name": "Peacemaker", "description": "Resolve conflicts peacefully", "icon": "🕊️"}
-        }
+        self.achievements = ContentDatabase(ACHIEVEMENTS)
+        self.achievement_rules = ACHIEVEMENT_RULES
+        self.progress = {}
+        self.notifications = []
+        
+        self.rules_by_event = ACHIEVEMENTS_BY_EVENT
+        if event_bus:
+            for event_type in self.rules_by_event:
+                event_bus.subscribe(event_type, self.handle_event)
+                
+    def handle_event(self, event):
+        """Advance the achievements that depend on this event."""
+        for achievement_id in self.rules_by_event.get(event["type"], ()):
+            if achievement_id in self.unlocked_achievements:
+                continue
+            rule = self.achievement_rules[achievement_id]
+            if "tag" in rule and rule["tag"] not in event.get("tags", ()):
+                continue
+                
+            if "distinct" in rule:
+                seen = self.progress.setdefault(achievement_id, set())
+                seen.add(event[rule["distinct"]])
+                count = len(seen)
+            elif "value" in rule:
+                count = event[rule["value"]]
+            else:
+                count = self.progress.get(achievement_id, 0) + 1
+                self.progress[achievement_id] = count
+                
+            if count >= rule["target"]:
+                message = self.unlock_achievement(achievement_id)
+                if message:
+                    self.notifications.append(message)
+                    
+    def pop_notifications(self):
+        """Get and clear the achievement messages unlocked by events."""
+        notifications = self.notifications
+        self.notifications = []
+        return notifications
         
+    def get_progress_data(self):
+        """Get achievement progress in a JSON-friendly form."""
+        return {achievement_id: sorted(value) if isinstance(value, set) else value
+                for achievement_id, value in self.progress.items()}
+                
+    def load_progress_data(self, data):
+        """Restore achievement progress from saved data."""
+        self.progress = {}
+        for achievement_id, value in data.items():
+            rule = self.achievement_rules.get(achievement_id, {})
+            self.progress[achievement_id] = set(value) if "distinct" in rule else value
+            
     def unlock_achievement(self, achievement_id):
         """Unlock an achievement."""
         if achievement_id not in self.unlocked_achievements:
@@ -222,7 +606,8 @@ class AchievementSystem:
 class RandomEventSystem:
     """System for random encounters and events."""
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random
         self.events = [
             {
                 "name": "Mysterious Merchant",
@@ -258,8 +643,8 @@ class RandomEventSystem:
         
     def trigger_random_event(self):
         """Trigger a random event based on probability."""
-        if random.random() < 0.3:  # 30% chance
-            event = random.choice(self.events)
+        if self.rng.random() < 0.3:  # 30% chance
+            event = self.rng.choice(self.events)
             return event
         return None
 
@@ -267,8 +652,11 @@ class RandomEventSystem:
 class CombatSystem:
     """Turn-based combat system."""
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random
         self.in_combat = False
+        self.combat_effects = {}
+        self.register_builtin_combat_effects()
         
     def start_combat(self, enemy):
         """Start a combat encounter."""
@@ -277,15 +665,376 @@ class CombatSystem:
         
     def player_attack(self, player_stats, enemy):
         """Player attacks enemy."""
-        damage = random.randint(5, player_stats["strength"])
+        damage = self.rng.randint(5, player_stats["strength"])
         enemy["health"] -= damage
         return f"You deal {damage} damage to {enemy['name']}!"
         
     def enemy_attack(self, enemy, player_stats):
         """Enemy attacks player."""
-        damage = random.randint(3, enemy["attack"])
+        damage = self.rng.randint(3, enemy["attack"])
         player_stats["health"] -= damage
         return f"{enemy['name']} deals {damage} damage to you!"
+        
+    def start_battle(self, systems, enemies, log=None, rng=None):
+        """Set up a full battle against one or more enemies.
+        
+        The player and companions fight as combatant copies, so nothing in
+        the live game changes until Battle.apply_result is called. Pass a
+        log callable (such as print) to receive the battle narration.
+        """
+        self.in_combat = True
+        if isinstance(enemies, dict):
+            enemies = [enemies]
+        return Battle(self, systems, enemies, log=log, rng=rng)
+        
+    def auto_resolve(self, systems, enemies, rng=None):
+        """Run a whole battle with the default policies and no narration."""
+        battle = self.start_battle(systems, enemies, rng=rng)
+        result = battle.run()
+        self.in_combat = False
+        return result
+        
+    def register_combat_effect(self, effect_name, handler):
+        """Register a handler called as handler(battle, caster, target) -> message."""
+        self.combat_effects[effect_name] = handler
+        
+    def register_builtin_combat_effects(self):
+        """Register in-combat behaviour for the base spell and item effects."""
+        self.register_combat_effect("heal_50", lambda battle, caster, target: battle.heal(caster, 50))
+        self.register_combat_effect("restore_health", lambda battle, caster, target: battle.heal(caster, 40))
+        self.register_combat_effect("fire_damage", combat_fire_damage)
+        self.register_combat_effect("protection", lambda battle, caster, target:
+                                    battle.add_status(caster, "shielded", 3))
+        self.register_combat_effect("reveal_secrets", lambda battle, caster, target:
+                                    battle.add_status(target, "weakened", 2))
+        self.register_combat_effect("temporal_freeze", lambda battle, caster, target:
+                                    battle.add_status(target, "frozen", 2))
+        self.register_combat_effect("regeneration", lambda battle, caster, target:
+                                    battle.add_status(caster, "regenerating", 3))
+        self.register_combat_effect("raw_magic", combat_raw_magic)
+
+
+class Battle:
+    """A single battle driven by an agility-based initiative queue.
+    
+    Each combatant acts when its next action time comes up on a heap; faster
+    combatants act more often. Status effects and spell cooldowns count
+    rounds of ``round_length`` initiative time on the battle's tick
+    scheduler, which catches up before every turn.
+    """
+    
+    max_turns = 200
+    round_length = 10  # Initiative time per round; agility 10 acts once a round
+    
+    def __init__(self, combat_system, systems, enemies, log=None, rng=None):
+        self.combat_system = combat_system
+        self.systems = systems
+        self.log = log
+        self.rng = rng or systems.rng
+        self.turns = 0
+        self.items = dict(systems.inventory_system.items)
+        self.items_used = {}
+        self.deferred_effects = []  # Effects with no combat use, applied with the result
+        self.ticks = TickScheduler()
+        
+        stats = systems.stats_system.player_stats
+        self.player = {
+            "name": stats["name"] or "You", "side": "player", "kind": "player",
+            "health": stats["health"], "max_health": stats["max_health"],
+            "mana": stats["mana"], "max_mana": stats["max_mana"],
+            "attack": max(5, stats["strength"]), "agility": max(1, stats["agility"]),
+            "intelligence": stats["intelligence"], "strength": stats["strength"]
+        }
+        self.combatants = [self.player]
+        for companion in systems.companion_system.companions:
+            self.combatants.append({
+                "name": companion["name"], "side": "player", "kind": "companion",
+                "ability": companion["ability"], "loyalty": companion["loyalty"],
+                "health": 50, "max_health": 50,
+                "attack": 6 + companion["loyalty"] // 10, "agility": 12
+            })
+        for enemy in enemies:
+            self.combatants.append({
+                "name": enemy["name"], "side": "enemy", "kind": "enemy",
+                "health": enemy["health"], "max_health": enemy.get("max_health", enemy["health"]),
+                "attack": max(3, enemy["attack"]), "agility": max(1, enemy.get("agility", 8))
+            })
+        for combatant in self.combatants:
+            combatant["status"] = StatusEffects(self.ticks, combatant)
+        # Statuses and spell cooldowns from outside battle, such as a shield
+        # cast beforehand, carry in with their remaining hours as rounds
+        player_status = systems.player_status
+        for name in player_status:
+            self.player["status"].apply(name, player_status.remaining(name), player_status.stacks(name))
+        for spell_id in player_status.cooldowns:
+            self.player["status"].start_cooldown(spell_id, player_status.cooldown_left(spell_id))
+            
+        # Initiative heap of (next action time, sequence, combatant index)
+        self.initiative = [(100 / c["agility"], index, index) for index, c in enumerate(self.combatants)]
+        heapq.heapify(self.initiative)
+        self.sequence = len(self.combatants)
+        
+    def narrate(self, message):
+        """Send a message to the battle log, if any."""
+        if self.log and message:
+            self.log(message)
+            
+    def living(self, side):
+        """Get the living combatants on one side."""
+        return [c for c in self.combatants if c["side"] == side and c["health"] > 0]
+        
+    def winner(self):
+        """Get the winning side, or None while the battle continues."""
+        if self.player["health"] <= 0 or not self.living("player"):
+            return "enemy"
+        if not self.living("enemy"):
+            return "player"
+        if self.turns >= self.max_turns:
+            return "draw"
+        return None
+        
+    def next_actor(self):
+        """Pop the next living combatant from the initiative queue."""
+        while self.initiative:
+            action_time, _, index = heapq.heappop(self.initiative)
+            combatant = self.combatants[index]
+            self.advance_rounds(action_time)
+            if combatant["health"] > 0:
+                heapq.heappush(self.initiative,
+                               (action_time + 100 / combatant["agility"], self.sequence, index))
+                self.sequence += 1
+                return combatant
+        return None
+        
+    def advance_rounds(self, action_time):
+        """Run status effects up to the round an action time falls in."""
+        changes, expired = self.ticks.advance_to(int(action_time // self.round_length))
+        for status, change in changes.items():
+            if change:
+                # Effects that ran out this round still did their work
+                names = list(status) + [name for ended, name in expired if ended is status]
+                causes = ", ".join(name for name in names if STATUS_EFFECTS[name][0])
+                self.narrate(f"{status.owner['name']} is {causes} ({change:+d} health)")
+                
+    def tick_status(self, combatant):
+        """Check whether a combatant can act; being frozen costs one turn."""
+        status = combatant["status"]
+        if "frozen" in status:
+            status.remove("frozen")
+            self.narrate(f"⏰ {combatant['name']} is frozen in time!")
+            return False
+        return combatant["health"] > 0
+        
+    def add_status(self, combatant, name, rounds):
+        """Apply a status effect for a number of rounds, following its stacking rule."""
+        return combatant["status"].apply(name, rounds)
+        
+    def heal(self, combatant, amount):
+        """Heal a combatant up to its maximum health."""
+        old_health = combatant["health"]
+        combatant["health"] = min(combatant["max_health"], combatant["health"] + amount)
+        return f"❤️ {combatant['name']} recovers {combatant['health'] - old_health} health!"
+        
+    def deal_damage(self, attacker, target, damage):
+        """Apply damage after status modifiers and return the amount dealt."""
+        if "weakened" in target["status"]:
+            damage = damage * 3 // 2
+        if "shielded" in target["status"]:
+            damage //= 2
+        target["health"] -= damage
+        self.narrate(f"{attacker['name']} deals {damage} damage to {target['name']}!")
+        return damage
+        
+    def attack(self, attacker, target):
+        """Make a basic weapon attack."""
+        low = 5 if attacker["kind"] == "player" else 3
+        return self.deal_damage(attacker, target, self.rng.randint(low, max(low, attacker["attack"])))
+        
+    def cast_spell(self, spell_id, target):
+        """Cast a known spell from the player, paying mana from the combatant."""
+        magic_system = self.systems.magic_system
+        success, message = magic_system.cast_spell(spell_id, self.player, self.player["status"])
+        self.narrate(message)
+        if success:
+            self.apply_effect(f"spell:{spell_id}", magic_system.spell_database[spell_id]["effect"], target)
+        return success
+        
+    def use_item(self, item_id, target):
+        """Use an item from the battle's copy of the inventory."""
+        if self.items.get(item_id, 0) <= 0:
+            return False
+        self.items[item_id] -= 1
+        self.items_used[item_id] = self.items_used.get(item_id, 0) + 1
+        item = self.systems.inventory_system.item_database[item_id]
+        self.narrate(f"✨ {self.player['name']} uses {item['name']}!")
+        self.apply_effect(f"item:{item_id}", item["effect"], target)
+        return True
+        
+    def apply_effect(self, source_id, effect_spec, target):
+        """Apply item or spell effects in combat.
+        
+        Effects with no combat handler would change the live game, so they
+        are deferred until the result is applied.
+        """
+        names = [effect_spec] if isinstance(effect_spec, str) else effect_spec
+        for name in names:
+            handler = self.combat_system.combat_effects.get(name)
+            if handler:
+                self.narrate(handler(self, self.player, target))
+            elif self.systems.effect_system.has_effect(name):
+                self.deferred_effects.append(name)
+                self.narrate(f"The {name.replace('_', ' ')} will take hold after the battle.")
+            else:
+                self.narrate("Nothing happens.")
+                    
+    def take_turn(self, actor, choose_action=None):
+        """Run one combatant's turn."""
+        self.turns += 1
+        if not self.tick_status(actor):
+            return
+            
+        if actor["side"] == "enemy":
+            targets = self.living("player")
+            # Enemies focus the player two times in three
+            target = self.player if self.player["health"] > 0 and self.rng.random() < 0.67 else self.rng.choice(targets)
+            self.attack(actor, target)
+        elif actor["kind"] == "companion":
+            self.companion_action(actor)
+        else:
+            action = (choose_action or self.default_player_action)(self)
+            self.perform_player_action(action)
+            
+    def perform_player_action(self, action):
+        """Carry out a player action tuple: ("attack",), ("spell", id) or ("item", id)."""
+        target = self.living("enemy")[0]
+        if action[0] == "spell" and self.cast_spell(action[1], target):
+            return
+        if action[0] == "item" and self.use_item(action[1], target):
+            return
+        self.attack(self.player, target)
+        
+    def default_player_action(self, battle):
+        """Simple policy: heal when low, open with fire, otherwise attack."""
+        player = self.player
+        known_spells = self.systems.magic_system.known_spells
+        spell_database = self.systems.magic_system.spell_database
+        
+        def castable(spell_id):
+            return (spell_id in known_spells and player["mana"] >= spell_database[spell_id]["cost"]
+                    and player["status"].ready(spell_id))
+            
+        if player["health"] * 3 < player["max_health"]:
+            if self.items.get("healing_potion", 0) > 0:
+                return ("item", "healing_potion")
+            if castable("heal"):
+                return ("spell", "heal")
+        if castable("fireball"):
+            return ("spell", "fireball")
+        return ("attack",)
+        
+    def plan_companions(self):
+        """Decide the next action of every living companion in one batch."""
+        companions = [c for c in self.living("player") if c["kind"] == "companion"]
+        allies = self.living("player")
+        party = {
+            "companions": companions,
+            "wounded": any(c["health"] < c["max_health"] * WOUNDED for c in allies),
+            "weakened": "weakened" in self.living("enemy")[0]["status"]
+        }
+        for companion, action in zip(companions, decide_for_parties([party], self.rng)[0]):
+            companion["plan"] = action
+            
+    def companion_action(self, companion):
+        """Carry out the companion's planned action, planning for the whole party when needed."""
+        if companion.get("plan") is None:
+            self.plan_companions()
+        action = companion["plan"]
+        companion["plan"] = None
+        enemy = self.living("enemy")[0]
+        if action == HESITATE:
+            self.narrate(f"{companion['name']} hesitates, unsure of you.")
+            return
+        if action == HEAL:
+            wounded = min(self.living("player"), key=lambda c: c["health"] / c["max_health"])
+            if wounded["health"] < wounded["max_health"] * WOUNDED:
+                self.narrate(self.heal(wounded, 10 + companion["attack"]))
+                return
+        elif action == WEAKEN and "weakened" not in enemy["status"]:
+            self.narrate(f"🦉 {companion['name']} spots a weakness!")
+            self.add_status(enemy, "weakened", 2)
+            return
+        damage = self.rng.randint(3, companion["attack"])
+        if action == AMBUSH and self.rng.random() < 0.25:
+            damage *= 2
+        elif action == TRACK:
+            damage += 2
+        self.deal_damage(companion, enemy, damage)
+        
+    def step(self, choose_action=None):
+        """Advance the battle by one turn. Returns the winner once decided."""
+        actor = self.next_actor()
+        if actor is not None:
+            self.take_turn(actor, choose_action)
+        return self.winner()
+        
+    def run(self, choose_action=None):
+        """Run the battle to completion and return the result."""
+        winner = self.winner()
+        while winner is None:
+            winner = self.step(choose_action)
+        return {
+            "winner": winner,
+            "turns": self.turns,
+            "player_health": max(0, self.player["health"]),
+            "player_mana": self.player["mana"],
+            "items_used": self.items_used,
+            "deferred_effects": self.deferred_effects,
+            "cooldowns": {spell_id: self.player["status"].cooldown_left(spell_id)
+                          for spell_id in self.player["status"].cooldowns}
+        }
+        
+    def apply_result(self, result):
+        """Write the battle's outcome back to the live player and inventory."""
+        stats = self.systems.stats_system.player_stats
+        stats["health"] = result["player_health"]
+        stats["mana"] = result["player_mana"]
+        # Cooldowns carry out with their remaining rounds as hours
+        player_status = self.systems.player_status
+        player_status.cooldowns = {}
+        for spell_id, rounds in result["cooldowns"].items():
+            player_status.start_cooldown(spell_id, rounds)
+        for item_id, quantity in result["items_used"].items():
+            self.systems.inventory_system.remove_item(item_id, quantity)
+        for name in result["deferred_effects"]:
+            applied, messages = self.systems.effect_system.apply(f"effect:{name}", name)
+            for message in messages:
+                self.narrate(message)
+        self.combat_system.in_combat = False
+        if result["winner"] == "player":
+            enemy_names = [c["name"] for c in self.combatants if c["side"] == "enemy"]
+            self.systems.event_bus.publish(GameEvent.BATTLE_WON, enemies=enemy_names)
+
+
+def combat_fire_damage(battle, caster, target):
+    """Fireball: immediate damage plus burning."""
+    battle.deal_damage(caster, target, 15 + caster["intelligence"] // 2)
+    return battle.add_status(target, "burning", 2)
+
+
+def combat_raw_magic(battle, caster, target):
+    """Primal Force: raw damage scaling with strength."""
+    battle.deal_damage(caster, target, 10 + caster["strength"] // 2)
+    return None
+
+
+SPELL_DATABASE = content_table({
+    "heal": {"name": "Heal", "cost": 10, "cooldown": 2, "effect": "restore_health", "description": "Restore health"},
+    "fireball": {"name": "Fireball", "cost": 15, "cooldown": 1, "effect": "fire_damage", "description": "Deal fire damage that burns, stacking up to 3 times"},
+    "shield": {"name": "Magic Shield", "cost": 12, "cooldown": 4, "effect": "protection", "description": "Halve damage taken for 3 turns"},
+    "insight": {"name": "Insight", "cost": 8, "cooldown": 2, "effect": "reveal_secrets", "description": "Reveal hidden information"},
+    "teleport": {"name": "Teleport", "cost": 20, "cooldown": 6, "effect": "instant_travel", "description": "Travel instantly"},
+    "renew": {"name": "Renew", "cost": 14, "cooldown": 3, "effect": "regeneration", "description": "Regenerate 5 health every turn for 3 turns"}
+})
 
 
 class MagicSystem:
@@ -293,13 +1042,7 @@ class MagicSystem:
     
     def __init__(self):
         self.known_spells = []
-        self.spell_database = {
-            "heal": {"name": "Heal", "cost": 10, "effect": "restore_health", "description": "Restore health"},
-            "fireball": {"name": "Fireball", "cost": 15, "effect": "fire_damage", "description": "Deal fire damage"},
-            "shield": {"name": "Magic Shield", "cost": 12, "effect": "protection", "description": "Temporary protection"},
-            "insight": {"name": "Insight", "cost": 8, "effect": "reveal_secrets", "description": "Reveal hidden information"},
-            "teleport": {"name": "Teleport", "cost": 20, "effect": "instant_travel", "description": "Travel instantly"}
-        }
+        self.spell_database = ContentDatabase(SPELL_DATABASE)
         
     def initialize(self):
         """Initialize with basic spell."""
@@ -313,30 +1056,86 @@ class MagicSystem:
             return f"✨ Learned new spell: {spell['name']}!"
         return "You already know this spell."
         
-    def cast_spell(self, spell_id, player_stats):
-        """Cast a spell."""
+    def cast_spell(self, spell_id, player_stats, status=None):
+        """Cast a spell, starting its cooldown on the caster's status effects if given."""
         if spell_id not in self.known_spells:
             return False, "You don't know this spell!"
             
         spell = self.spell_database[spell_id]
+        if status is not None and not status.ready(spell_id):
+            return False, f"{spell['name']} is recharging ({status.cooldown_left(spell_id)} more turn(s))!"
         if player_stats["mana"] < spell["cost"]:
             return False, "Not enough mana!"
             
         player_stats["mana"] -= spell["cost"]
+        if status is not None:
+            status.start_cooldown(spell_id, spell.get("cooldown", 0))
         return True, f"✨ Cast {spell['name']}! {spell['description']}"
 
 
+COMPANION_DATABASE = content_table({
+    "spirit_wolf": {"name": "Spirit Wolf", "type": "guardian", "ability": "tracking", "loyalty": 50},
+    "fairy_guide": {"name": "Fairy Guide", "type": "magical", "ability": "healing", "loyalty": 30},
+    "ancient_owl": {"name": "Ancient Owl", "type": "wise", "ability": "knowledge", "loyalty": 40},
+    "shadow_cat": {"name": "Shadow Cat", "type": "stealth", "ability": "stealth", "loyalty": 35}
+})
+
+
 class CompanionSystem:
-    """System for recruiting and managing companions."""
+    """System for recruiting and managing companions.
     
-    def __init__(self):
+    Loyalty follows the player's choices and victories, published on the
+    event bus, and companions help out when the party arrives somewhere.
+    """
+    
+    def __init__(self, event_bus=None, systems=None):
+        self.event_bus = event_bus
+        self.systems = systems
         self.companions = []
-        self.companion_database = {
-            "spirit_wolf": {"name": "Spirit Wolf", "type": "guardian", "ability": "tracking", "loyalty": 50},
-            "fairy_guide": {"name": "Fairy Guide", "type": "magical", "ability": "healing", "loyalty": 30},
-            "ancient_owl": {"name": "Ancient Owl", "type": "wise", "ability": "knowledge", "loyalty": 40},
-            "shadow_cat": {"name": "Shadow Cat", "type": "stealth", "ability": "stealth", "loyalty": 35}
-        }
+        self.companion_database = ContentDatabase(COMPANION_DATABASE)
+        self.notifications = []
+        if event_bus:
+            event_bus.subscribe(GameEvent.CHOICE_MADE, self.handle_event)
+            event_bus.subscribe(GameEvent.BATTLE_WON, self.handle_event)
+            if systems:
+                event_bus.subscribe(GameEvent.LOCATION_VISITED, self.explore)
+                
+    def handle_event(self, event):
+        """Adjust loyalty from a choice's tags or a won battle."""
+        if event["type"] == GameEvent.BATTLE_WON:
+            self.adjust_loyalty(["battle"])
+        else:
+            self.adjust_loyalty(event.get("tags", ()))
+            
+    def adjust_loyalty(self, signals):
+        """Change every companion's loyalty according to its type's view of the signals."""
+        changes = loyalty_changes([companion["type"] for companion in self.companions], signals)
+        for companion, change in zip(self.companions, changes):
+            loyalty = max(0, min(MAX_LOYALTY, companion["loyalty"] + change))
+            if loyalty != companion["loyalty"]:
+                feeling = "approves" if loyalty > companion["loyalty"] else "disapproves"
+                self.notifications.append(f"🐾 {companion['name']} {feeling} "
+                                          f"({loyalty - companion['loyalty']:+d} loyalty)")
+                companion["loyalty"] = loyalty
+                
+    def explore(self, event):
+        """Let companions use their abilities on arrival somewhere."""
+        systems = self.systems
+        for companion, kind, value in exploration_finds(self.companions, systems.rng):
+            if kind == "loot":
+                for granted, message in systems.loot_system.grant(value, systems.rng):
+                    self.notifications.append(f"🐾 {companion['name']} finds something! {message}")
+            elif kind == "heal":
+                self.notifications.append(f"🐾 {companion['name']} tends to you. {restore_health(systems, value)}")
+            else:
+                leveled_up, message = systems.stats_system.gain_experience(value)
+                self.notifications.append(f"🐾 {companion['name']} shares what it knows. {message}")
+                
+    def pop_notifications(self):
+        """Get and clear the companion messages raised by events."""
+        notifications = self.notifications
+        self.notifications = []
+        return notifications
         
     def initialize(self):
         """Initialize companion system."""
@@ -347,6 +1146,8 @@ class CompanionSystem:
         if len(self.companions) < 2:  # Max 2 companions
             companion = self.companion_database[companion_id].copy()
             self.companions.append(companion)
+            if self.event_bus:
+                self.event_bus.publish(GameEvent.COMPANION_RECRUITED, companion_id=companion_id)
             return f"🐾 {companion['name']} joins your party!"
         return "You can only have 2 companions at a time."
         
@@ -358,7 +1159,7 @@ class CompanionSystem:
         text = "🐾 COMPANIONS:\n" + "=" * 30 + "\n"
         for companion in self.companions:
             text += f"• {companion['name']} ({companion['type']})\n"
-            text += f"  Ability: {companion['ability']} | Loyalty: {companion['loyalty']}\n\n"
+            text += f"  Ability: {companion['ability']} | Loyalty: {companion['loyalty']}/{MAX_LOYALTY}\n\n"
         return text
 
 
@@ -368,15 +1169,102 @@ class TimeSystem:
     def __init__(self):
         self.game_time = 0  # Game hours
         self.day_cycle = ["Dawn", "Morning", "Noon", "Afternoon", "Evening", "Night"]
+        self.event_queue = []  # Heap of (due_time, sequence, event)
+        self.event_handlers = {}
+        self.cancelled_events = set()
+        self.next_event_id = 1
+        self.ticks = TickScheduler()  # Status effects counted in game hours
+        self.time_listeners = []
+        self.events_version = 0  # Counts changes to the scheduled events
         
     def initialize(self):
         """Initialize time system."""
-        self.game_time = 6  # Start at dawn
+        self.set_time(6)  # Start at dawn
+        self.event_queue = []
+        self.cancelled_events = set()
+        self.events_version += 1
+        
+    def set_time(self, hours):
+        """Set the clock, such as when loading; statuses must be restored afterwards."""
+        self.game_time = hours
+        self.ticks.reset(hours)
+        
+    def register_handler(self, event_name, handler):
+        """Register a handler called as handler(event) when an event fires."""
+        self.event_handlers.setdefault(event_name, []).append(handler)
+        
+    def add_time_listener(self, listener):
+        """Register a listener called as listener(start, end) whenever the clock moves on."""
+        self.time_listeners.append(listener)
+        
+    def pass_time(self, until):
+        """Move the clock forward, running statuses and listeners over the hours passed."""
+        if until <= self.game_time:
+            return
+        start = self.game_time
+        self.game_time = until
+        self.ticks.advance_to(until)
+        for listener in self.time_listeners:
+            listener(start, until)
+        
+    def schedule_event(self, hours_from_now, event_name, data=None):
+        """Schedule an event to fire after the given number of game hours."""
+        event_id = self.next_event_id
+        self.next_event_id += 1
+        event = {
+            "id": event_id,
+            "name": event_name,
+            "due": self.game_time + max(0, hours_from_now),
+            "data": data if data is not None else {}
+        }
+        heapq.heappush(self.event_queue, (event["due"], event_id, event))
+        self.events_version += 1
+        return event_id
+        
+    def cancel_event(self, event_id):
+        """Cancel a scheduled event. Cancelled entries are dropped lazily."""
+        self.cancelled_events.add(event_id)
+        self.events_version += 1
         
     def advance_time(self, hours=1):
-        """Advance game time."""
-        self.game_time += hours
+        """Advance game time, firing every event that falls due in order.
+        
+        Only due events are popped from the heap, so a long jump costs
+        O(log n) per fired event rather than one step per hour.
+        """
+        target_time = self.game_time + hours
+        fired_events = []
         
+        while self.event_queue and self.event_queue[0][0] <= target_time:
+            due_time, event_id, event = heapq.heappop(self.event_queue)
+            self.events_version += 1
+            if event_id in self.cancelled_events:
+                self.cancelled_events.discard(event_id)
+                continue
+                
+            # Handlers see the clock as it was when the event fell due
+            self.pass_time(due_time)
+            for handler in self.event_handlers.get(event["name"], []):
+                handler(event)
+            fired_events.append(event)
+            
+        self.pass_time(target_time)
+        return fired_events
+        
+    def get_pending_events(self):
+        """Get scheduled events that have not fired yet, soonest first."""
+        return [event for _, event_id, event in sorted(self.event_queue)
+                if event_id not in self.cancelled_events]
+                
+    def load_pending_events(self, events):
+        """Restore scheduled events from saved data."""
+        self.events_version += 1
+        self.event_queue = []
+        self.cancelled_events = set()
+        for event in events:
+            heapq.heappush(self.event_queue, (event["due"], event["id"], event))
+            self.next_event_id = max(self.next_event_id, event["id"] + 1)
+            
     def get_time_of_day(self):
         """Get current time of day."""
         cycle_index = (self.game_time // 4) % len(self.day_cycle)
@@ -394,3 +1282,250 @@ class TimeSystem:
             "Night": "Stealth bonus, but reduced visibility"
         }
         return effects.get(time_of_day, "Normal effects")
+
+
+class EffectSystem:
+    """Registry that dispatches item and spell effects to handlers.
+    
+    Effects are registered by name. An item or spell's "effect" entry may be
+    a single name or a list of names, which are applied in order. The handler
+    list for each item or spell is resolved once and cached, so applying an
+    effect is a dict lookup. Effects with a duration stay active until an
+    "effect_expired" event scheduled on the TimeSystem fires; applying one
+    again while it is active only restarts its duration. An effect can also
+    be held active with no expiry, such as by worn gear, until released.
+    """
+    
+    def __init__(self, systems):
+        self.systems = systems
+        self.handlers = {}
+        self.resolved_effects = {}
+        self.active_effects = {}  # Effect name -> (expiry hour, event id)
+        systems.time_system.register_handler("effect_expired", self.expire_effect)
+        self.register_builtin_effects()
+        
+    def register_effect(self, effect_name, handler, duration=0, on_expire=None):
+        """Register a handler called as handler(systems, target) -> message."""
+        self.handlers[effect_name] = {
+            "apply": handler,
+            "duration": duration,
+            "on_expire": on_expire
+        }
+        # Handlers may have changed, so cached resolutions are stale
+        self.resolved_effects.clear()
+        
+    def has_effect(self, effect_name):
+        """Check whether an effect has a registered handler."""
+        return effect_name in self.handlers
+        
+    def resolve(self, source_id, effect_spec):
+        """Resolve an effect spec to its handlers, cached per source id."""
+        cached = self.resolved_effects.get(source_id)
+        if cached is not None:
+            return cached
+            
+        names = [effect_spec] if isinstance(effect_spec, str) else list(effect_spec)
+        if not all(name in self.handlers for name in names):
+            return None
+        resolved = [(name, self.handlers[name]) for name in names]
+        self.resolved_effects[source_id] = resolved
+        return resolved
+        
+    def apply(self, source_id, effect_spec, target=None):
+        """Apply every effect for a source and return the display messages."""
+        resolved = self.resolve(source_id, effect_spec)
+        if resolved is None:
+            return False, ["Nothing happens."]
+            
+        messages = []
+        for effect_name, handler in resolved:
+            if handler["duration"] and effect_name in self.active_effects:
+                # Reapplying an active effect only extends it; its bonus is granted once
+                self.start_duration(effect_name, handler["duration"])
+                messages.append(f"The {effect_name.replace('_', ' ')} effect is renewed.")
+                continue
+            message = handler["apply"](self.systems, target)
+            if message:
+                messages.append(message)
+            if handler["duration"]:
+                self.start_duration(effect_name, handler["duration"])
+        return True, messages
+        
+    def start_duration(self, effect_name, duration):
+        """Mark an effect active, refreshing the expiry if already active."""
+        time_system = self.systems.time_system
+        if self.is_held(effect_name):
+            return
+        if effect_name in self.active_effects:
+            time_system.cancel_event(self.active_effects[effect_name][1])
+        event_id = time_system.schedule_event(duration, "effect_expired", {
+            "effect": effect_name,
+            "message": f"The {effect_name.replace('_', ' ')} effect wears off."
+        })
+        self.active_effects[effect_name] = (time_system.game_time + duration, event_id)
+        
+    def is_active(self, effect_name):
+        """Check whether a timed effect is currently active."""
+        return effect_name in self.active_effects
+        
+    def is_held(self, effect_name):
+        """Check whether an effect is held active with no expiry."""
+        return self.active_effects.get(effect_name) == (None, None)
+        
+    def hold(self, effect_name):
+        """Keep an effect active with no expiry until released; returns its message, if newly applied."""
+        current = self.active_effects.get(effect_name)
+        message = None
+        if current is None:
+            message = self.handlers[effect_name]["apply"](self.systems, None)
+        elif current[1] is not None:
+            # Already granted by a timed use, which now lasts as long as the hold
+            self.systems.time_system.cancel_event(current[1])
+        self.active_effects[effect_name] = (None, None)
+        return message
+        
+    def release(self, effect_name):
+        """End an effect held with no expiry."""
+        if self.is_held(effect_name):
+            self.end_effect(effect_name, cancel=False)
+        
+    def expire_effect(self, event):
+        """End a timed effect when its scheduled expiry fires."""
+        effect_name = event["data"]["effect"]
+        if self.active_effects.get(effect_name, (None, None))[1] != event["id"]:
+            return
+        self.end_effect(effect_name, cancel=False)
+        
+    def end_effect(self, effect_name, cancel=True):
+        """End a timed effect, cancelling its expiry if it ends early (such as when used up)."""
+        if effect_name not in self.active_effects:
+            return
+        _, event_id = self.active_effects.pop(effect_name)
+        if cancel:
+            self.systems.time_system.cancel_event(event_id)
+        on_expire = self.handlers.get(effect_name, {}).get("on_expire")
+        if on_expire:
+            on_expire(self.systems)
+            
+    def register_builtin_effects(self):
+        """Register handlers for the effects in the base item and spell databases."""
+        self.register_effect("heal_50", lambda systems, target: restore_health(systems, 50))
+        self.register_effect("restore_health", lambda systems, target: restore_health(systems, 40))
+        self.register_effect("mana_boost", boost_max_mana)
+        self.register_effect("experience_boost", grant_experience_boost)
+        self.register_effect("fire_damage", deal_fire_damage)
+        self.register_effect("protection", raise_shield)
+        self.register_effect("regeneration", start_regeneration)
+        self.register_effect("reveal_secrets", reveal_secrets)
+        self.register_effect("instant_travel", lambda systems, target: "🌀 Space folds around you - your next journey is instant!",
+                             duration=1)
+        self.register_effect("stealth_boost", lambda systems, target: "🌫️ You blend into your surroundings.",
+                             duration=4)
+        self.register_effect("fire_resistance", lambda systems, target: "🐉 Dragon scale wards you against fire.",
+                             duration=6)
+        self.register_effect("magic_enhancement", enhance_magic, duration=3, on_expire=end_magic_enhancement)
+        # Effects of spells taught by scenes, registered up front so learned
+        # spells still work after loading a save
+        self.register_effect("temporal_freeze", temporal_freeze, duration=1)
+        self.register_effect("raw_magic", raw_magic)
+        self.register_effect("creative_power", lambda systems, target:
+                             "🎨 Living colours swirl around you, filling you with inspiration.", duration=2)
+        self.register_effect("time_control", time_control)
+        self.register_effect("group_enhancement", group_enhancement)
+
+
+def restore_health(systems, amount):
+    """Restore health up to the maximum and describe the result."""
+    stats = systems.stats_system.player_stats
+    old_health = stats['health']
+    stats['health'] = min(stats['max_health'], stats['health'] + amount)
+    return f"❤️ Restored {stats['health'] - old_health} health!"
+
+
+def raise_shield(systems, target):
+    """Shield the player for the next 3 hours, carrying into any battle."""
+    systems.player_status.apply("shielded", 3)
+    return "🛡️ A shimmering shield surrounds you!"
+
+
+def start_regeneration(systems, target):
+    """Regenerate the player's health every hour for 3 hours."""
+    systems.player_status.apply("regenerating", 3)
+    return "🌿 Warmth spreads through you as your wounds begin to close."
+
+
+def boost_max_mana(systems, target):
+    """Permanently raise maximum mana and refill it."""
+    stats = systems.stats_system.player_stats
+    stats['max_mana'] += 10
+    stats['mana'] = stats['max_mana']
+    return "💙 Maximum mana increased by 10!"
+
+
+def grant_experience_boost(systems, target):
+    """Grant a flat experience bonus."""
+    leveled_up, exp_msg = systems.stats_system.gain_experience(100)
+    return f"⭐ {exp_msg}"
+
+
+def deal_fire_damage(systems, target):
+    """Burn a combat target, scaling with intelligence."""
+    if target is None:
+        return "🔥 Flames dance harmlessly from your fingertips."
+    damage = 15 + systems.stats_system.player_stats["intelligence"] // 2
+    target["health"] -= damage
+    return f"🔥 The fireball deals {damage} damage to {target['name']}!"
+
+
+def reveal_secrets(systems, target):
+    """Reveal upcoming scheduled events."""
+    upcoming = systems.time_system.get_pending_events()[:3]
+    hints = [event["data"]["message"] for event in upcoming if event["data"].get("message")]
+    if not hints:
+        return "🔮 Your insight reveals no hidden dangers nearby."
+    return "🔮 Your insight reveals what is to come:\n" + "\n".join(f"  • {hint}" for hint in hints)
+
+
+def enhance_magic(systems, target):
+    """Temporarily boost intelligence."""
+    systems.stats_system.player_stats["intelligence"] += 5
+    return "✨ Fairy dust sharpens your magic! +5 Intelligence for a while."
+
+
+def end_magic_enhancement(systems):
+    """Remove the temporary intelligence boost."""
+    systems.stats_system.player_stats["intelligence"] -= 5
+
+
+def temporal_freeze(systems, target):
+    """Time Stop: freeze a target, or the world around the player outside battle."""
+    if target is not None:
+        target["frozen"] = True
+        return f"⏰ Time freezes around {target['name']}!"
+    return "⏰ The world falls silent as time stands still around you."
+
+
+def raw_magic(systems, target):
+    """Primal Force: raw damage scaling with strength."""
+    if target is not None:
+        damage = 10 + systems.stats_system.player_stats["strength"] // 2
+        target["health"] -= damage
+        return f"⚡ Raw magic slams into {target['name']} for {damage} damage!"
+    return "⚡ Raw magical energy crackles through the air around you."
+
+
+def time_control(systems, target):
+    """Temporal Mastery: fully restore health."""
+    stats = systems.stats_system.player_stats
+    stats["health"] = stats["max_health"]
+    return "⏰ You rewind your wounds - your health is fully restored!"
+
+
+def group_enhancement(systems, target):
+    """Harmony Spell: raise every companion's loyalty."""
+    companions = systems.companion_system.companions
+    if not companions:
+        return "🎶 A gentle harmony fills the air, but you travel alone."
+    for companion in companions:
+        companion["loyalty"] = min(MAX_LOYALTY, companion["loyalty"] + 5)
+    return "🎶 Harmony binds your party together! Companion loyalty +5."
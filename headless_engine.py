@@ -0,0 +1,98 @@
+"""
+Headless Engine for Mystic Quest
+================================
+Runs scenes without a terminal, for bots, simulations and balance testing.
+Output is discarded, dramatic pauses are skipped and every prompt is
+answered by a policy function instead of the keyboard.
+"""
+
+import contextlib
+import re
+
+from ascii_art import AsciiArt
+from main_enhanced import EnhancedGameEngine
+
+
+# Prompts offer their choices as a range such as "(1-4)"
+PROMPT_RANGE = re.compile(r"\((\d+)-(\d+)\)")
+
+
+class DecisionLimitReached(Exception):
+    """Raised when a headless run makes more decisions than allowed."""
+
+
+class NullOutput:
+    """Write-only stream that throws everything away."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def prompt_options(prompt):
+    """Get the answers a prompt accepts; prompts without a range just want Enter."""
+    match = PROMPT_RANGE.search(prompt)
+    if not match:
+        return [""]
+    low, high = int(match.group(1)), int(match.group(2))
+    return [str(number) for number in range(low, high + 1)] or [""]
+
+
+def journey_value(engine, result=None):
+    """Score a game state by experience, health, achievements and story flags."""
+    stats = engine.systems.stats_system.player_stats
+    achievements = engine.systems.achievement_system.unlocked_achievements
+    return (stats["experience"] + stats["level"] * 100 + stats["health"] + engine.player_health
+            + 100 * len(achievements) + 25 * bin(engine.game_state.bits).count("1"))
+
+
+def first_option(prompt, options):
+    """Policy that always takes the first choice offered."""
+    return options[0]
+
+
+class HeadlessEngine(EnhancedGameEngine):
+    """Enhanced engine whose prompts are answered by a policy.
+
+    The policy is called as policy(prompt, options) at every prompt that
+    offers more than one choice, and every decision is recorded in
+    ``decisions`` as (prompt, options, choice). A ``seed`` fixes the
+    session's own randomness, such as riddle and dungeon picks.
+    """
+
+    def __init__(self, policy=None, player_name="Adventurer", max_decisions=500, seed=None):
+        super().__init__(seed)
+        self.ascii_art = AsciiArt(animate=False)
+        self.policy = policy or first_option
+        self.max_decisions = max_decisions
+        self.decisions = []
+        self.player_name = player_name
+        self.systems.initialize_player(player_name)
+
+    def clear_screen(self):
+        """Nothing to clear without a terminal."""
+
+    def print_with_delay(self, text, delay=0.03):
+        """Print text at once, without the typewriter effect."""
+        print(text)
+
+    def pause(self, seconds):
+        """Skip dramatic pauses."""
+
+    def read_input(self, prompt=""):
+        """Answer a prompt with the policy."""
+        options = prompt_options(prompt)
+        if len(options) == 1:
+            return options[0]
+        if len(self.decisions) >= self.max_decisions:
+            raise DecisionLimitReached(f"More than {self.max_decisions} decisions")
+        choice = self.policy(prompt, options)
+        self.decisions.append((prompt.strip(), options, choice))
+        return choice
+
+    def play_scene(self, scene_class, method="play", *args):
+        """Run a scene method with its output discarded and return its result."""
+        with contextlib.redirect_stdout(NullOutput()):
+            return getattr(scene_class(self), method)(*args)
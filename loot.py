@@ -0,0 +1,210 @@
+"""
+Loot Tables for Mystic Quest
+============================
+Item rewards looked up by source (a scene, an event, an enemy or a rarity
+tier) instead of being written into each scene.
+
+Every drop in a table has a base weight and a luck weight, added once per
+point of the player's luck, so lucky players find rarer items. Luck is
+grouped into bands, and each (table, luck band) is compiled once into an
+alias table, after which a roll costs one random number and two lookups
+however long the table is. Compiled tables are shared by every session.
+"""
+
+import random
+
+
+# Source -> (rolls, ((item id, weight, luck weight), ...))
+LOOT_TABLES = {
+    "tier:common": (1, (
+        ("healing_potion", 10, 0),
+        ("wisdom_scroll", 4, 0.05),
+        ("fairy_dust", 3, 0.05)
+    )),
+    "tier:rare": (1, (
+        ("magic_crystal", 6, 0.05),
+        ("dragon_scale", 4, 0.1),
+        ("elven_cloak", 3, 0.1),
+        ("fairy_dust", 3, 0),
+        ("shadow_gem", 1, 0.15)
+    )),
+    "event:trade": (1, (
+        ("magic_crystal", 8, 0),
+        ("healing_potion", 6, -0.2),
+        ("elven_cloak", 2, 0.1),
+        ("dragon_scale", 1, 0.1),
+        ("shadow_gem", 0.5, 0.08)
+    )),
+    "scene:time_nexus.dragon_gift": (1, (("dragon_scale", 1, 0),)),
+    "scene:time_nexus.cosmic_artifact": (1, (("shadow_gem", 1, 0),)),
+    "scene:time_nexus.restored_supplies": (3, (
+        ("healing_potion", 6, 0),
+        ("magic_crystal", 3, 0.05),
+        ("fairy_dust", 3, 0.05),
+        ("wisdom_scroll", 1, 0.05)
+    )),
+    "scene:time_nexus.ancient_artifact": (1, (
+        ("ancient_key", 3, 0),
+        ("dragon_scale", 2, 0.05),
+        ("shadow_gem", 1, 0.05)
+    )),
+    "scene:mystical_library.study_reward": (1, (("wisdom_scroll", 1, 0),)),
+    "scene:mystical_library.secret_chamber": (2, (
+        ("ancient_key", 4, 0),
+        ("shadow_gem", 3, 0.1),
+        ("magic_crystal", 2, 0.05)
+    )),
+    "scene:mystical_library.artifact": (2, (
+        ("magic_crystal", 4, 0.05),
+        ("fairy_dust", 4, 0),
+        ("dragon_scale", 1, 0.05)
+    )),
+    "scene:adventurer_crossroads.gift.Mage": (2, (("magic_crystal", 1, 0), ("wisdom_scroll", 1, 0))),
+    "scene:adventurer_crossroads.gift.Warrior": (2, (("healing_potion", 1, 0), ("dragon_scale", 1, 0.02))),
+    "scene:adventurer_crossroads.gift.Rogue": (2, (("elven_cloak", 1, 0.02), ("ancient_key", 1, 0))),
+    "scene:adventurer_crossroads.gift.Scholar": (2, (("wisdom_scroll", 1, 0), ("fairy_dust", 1, 0))),
+    "scene:adventurer_crossroads.gift.Treasure Hunter": (2, (("healing_potion", 1, 0), ("magic_crystal", 1, 0.02))),
+    "scene:adventurer_crossroads.legend": (3, (
+        ("shadow_gem", 3, 0.05),
+        ("dragon_scale", 3, 0.05),
+        ("fairy_dust", 3, 0),
+        ("elven_cloak", 1, 0.05)
+    )),
+    "scene:adventurer_crossroads.treasure": (2, (
+        ("magic_crystal", 4, 0.05),
+        ("healing_potion", 4, 0),
+        ("elven_cloak", 1, 0.05),
+        ("shadow_gem", 1, 0.05)
+    )),
+    "dungeon:room": (1, (
+        ("healing_potion", 10, 0),
+        ("magic_crystal", 4, 0),
+        ("wisdom_scroll", 3, 0),
+        ("fairy_dust", 3, 0),
+        ("dragon_scale", 2, 0),
+        ("ancient_key", 2, 0),
+        ("elven_cloak", 1, 0),
+        ("shadow_gem", 1, 0)
+    )),
+    "enemy:Stone Golem": (1, (("magic_crystal", 3, 0.05), ("healing_potion", 2, 0))),
+    "enemy:Shadow Wisp": (1, (("fairy_dust", 3, 0), ("shadow_gem", 1, 0.05))),
+    "enemy:Depth Warden": (2, (
+        ("healing_potion", 4, 0),
+        ("dragon_scale", 2, 0.05),
+        ("shadow_gem", 1, 0.05)
+    ))
+}
+
+LUCK_BAND = 5  # Points of luck per band
+MAX_LUCK_BAND = 20
+
+
+def luck_band(luck):
+    """Get the band a luck value falls in."""
+    return max(0, min(MAX_LUCK_BAND, int(luck) // LUCK_BAND))
+
+
+class AliasTable:
+    """Walker's alias table for drawing from fixed weights in constant time.
+
+    Each slot holds an item, the chance of keeping it, and the alias item
+    taken otherwise.
+    """
+
+    def __init__(self, items, weights):
+        total = sum(weights)
+        if not items or total <= 0:
+            raise ValueError("A loot table needs at least one item with weight")
+        count = len(items)
+        scaled = [weight * count / total for weight in weights]
+        self.items = list(items)
+        self.keep = [1.0] * count
+        self.aliases = list(range(count))
+        small = [index for index, weight in enumerate(scaled) if weight < 1]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            under, over = small.pop(), large[-1]
+            self.keep[under] = scaled[under]
+            self.aliases[under] = over
+            scaled[over] -= 1 - scaled[under]
+            if scaled[over] < 1:
+                small.append(large.pop())
+        # Whatever is left over is 1 up to rounding error
+        self.aliases = [self.items[index] for index in self.aliases]
+
+    def roll(self, rng=random):
+        """Draw one item."""
+        position = rng.random() * len(self.items)
+        slot = int(position)
+        return self.items[slot] if position - slot < self.keep[slot] else self.aliases[slot]
+
+    def roll_many(self, count, rng=random):
+        """Draw many items at once."""
+        items, keep, aliases = self.items, self.keep, self.aliases
+        size = len(items)
+        draw = rng.random
+        drops = []
+        append = drops.append
+        for _ in range(count):
+            position = draw() * size
+            slot = int(position)
+            append(items[slot] if position - slot < keep[slot] else aliases[slot])
+        return drops
+
+
+COMPILED_TABLES = {}  # (source, luck band) -> AliasTable, shared by every session
+
+
+def compile_table(source, band):
+    """Get the alias table for a source at a luck band, compiling it on first use."""
+    key = (source, band)
+    compiled = COMPILED_TABLES.get(key)
+    if compiled is None:
+        if source not in LOOT_TABLES:
+            raise ValueError(f"No loot table for {source}")
+        luck = band * LUCK_BAND
+        drops = LOOT_TABLES[source][1]
+        compiled = AliasTable([item_id for item_id, _, _ in drops],
+                              [max(0, weight + luck_weight * luck) for _, weight, luck_weight in drops])
+        COMPILED_TABLES[key] = compiled
+    return compiled
+
+
+class LootSystem:
+    """Rolls loot for the player, scaled by their luck."""
+
+    def __init__(self, systems):
+        self.systems = systems
+
+    def has_table(self, source):
+        """Check whether a source has a loot table."""
+        return source in LOOT_TABLES
+
+    def luck(self):
+        """Get the player's luck."""
+        return self.systems.stats_system.player_stats.get("luck", 0)
+
+    def roll(self, source, rng=None):
+        """Roll a source's loot at the player's luck; returns the item ids dropped."""
+        compiled = compile_table(source, luck_band(self.luck()))
+        return compiled.roll_many(LOOT_TABLES[source][0], rng or self.systems.rng)
+
+    def roll_many(self, source, count, luck=None, rng=None):
+        """Roll a source's table many times, for simulations; luck defaults to the player's."""
+        band = luck_band(self.luck() if luck is None else luck)
+        return compile_table(source, band).roll_many(count, rng or self.systems.rng)
+
+    def grant(self, source, rng=None):
+        """Roll a source's loot into the inventory.
+
+        Returns a (success, message) pair per item rolled; items that do not
+        fit are left behind and their message says so.
+        """
+        inventory_system = self.systems.inventory_system
+        results = []
+        for item_id in self.roll(source, rng):
+            success, message = inventory_system.add_item(item_id)
+            if not success:
+                message = f"{inventory_system.item_database[item_id]['name']} left behind - {message}"
+            results.append((success, message))
+        return results
@@ -9,14 +9,18 @@ Version: 1.0
 """
 
 import os
+import random
 import sys
 import time
 from ascii_art import AsciiArt
+from game_flags import GameState
 from scenes.intro import IntroScene
 from scenes.forest import ForestScene
 from scenes.cave import CaveScene
 from scenes.boss import BossScene
 from scenes.ending import EndingScene
+from metrics import RENDER_BYTES
+from tracing import TRACER
 
 
 class GameEngine:
@@ -26,8 +30,9 @@ class GameEngine:
         self.player_name = ""
         self.player_health = 100
         self.player_inventory = []
-        self.game_state = {}
+        self.game_state = GameState()
         self.ascii_art = AsciiArt()
+        self.rng = random.Random()  # Scenes roll their dice with this
         
     def clear_screen(self):
         """Clear the terminal screen for better presentation."""
@@ -35,10 +40,21 @@ class GameEngine:
         
     def print_with_delay(self, text, delay=0.03):
         """Print text with a typewriter effect."""
-        for char in text:
-            print(char, end='', flush=True)
-            time.sleep(delay)
-        print()
+        RENDER_BYTES.inc(len(text.encode()), "text")
+        with TRACER.span("render.print_with_delay", chars=len(text)):
+            for char in text:
+                print(char, end='', flush=True)
+                time.sleep(delay)
+            print()
+        
+    def read_input(self, prompt=""):
+        """Read the player's answer to a prompt."""
+        with TRACER.span("input.wait", prompt=prompt.strip()):
+            return input(prompt)
+        
+    def pause(self, seconds):
+        """Pause for dramatic effect."""
+        time.sleep(seconds)
         
     def print_border(self, char='=', length=60):
         """Print a decorative border."""
@@ -67,7 +83,7 @@ class GameEngine:
         print()
         
         while True:
-            choice = input("Enter your choice (1-4): ").strip()
+            choice = self.read_input("Enter your choice (1-4): ").strip()
             if choice == '1':
                 self.start_game()
                 break
@@ -94,7 +110,7 @@ class GameEngine:
         print("• Multiple endings await based on your choices")
         print("• Type your responses carefully and press Enter")
         print()
-        input("Press Enter to return to main menu...")
+        self.read_input("Press Enter to return to main menu...")
         self.display_menu()
         
     def show_credits(self):
@@ -111,7 +127,7 @@ class GameEngine:
         print()
         print("Thank you for playing Mystic Quest!")
         print()
-        input("Press Enter to return to main menu...")
+        self.read_input("Press Enter to return to main menu...")
         self.display_menu()
         
     def exit_game(self):
@@ -128,7 +144,7 @@ class GameEngine:
         
         # Get player name
         print("Before we begin your adventure...")
-        self.player_name = input("What is your name, brave adventurer? ").strip()
+        self.player_name = self.read_input("What is your name, brave adventurer? ").strip()
         if not self.player_name:
             self.player_name = "Adventurer"
             
@@ -162,7 +178,7 @@ class GameEngine:
             ending_scene.play("rest")
             
         # Return to main menu
-        input("\nPress Enter to return to main menu...")
+        self.read_input("\nPress Enter to return to main menu...")
         self.display_menu()
 
 
@@ -12,48 +12,91 @@ Version: 2.0 - Enhanced Edition
 import os
 import sys
 import time
-import random
+import weakref
 from ascii_art import AsciiArt
-from game_systems import GameSystems
+from game_flags import GameState
+from game_history import StateHistory
+from equipment import EQUIPMENT_SLOTS
+from game_systems import GameSystems, GameEvent
 from save_system import SaveSystem
-from scenes.intro import IntroScene
-from scenes.forest import ForestScene
-from scenes.cave import CaveScene
-from scenes.boss import BossScene
 from scenes.ending import EndingScene
+from memory_profile import MEMORY_PROFILER
+from metrics import RENDER_BYTES, session_started
+from tracing import TRACER
+from world_map import JOURNEYS_END, SCENE_ROUTER
 
 
 class EnhancedGameEngine:
     """Enhanced game engine with advanced RPG systems."""
     
-    def __init__(self):
+    def __init__(self, seed=None):
         # Basic game state
         self.player_name = ""
         self.player_health = 100
         self.player_inventory = []
-        self.game_state = {}
+        self.game_state = GameState()
         
         # Enhanced systems
         self.ascii_art = AsciiArt()
-        self.systems = GameSystems(self)
+        self.systems = GameSystems(self, seed)
+        self.rng = self.systems.rng  # Scenes roll their dice with this
         self.save_system = SaveSystem(self)
         
-        # Game tracking
+        # Game tracking, fed by the event bus
         self.locations_visited = set()
         self.choices_made = []
         self.battles_won = 0
         self.spells_cast = 0
-        
+        event_bus = self.systems.event_bus
+        event_bus.subscribe(GameEvent.LOCATION_VISITED, self.track_event)
+        event_bus.subscribe(GameEvent.CHOICE_MADE, self.track_event)
+        event_bus.subscribe(GameEvent.BATTLE_WON, self.track_event)
+        event_bus.subscribe(GameEvent.SPELL_CAST, self.track_event)
+        
+        # Count the session as active until the engine is collected
+        weakref.finalize(self, session_started())
+        
+        # Snapshots taken at each choice, for rewinding time
+        self.history = StateHistory(self)
+        event_bus.subscribe(GameEvent.CHOICE_MADE, self.checkpoint_choice)
+        MEMORY_PROFILER.mark("session.start", self)
+        
+    def checkpoint_choice(self, event):
+        """Snapshot the state after a story choice."""
+        self.history.checkpoint(event["choice"].replace("_", " ").title())
+        
+    def track_event(self, event):
+        """Update the engine's journey counters from game events."""
+        if event["type"] == GameEvent.LOCATION_VISITED:
+            self.locations_visited.add(event["location"])
+        elif event["type"] == GameEvent.CHOICE_MADE:
+            self.choices_made.append(event["choice"])
+        elif event["type"] == GameEvent.BATTLE_WON:
+            self.battles_won += 1
+        elif event["type"] == GameEvent.SPELL_CAST:
+            self.spells_cast += 1
+            
     def clear_screen(self):
         """Clear the terminal screen for better presentation."""
         os.system('cls' if os.name == 'nt' else 'clear')
         
     def print_with_delay(self, text, delay=0.03):
         """Print text with a typewriter effect."""
-        for char in text:
-            print(char, end='', flush=True)
-            time.sleep(delay)
-        print()
+        RENDER_BYTES.inc(len(text.encode()), "text")
+        with TRACER.span("render.print_with_delay", chars=len(text)):
+            for char in text:
+                print(char, end='', flush=True)
+                time.sleep(delay)
+            print()
+        
+    def read_input(self, prompt=""):
+        """Read the player's answer to a prompt."""
+        with TRACER.span("input.wait", prompt=prompt.strip()):
+            return input(prompt)
+        
+    def pause(self, seconds):
+        """Pause for dramatic effect."""
+        time.sleep(seconds)
         
     def print_border(self, char='=', length=60):
         """Print a decorative border."""
@@ -90,7 +133,7 @@ class EnhancedGameEngine:
         print()
         
         while True:
-            choice = input("Enter your choice (1-6): ").strip()
+            choice = self.read_input("Enter your choice (1-6): ").strip()
             if choice == '1':
                 self.start_new_game()
                 break
@@ -138,14 +181,14 @@ class EnhancedGameEngine:
         print("• Save your game before important decisions")
         print("• Explore thoroughly to find hidden secrets")
         print()
-        input("Press Enter to return to main menu...")
+        self.read_input("Press Enter to return to main menu...")
         self.display_menu()
         
     def show_achievements(self):
         """Display achievement system."""
         self.clear_screen()
         print(self.systems.achievement_system.display_achievements())
-        input("Press Enter to return to main menu...")
+        self.read_input("Press Enter to return to main menu...")
         self.display_menu()
         
     def show_credits(self):
@@ -174,7 +217,7 @@ class EnhancedGameEngine:
         print()
         print("Thank you for playing Mystic Quest Enhanced Edition!")
         print()
-        input("Press Enter to return to main menu...")
+        self.read_input("Press Enter to return to main menu...")
         self.display_menu()
         
     def load_game_menu(self):
@@ -184,7 +227,7 @@ class EnhancedGameEngine:
         
         if not saves:
             print("No saved games found!")
-            input("Press Enter to return to main menu...")
+            self.read_input("Press Enter to return to main menu...")
             self.display_menu()
             return
             
@@ -202,17 +245,17 @@ class EnhancedGameEngine:
         
         while True:
             try:
-                choice = int(input("Select save file: "))
+                choice = int(self.read_input("Select save file: "))
                 if 1 <= choice <= len(saves):
                     save_name = saves[choice - 1]["name"]
                     success, message = self.save_system.load_game(save_name)
                     print(message)
                     if success:
-                        input("Press Enter to continue your adventure...")
+                        self.read_input("Press Enter to continue your adventure...")
                         self.game_loop()
                         return
                     else:
-                        input("Press Enter to continue...")
+                        self.read_input("Press Enter to continue...")
                         break
                 elif choice == len(saves) + 1:
                     break
@@ -229,7 +272,7 @@ class EnhancedGameEngine:
         
         # Get player name
         print("🌟 Welcome to your enhanced adventure!")
-        self.player_name = input("What is your name, brave adventurer? ").strip()
+        self.player_name = self.read_input("What is your name, brave adventurer? ").strip()
         if not self.player_name:
             self.player_name = "Adventurer"
             
@@ -257,9 +300,13 @@ class EnhancedGameEngine:
                 
             # Main game menu during adventure
             choice = self.display_adventure_menu()
+            time_system = self.systems.time_system
+            self.history.checkpoint(f"{time_system.get_time_of_day()}, hour {time_system.game_time}")
+            MEMORY_PROFILER.mark("session.turn", self)
             
             if choice == 1:  # Continue Adventure
-                self.continue_story()
+                if self.continue_story():
+                    break
             elif choice == 2:  # View Character
                 self.display_character_info()
             elif choice == 3:  # Manage Inventory
@@ -284,8 +331,17 @@ class EnhancedGameEngine:
         self.print_border('=', 50)
         print(f"🌤️ Weather: {weather_info}")
         print(f"🕐 Time: {time_of_day} - {time_effects}")
+        rates = self.systems.regeneration_system.current_rates()
+        print(f"🌿 Regenerating {rates['health']:g} health and {rates['mana']:g} mana per hour")
         print()
         
+        # Achievements unlocked since the last screen
+        for achievement_msg in self.systems.achievement_system.pop_notifications():
+            print(achievement_msg)
+            print()
+        for companion_msg in self.systems.companion_system.pop_notifications():
+            print(companion_msg)
+            
         # Quick stats
         stats = self.systems.stats_system.player_stats
         print(f"👤 {stats['name']} | Level {stats['level']}")
@@ -313,7 +369,7 @@ class EnhancedGameEngine:
         
         while True:
             try:
-                choice = int(input("Choose your action (1-6): "))
+                choice = int(self.read_input("Choose your action (1-6): "))
                 if 1 <= choice <= 6:
                     return choice
                 else:
@@ -322,31 +378,67 @@ class EnhancedGameEngine:
                 print("Please enter a valid number.")
                 
     def continue_story(self):
-        """Continue the main story."""
-        # This would integrate with your existing scenes
-        # For now, let's create a simple story continuation
+        """Choose a destination on the world map and journey there.
+        
+        Returns True once the journey has reached its ending.
+        """
         self.clear_screen()
+        travel_system = self.systems.travel_system
         
-        print("🌟 Continuing your adventure...")
+        print(f"🗺️ You stand at {travel_system.location_name()}. Where will you go?")
+        print()
+        destinations = travel_system.destinations()
+        instant = travel_system.is_instant()
+        for i, (location, hours) in enumerate(destinations, 1):
+            duration = "instant" if instant else f"{hours} hours"
+            print(f"{i}. {travel_system.world_map.name(location)} ({duration})")
+        print(f"{len(destinations) + 1}. Stay here")
         print()
         
-        # Advance time
-        self.systems.time_system.advance_time(1)
-        
-        # Possibly change weather
-        if random.random() < 0.3:
-            self.systems.weather_system.change_weather()
-            weather_info = self.systems.weather_system.get_weather_info()
-            print(f"🌤️ The weather changes: {weather_info}")
-            print()
-            
-        # Gain some experience
-        leveled_up, exp_msg = self.systems.stats_system.gain_experience(random.randint(10, 30))
-        print(exp_msg)
-        if leveled_up:
-            print(exp_msg)
+        while True:
+            try:
+                choice = int(self.read_input(f"Choose your destination (1-{len(destinations) + 1}): "))
+                if 1 <= choice <= len(destinations):
+                    return self.journey_to(destinations[choice - 1][0])
+                elif choice == len(destinations) + 1:
+                    return False
+                else:
+                    print("Invalid choice!")
+            except ValueError:
+                print("Please enter a valid number!")
+                
+    def journey_to(self, destination):
+        """Travel to a destination and follow the story on from its scene.
+        
+        Each scene's result is routed to the next stop until one leaves the
+        player where they are, or the journey reaches its ending.
+        """
+        travel_system = self.systems.travel_system
+        stop = destination
+        while stop:
+            hours, path, fired_events = travel_system.travel(stop)
+            if hours:
+                print(f"\n🚶 You travel {' → '.join(travel_system.world_map.name(place) for place in path)} "
+                      f"({hours} hours).")
+            else:
+                print(f"\n🌀 You arrive at {travel_system.location_name()} in an instant.")
+            for event in fired_events:
+                if event["data"].get("message"):
+                    print(f"⏰ {event['data']['message']}")
+                    
+            # Possibly change weather
+            if self.rng.random() < 0.3:
+                self.systems.weather_system.change_weather()
+                print(f"🌤️ The weather changes: {self.systems.weather_system.get_weather_info()}")
+            self.read_input("\nPress Enter to continue...")
             
-        input("\nPress Enter to continue...")
+            result = SCENE_ROUTER.play(self, stop)
+            stop = SCENE_ROUTER.next_stop(stop, result)
+            if stop == JOURNEYS_END:
+                EndingScene(self).play(result)
+                self.read_input("\nPress Enter to return to main menu...")
+                return True
+        return False
         
     def display_character_info(self):
         """Display detailed character information."""
@@ -364,68 +456,117 @@ class EnhancedGameEngine:
                 print(f"  {spell['description']}")
             print()
             
-        input("Press Enter to continue...")
+        self.read_input("Press Enter to continue...")
         
     def manage_inventory(self):
         """Manage player inventory."""
         self.clear_screen()
         print(self.systems.inventory_system.display_inventory())
+        print(self.systems.equipment_system.display_equipment())
         
-        if self.systems.inventory_system.items:
-            print("1. Use Item")
-            print("2. Return")
+        if self.systems.inventory_system.items or self.systems.equipment_system.equipped:
+            print("1. Use or Equip Item")
+            print("2. Craft Items")
+            print("3. Remove Gear")
+            print("4. Return")
             
-            choice = input("Choose action (1-2): ").strip()
+            choice = self.read_input("Choose action (1-4): ").strip()
             if choice == '1':
                 self.use_item_menu()
+            elif choice == '2':
+                self.crafting_menu()
+            elif choice == '3':
+                self.unequip_menu()
                 
-        input("Press Enter to continue...")
+        self.read_input("Press Enter to continue...")
         
     def use_item_menu(self):
-        """Menu for using items."""
-        items = list(self.systems.inventory_system.items.keys())
+        """Menu for using items, numbered in the order the inventory is displayed."""
+        inventory = self.systems.inventory_system
+        items = [item_id for group in inventory.grouped_items().values() for item_id in group]
         if not items:
             return
             
         print("\nSelect item to use:")
         for i, item_id in enumerate(items, 1):
-            item = self.systems.inventory_system.item_database[item_id]
-            quantity = self.systems.inventory_system.items[item_id]
-            print(f"{i}. {item['name']} x{quantity}")
+            item = inventory.item_database[item_id]
+            print(f"{i}. {item['name']} x{inventory.items[item_id]}")
             
         try:
-            choice = int(input("Item number: ")) - 1
+            choice = int(self.read_input("Item number: ")) - 1
             if 0 <= choice < len(items):
                 item_id = items[choice]
                 self.use_item(item_id)
         except ValueError:
             print("Invalid choice!")
             
+    def crafting_menu(self):
+        """Menu for crafting items from the inventory."""
+        crafting_system = self.systems.crafting_system
+        recipes = crafting_system.available_recipes()
+        if not recipes:
+            print("\nYou don't have the ingredients for any recipe.")
+            return
+            
+        print("\nSelect recipe to craft:")
+        for i, (recipe_id, times) in enumerate(recipes, 1):
+            recipe = crafting_system.recipe_book.recipes[recipe_id]
+            item_database = self.systems.inventory_system.item_database
+            ingredients = ", ".join(f"{count} {item_database[item_id]['name']}"
+                                    for item_id, count in recipe["ingredients"].items())
+            print(f"{i}. {recipe['name']} ({ingredients}) - up to {times}")
+            
+        try:
+            choice = int(self.read_input(f"Recipe number (1-{len(recipes)}): ")) - 1
+            if 0 <= choice < len(recipes):
+                recipe_id, times = recipes[choice]
+                if times > 1:
+                    times = int(self.read_input(f"How many? (1-{times}): "))
+                success, message = crafting_system.craft(recipe_id, times)
+                print(f"\n{message}")
+        except ValueError:
+            print("Invalid choice!")
+            
+    def unequip_menu(self):
+        """Menu for taking off worn gear."""
+        slots = [slot for slot in EQUIPMENT_SLOTS if slot in self.systems.equipment_system.equipped]
+        if not slots:
+            print("\nYou aren't wearing any gear.")
+            return
+            
+        print("\nSelect gear to remove:")
+        for i, slot in enumerate(slots, 1):
+            item_id = self.systems.equipment_system.equipped[slot]
+            print(f"{i}. {self.systems.inventory_system.item_database[item_id]['name']} ({slot})")
+            
+        try:
+            choice = int(self.read_input(f"Gear number (1-{len(slots)}): ")) - 1
+            if 0 <= choice < len(slots):
+                success, message = self.systems.equipment_system.unequip(slots[choice])
+                print(f"\n{message}")
+        except ValueError:
+            print("Invalid choice!")
+            
     def use_item(self, item_id):
-        """Use an item from inventory."""
+        """Use an item from inventory; gear is equipped instead."""
         item = self.systems.inventory_system.item_database[item_id]
+        if self.systems.equipment_system.slot_for(item_id):
+            success, message = self.systems.equipment_system.equip(item_id)
+            print(f"\n{message}")
+            return
+        if not self.systems.effect_system.resolve(f"item:{item_id}", item['effect']):
+            print(f"\n{item['name']} can't be used right now.")
+            return
+            
         success, message = self.systems.inventory_system.remove_item(item_id)
         
         if success:
             print(f"\n✨ Used {item['name']}!")
             
             # Apply item effects
-            if item['effect'] == 'heal_50':
-                stats = self.systems.stats_system.player_stats
-                old_health = stats['health']
-                stats['health'] = min(stats['max_health'], stats['health'] + 50)
-                healed = stats['health'] - old_health
-                print(f"❤️ Restored {healed} health!")
-                
-            elif item['effect'] == 'mana_boost':
-                stats = self.systems.stats_system.player_stats
-                stats['max_mana'] += 10
-                stats['mana'] = stats['max_mana']
-                print("💙 Maximum mana increased by 10!")
-                
-            elif item['effect'] == 'experience_boost':
-                leveled_up, exp_msg = self.systems.stats_system.gain_experience(100)
-                print(f"⭐ {exp_msg}")
+            applied, effect_messages = self.systems.effect_system.apply(f"item:{item_id}", item['effect'])
+            for effect_message in effect_messages:
+                print(effect_message)
                 
         else:
             print(message)
@@ -436,7 +577,7 @@ class EnhancedGameEngine:
         
         if not self.systems.magic_system.known_spells:
             print("You don't know any spells yet!")
-            input("Press Enter to continue...")
+            self.read_input("Press Enter to continue...")
             return
             
         print("✨ CAST SPELL")
@@ -451,52 +592,44 @@ class EnhancedGameEngine:
         print(f"{len(self.systems.magic_system.known_spells) + 1}. Cancel")
         
         try:
-            choice = int(input("Select spell: "))
+            choice = int(self.read_input("Select spell: "))
             if 1 <= choice <= len(self.systems.magic_system.known_spells):
                 spell_id = self.systems.magic_system.known_spells[choice - 1]
                 self.cast_spell(spell_id)
         except ValueError:
             print("Invalid choice!")
             
-        input("Press Enter to continue...")
+        self.read_input("Press Enter to continue...")
         
     def cast_spell(self, spell_id):
         """Cast a specific spell."""
         stats = self.systems.stats_system.player_stats
-        success, message = self.systems.magic_system.cast_spell(spell_id, stats)
+        success, message = self.systems.magic_system.cast_spell(spell_id, stats, self.systems.player_status)
         
         print(f"\n{message}")
         
         if success:
-            self.spells_cast += 1
+            self.systems.event_bus.publish(GameEvent.SPELL_CAST, spell_id=spell_id)
             
             # Apply spell effects
             spell = self.systems.magic_system.spell_database[spell_id]
-            if spell['effect'] == 'restore_health':
-                old_health = stats['health']
-                stats['health'] = min(stats['max_health'], stats['health'] + 40)
-                healed = stats['health'] - old_health
-                print(f"❤️ Restored {healed} health!")
+            applied, effect_messages = self.systems.effect_system.apply(f"spell:{spell_id}", spell['effect'])
+            for effect_message in effect_messages:
+                print(effect_message)
                 
-            # Check for spell caster achievement
-            if self.spells_cast >= 10:
-                achievement_msg = self.systems.achievement_system.unlock_achievement("spell_caster")
-                if achievement_msg:
-                    print(f"\n{achievement_msg}")
-                    
     def save_game_menu(self):
         """Menu for saving the game."""
         self.clear_screen()
         print("💾 SAVE GAME")
         self.print_border('-', 30)
         
-        save_name = input("Enter save name (or press Enter for quicksave): ").strip()
+        save_name = self.read_input("Enter save name (or press Enter for quicksave): ").strip()
         if not save_name:
             save_name = "quicksave"
             
         success, message = self.save_system.save_game(save_name)
         print(f"\n{message}")
-        input("Press Enter to continue...")
+        self.read_input("Press Enter to continue...")
         
     def handle_random_event(self, event):
         """Handle a random event."""
@@ -509,7 +642,7 @@ class EnhancedGameEngine:
         
         if event['type'] == 'blessing':
             # Grant random benefit
-            benefit = random.choice(['health', 'mana', 'experience'])
+            benefit = self.rng.choice(['health', 'mana', 'experience'])
             stats = self.systems.stats_system.player_stats
             
             if benefit == 'health':
@@ -524,10 +657,10 @@ class EnhancedGameEngine:
                 
         elif event['type'] == 'trade':
             print("The merchant offers you a rare item!")
-            success, message = self.systems.inventory_system.add_item("magic_crystal")
-            print(message)
+            for granted, message in self.systems.loot_system.grant("event:trade"):
+                print(message)
             
-        input("\nPress Enter to continue...")
+        self.read_input("\nPress Enter to continue...")
         
     def exit_game(self):
         """Exit the enhanced game."""
@@ -543,6 +676,7 @@ class EnhancedGameEngine:
         print("• Achievement tracking")
         print("• Save/load functionality")
         print("• And much more!")
+        MEMORY_PROFILER.mark("session.end", self)
         sys.exit(0)
 
 
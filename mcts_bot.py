@@ -0,0 +1,236 @@
+"""
+Monte Carlo Tree Search Bot for Mystic Quest
+============================================
+Finds the best choices a scene allows, for balance testing. Each rollout
+replays a scene in a fresh headless engine: the choices along the tree path
+are made first, then a fast random policy finishes the scene and the end
+state is scored. Rollouts run in batches across a process pool.
+
+Scene randomness is fixed by the search seed, so every rollout of a search
+sees the same dice; search with several seeds to cover the luck involved.
+
+    python mcts_bot.py scenes.treasure:TreasureScene.riddle_trial --iterations 400
+"""
+
+import argparse
+import importlib
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from game_history import Snapshot, StateHistory
+from headless_engine import DecisionLimitReached, HeadlessEngine, journey_value
+
+
+def run_rollout(task):
+    """Replay a choice prefix, finish the scene at random and score it.
+
+    Module-level so that process pool workers can run it. Returns the
+    decisions made as (prompt, options, choice) tuples and the score.
+    """
+    scene_module, scene_name, method, args, start_parts, prefix, seed, rollout_seed, value = task
+    rollout_random = random.Random(rollout_seed)
+    remaining = iter(prefix)
+
+    def policy(prompt, options):
+        choice = next(remaining, None)
+        return choice if choice in options else rollout_random.choice(options)
+
+    engine = HeadlessEngine(policy, seed=seed)
+    if start_parts:
+        StateHistory(engine).restore(Snapshot("start", start_parts))
+    scene_class = getattr(importlib.import_module(scene_module), scene_name)
+    try:
+        result = engine.play_scene(scene_class, method, *args)
+    except DecisionLimitReached:
+        result = None
+    return engine.decisions, value(engine, result)
+
+
+class SearchNode:
+    """A decision point in the search tree."""
+
+    def __init__(self, parent=None, choice=None):
+        self.parent = parent
+        self.choice = choice
+        self.children = {}
+        self.prompt = None
+        self.options = None  # Unknown until a rollout reaches this point
+        self.terminal = False
+        self.visits = 0
+        self.pending = 0
+        self.total = 0.0
+
+    def mean(self):
+        """Get the average rollout score through this node."""
+        return self.total / self.visits if self.visits else 0.0
+
+    def prefix(self):
+        """Get the choices leading from the root to this node."""
+        choices = []
+        node = self
+        while node.parent:
+            choices.append(node.choice)
+            node = node.parent
+        choices.reverse()
+        return choices
+
+
+class MCTSBot:
+    """Monte Carlo tree search over the prompts of one scene method.
+
+    ``start`` may be a Snapshot from a StateHistory, to search from any
+    point of a game rather than from a fresh character.
+    """
+
+    def __init__(self, scene_class, method="play", args=(), start=None, value=journey_value,
+                 iterations=200, batch_size=8, workers=None, exploration=1.4, seed=0):
+        self.scene_spec = (scene_class.__module__, scene_class.__name__, method, tuple(args))
+        self.start_parts = start.parts if start else None
+        self.value = value
+        self.iterations = iterations
+        self.batch_size = batch_size
+        self.workers = workers
+        self.exploration = exploration
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.root = SearchNode()
+        self.lowest = math.inf
+        self.highest = -math.inf
+        self.best_value = -math.inf
+        self.best_sequence = []
+        self.rollouts = 0
+
+    def select(self):
+        """Walk down the tree to a node that needs a rollout."""
+        node = self.root
+        while node.options is not None and not node.terminal:
+            untried = [option for option in node.options if option not in node.children]
+            if untried:
+                choice = self.random.choice(untried)
+                node.children[choice] = SearchNode(node, choice)
+                node = node.children[choice]
+                break
+            node = max(node.children.values(), key=lambda child: self.uct_score(node, child))
+        # Count in-flight rollouts so a batch spreads across the tree
+        walk = node
+        while walk:
+            walk.pending += 1
+            walk = walk.parent
+        return node
+
+    def uct_score(self, parent, child):
+        """Score a child by normalized mean plus an exploration bonus."""
+        visits = child.visits + child.pending
+        if not visits:
+            return math.inf
+        spread = self.highest - self.lowest
+        exploitation = (child.mean() - self.lowest) / spread if spread > 0 else 0.5
+        parent_visits = parent.visits + parent.pending
+        return exploitation + self.exploration * math.sqrt(math.log(parent_visits) / visits)
+
+    def backpropagate(self, leaf, decisions, value):
+        """Record a rollout's decisions and score along the leaf's path."""
+        path = []
+        node = leaf
+        while node:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        for depth, node in enumerate(path):
+            if depth < len(decisions):
+                node.prompt, node.options = decisions[depth][0], decisions[depth][1]
+            else:
+                node.terminal = True
+            node.visits += 1
+            node.pending -= 1
+            node.total += value
+        self.lowest = min(self.lowest, value)
+        self.highest = max(self.highest, value)
+        if value > self.best_value:
+            self.best_value = value
+            self.best_sequence = [(prompt, choice) for prompt, _, choice in decisions]
+
+    def rollout_task(self, leaf):
+        """Build the picklable task for one rollout from a leaf."""
+        scene_module, scene_name, method, args = self.scene_spec
+        self.rollouts += 1
+        return (scene_module, scene_name, method, args, self.start_parts, leaf.prefix(),
+                self.seed, self.seed * 1000003 + self.rollouts, self.value)
+
+    def search(self):
+        """Run the search and return its report."""
+        executor = ProcessPoolExecutor(self.workers) if self.workers != 0 else None
+        try:
+            completed = 0
+            while completed < self.iterations:
+                batch = [self.select() for _ in range(min(self.batch_size, self.iterations - completed))]
+                tasks = [self.rollout_task(leaf) for leaf in batch]
+                results = executor.map(run_rollout, tasks) if executor else map(run_rollout, tasks)
+                for leaf, (decisions, value) in zip(batch, results):
+                    self.backpropagate(leaf, decisions, value)
+                completed += len(batch)
+        finally:
+            if executor:
+                executor.shutdown()
+        return self.report()
+
+    def report(self):
+        """Get the most-visited line of play with value estimates per decision."""
+        decisions = []
+        node = self.root
+        while node.children and not node.terminal:
+            best = max(node.children.values(), key=lambda child: child.visits)
+            decisions.append({
+                "prompt": node.prompt,
+                "choice": best.choice,
+                "value": best.mean(),
+                "visits": best.visits,
+                "options": {choice: {"visits": child.visits, "value": child.mean()}
+                            for choice, child in sorted(node.children.items())}
+            })
+            node = best
+        return {
+            "value": self.root.mean(),
+            "best_value": self.best_value,
+            "best_sequence": self.best_sequence,
+            "decisions": decisions,
+            "rollouts": self.root.visits
+        }
+
+
+def load_scene(target):
+    """Resolve "module:Class.method" into the scene class and method name."""
+    module_name, _, qualified_name = target.partition(":")
+    class_name, _, method = qualified_name.partition(".")
+    return getattr(importlib.import_module(module_name), class_name), method or "play"
+
+
+def main():
+    """Search a scene from the command line and print the best line."""
+    parser = argparse.ArgumentParser(description="Find the best choices through a Mystic Quest scene.")
+    parser.add_argument("scene", help='scene to search, as "module:Class.method"')
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None, help="pool size; 0 runs rollouts in-process")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    scene_class, method = load_scene(options.scene)
+    bot = MCTSBot(scene_class, method, iterations=options.iterations, batch_size=options.batch_size,
+                  workers=options.workers, seed=options.seed)
+    report = bot.search()
+
+    print(f"Rollouts: {report['rollouts']} | Mean value: {report['value']:.1f} | Best value: {report['best_value']:.1f}")
+    for number, decision in enumerate(report["decisions"], 1):
+        print(f"\n{number}. {decision['prompt']}")
+        for choice, stats in decision["options"].items():
+            marker = "→" if choice == decision["choice"] else " "
+            print(f"  {marker} {choice}: value {stats['value']:.1f} over {stats['visits']} rollouts")
+    print("\nBest sequence found:")
+    for prompt, choice in report["best_sequence"]:
+        print(f"  {choice}  ← {prompt}")
+
+
+if __name__ == "__main__":
+    main()
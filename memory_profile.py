@@ -0,0 +1,299 @@
+"""
+Memory Profiling for Mystic Quest
+=================================
+Measures what a game session costs in memory, for sizing a host that runs
+many sessions at once.
+
+Two views are offered. ``session_footprint`` walks a live engine and
+reports the bytes held by each of its parts, one entry per game subsystem.
+``MEMORY_PROFILER`` takes tracemalloc snapshots at session lifecycle points
+(session start, each adventure turn, the end of each story scene) and
+records what was allocated since the previous point, by source file, along
+with the call stack depth so menus that recurse into each other show up.
+
+``leak_check`` plays sessions back to back and flags memory that keeps
+growing from one session to the next.
+
+Profiling is off by default and a disabled mark costs one attribute check.
+Set MYSTIC_QUEST_MEMORY to a file path to profile a whole run: the marks are
+written there as JSON on exit and a summary is printed.
+"""
+
+import argparse
+import atexit
+import contextlib
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+import types
+
+
+# Objects shared by every session: code, classes, modules and the read-only
+# content tables. They are not counted towards any one session.
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                types.CodeType, types.FrameType, types.MappingProxyType)
+
+
+def deep_size(root, seen):
+    """Get the bytes reachable from an object that are not already in ``seen``.
+
+    Every object counted is added to ``seen``, so measuring several objects
+    with the same set counts shared objects once, towards the first.
+    """
+    total = 0
+    pending = [root]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return total
+
+
+def module_globals():
+    """Get the ids of every module-level object, which all sessions share."""
+    return {id(value) for module in list(sys.modules.values())
+            for value in list(getattr(module, "__dict__", {}).values())}
+
+
+def session_parts(engine):
+    """Get an engine's parts as {name: object}, with each game subsystem apart."""
+    parts = {}
+    for name, value in vars(engine).items():
+        if name == "systems":
+            for system_name, system in vars(value).items():
+                if system is not engine:
+                    parts[f"systems.{system_name}"] = system
+        elif not isinstance(value, (int, float, str, bool, type(None))):
+            parts[name] = value
+    return parts
+
+
+def session_footprint(engine):
+    """Get the bytes held by each part of a session, largest first.
+
+    The walk stops at the engine and at every other part, so a subsystem's
+    references back to the engine are not counted as its own. Objects
+    shared by two parts count towards the first, and module-level objects
+    such as the flag registry are left out.
+    """
+    parts = session_parts(engine)
+    seen = module_globals() | {id(engine), id(engine.systems)} | {id(part) for part in parts.values()}
+    footprint = {}
+    for name, part in parts.items():
+        seen.discard(id(part))
+        footprint[name] = deep_size(part, seen)
+    return dict(sorted(footprint.items(), key=lambda item: -item[1]))
+
+
+def stack_depth():
+    """Get the number of frames on the calling thread's stack."""
+    depth = 0
+    frame = sys._getframe(1)
+    while frame:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class MemoryProfiler:
+    """Takes tracemalloc snapshots at lifecycle points and keeps the differences.
+
+    Only the latest snapshot is kept; each mark stores the allocations since
+    the one before it, grouped by source file.
+    """
+
+    def __init__(self, top=10):
+        self.enabled = False
+        self.top = top
+        self.marks = []
+        self.snapshot = None
+
+    def enable(self, frames=1):
+        """Start tracing allocations and recording marks."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.enabled = True
+        self.snapshot = self.take_snapshot()
+
+    def disable(self):
+        """Stop recording marks; recorded ones are kept."""
+        self.enabled = False
+        self.snapshot = None
+
+    def take_snapshot(self):
+        """Snapshot current allocations, leaving out the profiler's own."""
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ])
+
+    def mark(self, label, engine=None):
+        """Record a lifecycle point, with the session's footprint if an engine is given."""
+        if not self.enabled:
+            return
+        snapshot = self.take_snapshot()
+        differences = snapshot.compare_to(self.snapshot, "filename")
+        self.snapshot = snapshot
+        record = {
+            "label": label,
+            "traced": sum(stat.size for stat in snapshot.statistics("filename")),
+            "change": sum(stat.size_diff for stat in differences),
+            "frames": stack_depth(),
+            "by_file": [(stat.traceback[0].filename, stat.size_diff)
+                        for stat in differences[:self.top] if stat.size_diff]
+        }
+        if engine is not None:
+            record["footprint"] = session_footprint(engine)
+        self.marks.append(record)
+
+    def summary(self):
+        """Bytes left allocated at each mark label: count, total and mean."""
+        summary = {}
+        for record in self.marks:
+            stats = summary.setdefault(record["label"], {"count": 0, "total": 0})
+            stats["count"] += 1
+            stats["total"] += record["change"]
+        for stats in summary.values():
+            stats["mean"] = stats["total"] / stats["count"]
+        return summary
+
+    def format_summary(self):
+        """Get the summary as a table, largest total first."""
+        lines = [f"{'mark':<28} {'count':>7} {'total KiB':>10} {'mean KiB':>10} {'max frames':>11}"]
+        frames = {}
+        for record in self.marks:
+            frames[record["label"]] = max(frames.get(record["label"], 0), record["frames"])
+        for label, stats in sorted(self.summary().items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{label:<28} {stats['count']:>7} {stats['total'] / 1024:>10.1f} "
+                         f"{stats['mean'] / 1024:>10.1f} {frames[label]:>11}")
+        return "\n".join(lines)
+
+    def export_json(self, path):
+        """Write every mark to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump({"marks": self.marks, "summary": self.summary()}, f, indent=2)
+
+
+MEMORY_PROFILER = MemoryProfiler()
+
+
+def play_session(seed):
+    """Play one headless story session with seeded random choices."""
+    from game_env import play_story
+    from headless_engine import DecisionLimitReached, HeadlessEngine, NullOutput
+
+    chooser = random.Random(seed)
+    engine = HeadlessEngine(lambda prompt, options: chooser.choice(options), seed=seed)
+    with contextlib.redirect_stdout(NullOutput()):
+        try:
+            play_story(engine)
+        except DecisionLimitReached:
+            pass
+    return engine
+
+
+def leak_check(sessions=50, warmup=5, threshold=1024, seed=0, run_session=play_session):
+    """Play sessions back to back and flag memory growth between them.
+
+    Memory is measured after each session once it has been collected. The
+    growth is the least-squares slope of those measurements, in bytes per
+    session; the session leaks if it is over ``threshold``.
+    """
+    if sessions < 2:
+        raise ValueError("A leak check needs at least two sessions")
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        for index in range(warmup):
+            run_session(seed + index)
+        gc.collect()
+        baseline = MEMORY_PROFILER.take_snapshot()
+        sizes = []
+        for index in range(sessions):
+            run_session(seed + warmup + index)
+            gc.collect()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+        final = MEMORY_PROFILER.take_snapshot()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    mean_index = (sessions - 1) / 2
+    mean_size = sum(sizes) / sessions
+    slope = (sum((index - mean_index) * (size - mean_size) for index, size in enumerate(sizes))
+             / sum((index - mean_index) ** 2 for index in range(sessions)))
+    growth = [stat for stat in final.compare_to(baseline, "lineno") if stat.size_diff > 0]
+    return {
+        "sessions": sessions,
+        "first": sizes[0],
+        "last": sizes[-1],
+        "bytes_per_session": slope,
+        "leaking": slope > threshold,
+        "top_growth": [(str(stat.traceback[0]), stat.size_diff, stat.count_diff) for stat in growth[:10]]
+    }
+
+
+def format_leak_check(result):
+    """Get a leak check result as text."""
+    verdict = "LEAK" if result["leaking"] else "ok"
+    lines = [f"{result['sessions']} sessions: {result['first'] / 1024:.1f} KiB -> {result['last'] / 1024:.1f} KiB, "
+             f"{result['bytes_per_session']:+.0f} bytes/session ({verdict})"]
+    for location, size, count in result["top_growth"]:
+        lines.append(f"  {size:>+9} bytes {count:>+6} blocks  {location}")
+    return "\n".join(lines)
+
+
+def export_profile(path):
+    """Write the profile and print the summary, at exit."""
+    MEMORY_PROFILER.export_json(path)
+    print(f"\n🧠 Memory profile of {len(MEMORY_PROFILER.marks)} marks written to {path}")
+    print(MEMORY_PROFILER.format_summary())
+
+
+def main():
+    """Profile sessions and check for leaks from the command line."""
+    parser = argparse.ArgumentParser(description="Profile Mystic Quest's per-session memory.")
+    parser.add_argument("--sessions", type=int, default=50, help="sessions played by the leak check")
+    parser.add_argument("--threshold", type=int, default=1024, help="growth in bytes per session counted as a leak")
+    parser.add_argument("--json", help="write the report to this JSON file")
+    options = parser.parse_args()
+
+    # Play one session first so imports and caches are not counted
+    play_session(0)
+    MEMORY_PROFILER.enable()
+    engine = play_session(0)
+    MEMORY_PROFILER.mark("session.end", engine)
+    MEMORY_PROFILER.disable()
+    footprint = MEMORY_PROFILER.marks[-1]["footprint"]
+    print(f"{'part':<32} {'KiB':>9}")
+    for name, size in footprint.items():
+        print(f"{name:<32} {size / 1024:>9.1f}")
+    print(f"{'total':<32} {sum(footprint.values()) / 1024:>9.1f}\n")
+    print(MEMORY_PROFILER.format_summary() + "\n")
+
+    result = leak_check(options.sessions, threshold=options.threshold)
+    print(format_leak_check(result))
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump({"footprint": footprint, "marks": MEMORY_PROFILER.marks, "leak_check": result}, f, indent=2)
+    if result["leaking"]:
+        sys.exit(1)
+
+
+if os.environ.get("MYSTIC_QUEST_MEMORY"):
+    MEMORY_PROFILER.enable()
+    atexit.register(export_profile, os.environ["MYSTIC_QUEST_MEMORY"])
+
+
+if __name__ == "__main__":
+    # Run through the imported module so the engine's marks reach this profiler
+    import memory_profile
+    memory_profile.main()
@@ -0,0 +1,275 @@
+"""
+Metrics for Mystic Quest
+========================
+Counters, gauges and histograms fed by the engine, scenes and save system,
+for watching many hosted game sessions. Metrics are exposed in the
+Prometheus text format, as a file or over a local HTTP endpoint.
+
+Updates never take a shared lock: every thread writes to its own shard of
+each metric, and shards are only added together when metrics are read.
+Shards of threads that have finished are folded into a retired shard, so
+short-lived threads do not pile up shards.
+
+Set MYSTIC_QUEST_METRICS_PORT to serve /metrics on localhost, or
+MYSTIC_QUEST_METRICS_FILE to write the metrics to a file on exit.
+"""
+
+import atexit
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Metric:
+    """A named metric whose values are sharded per thread."""
+
+    kind = "untyped"
+
+    def __init__(self, name, description, label_names=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.local = threading.local()
+        self.shards = []  # (thread, shard) pairs
+        self.retired = {}  # Values from the shards of finished threads
+        self.shards_lock = threading.Lock()  # Taken once per thread and on reads
+
+    def shard(self):
+        """Get this thread's shard, creating it on first use."""
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.local.shard = {}
+            with self.shards_lock:
+                self.retire_finished()
+                self.shards.append((threading.current_thread(), shard))
+        return shard
+
+    def retire_finished(self):
+        """Fold the shards of finished threads into the retired shard; call with shards_lock held."""
+        live = []
+        for thread, shard in self.shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self.merge(self.retired, shard)
+        self.shards = live
+
+    def merge(self, totals, shard):
+        """Add a shard's values into totals."""
+        for labels, value in list(shard.items()):
+            totals[labels] = totals.get(labels, 0) + value
+
+    def collect(self):
+        """Add the shards together into {label values: value}."""
+        totals = {}
+        with self.shards_lock:
+            self.retire_finished()
+            self.merge(totals, self.retired)
+            shards = [shard for _, shard in self.shards]
+        for shard in shards:
+            self.merge(totals, shard)
+        return totals
+
+    def label_text(self, labels, extra=""):
+        """Format label values as Prometheus label text."""
+        pairs = [f'{name}="{value}"' for name, value in zip(self.label_names, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self):
+        """Get the metric in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{self.label_text(labels)} {value}")
+        return lines
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, *labels):
+        """Add to the counter."""
+        shard = self.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that goes up and down, such as active sessions."""
+
+    kind = "gauge"
+
+    def inc(self, amount=1, *labels):
+        """Raise the gauge."""
+        shard = self.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def dec(self, amount=1, *labels):
+        """Lower the gauge."""
+        shard = self.shard()
+        shard[labels] = shard.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets, such as latencies."""
+
+    kind = "histogram"
+
+    def __init__(self, name, description, label_names=(), buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        """Record one observation."""
+        shard = self.shard()
+        cells = shard.get(labels)
+        if cells is None:
+            # One count per bucket, then +Inf count and sum
+            cells = shard[labels] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                cells[index] += 1
+                break
+        else:
+            cells[len(self.buckets)] += 1
+        cells[-1] += value
+
+    def merge(self, totals, shard):
+        """Add a shard's bucket counts into totals."""
+        for labels, cells in list(shard.items()):
+            total = totals.setdefault(labels, [0] * len(cells))
+            for index, value in enumerate(list(cells)):
+                total[index] += value
+
+    def render(self):
+        """Get the histogram in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for labels, cells in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, cells):
+                cumulative += count
+                bucket_labels = self.label_text(labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            cumulative += cells[len(self.buckets)]
+            bucket_labels = self.label_text(labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self.label_text(labels)} {cells[-1]}")
+            lines.append(f"{self.name}_count{self.label_text(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The set of metrics exposed together."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        """Add a metric to the registry and return it."""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Get every metric in Prometheus text format."""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write the metrics to a file, replacing it atomically."""
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w') as f:
+            f.write(self.render())
+        os.replace(temporary_path, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve /metrics over HTTP on a background thread; returns the server."""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+SESSIONS_ACTIVE = REGISTRY.register(Gauge(
+    "mystic_quest_sessions_active", "Game sessions currently open"))
+SESSIONS_STARTED = REGISTRY.register(Counter(
+    "mystic_quest_sessions_started_total", "Game sessions started"))
+SCENES_ACTIVE = REGISTRY.register(Gauge(
+    "mystic_quest_scenes_active", "Sessions currently playing each scene", ["scene"]))
+SCENE_PLAYS = REGISTRY.register(Counter(
+    "mystic_quest_scene_plays_total", "Scenes entered", ["scene"]))
+SAVE_SECONDS = REGISTRY.register(Histogram(
+    "mystic_quest_save_seconds", "Save system operation latency", ["operation"]))
+RENDER_BYTES = REGISTRY.register(Counter(
+    "mystic_quest_render_bytes_total", "Bytes of text rendered to players", ["kind"]))
+ERRORS = REGISTRY.register(Counter(
+    "mystic_quest_errors_total", "Errors by where they happened", ["source"]))
+
+
+def session_started():
+    """Count a new session; returns the callback to run when it ends."""
+    SESSIONS_STARTED.inc()
+    SESSIONS_ACTIVE.inc()
+    return SESSIONS_ACTIVE.dec
+
+
+def metered_scene(scene):
+    """Decorate a scene's play() to count plays, active players and errors."""
+    def decorate(play):
+        @functools.wraps(play)
+        def wrapper(*args, **kwargs):
+            SCENE_PLAYS.inc(1, scene)
+            SCENES_ACTIVE.inc(1, scene)
+            try:
+                return play(*args, **kwargs)
+            except Exception:
+                ERRORS.inc(1, "scene")
+                raise
+            finally:
+                SCENES_ACTIVE.dec(1, scene)
+        return wrapper
+    return decorate
+
+
+def metered_save(operation):
+    """Decorate a SaveSystem method returning (success, message) to time it."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = method(*args, **kwargs)
+            SAVE_SECONDS.observe(time.perf_counter() - started, operation)
+            if not result[0]:
+                ERRORS.inc(1, "save")
+            return result
+        return wrapper
+    return decorate
+
+
+if os.environ.get("MYSTIC_QUEST_METRICS_PORT"):
+    REGISTRY.serve(int(os.environ["MYSTIC_QUEST_METRICS_PORT"]))
+if os.environ.get("MYSTIC_QUEST_METRICS_FILE"):
+    atexit.register(REGISTRY.write_textfile, os.environ["MYSTIC_QUEST_METRICS_FILE"])
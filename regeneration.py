@@ -0,0 +1,109 @@
+"""
+Regeneration for Mystic Quest
+=============================
+Health and mana that return on their own as game time passes, faster or
+slower with the weather, the time of day, worn gear and companions.
+
+Rates are constant within each four-hour period of the day, and never
+negative, so the amount regained over any stretch of time is the hours
+spent in each period times that period's rate, capped at the maximum.
+A jump of any length costs at most a handful of steps: whole days are
+counted at once and only the partial day is walked period by period.
+"""
+
+from companion_ai import MAX_LOYALTY
+
+
+RESOURCES = ("health", "mana")
+HOURS_PER_PERIOD = 4
+
+# Per-hour rates before modifiers
+BASE_RATES = {"health": 2, "mana": 1}
+
+# Time of day -> extra per-hour regeneration
+PERIOD_BONUSES = {
+    "Dawn": {"mana": 2},
+    "Evening": {"mana": 1},
+    "Night": {"health": 1}
+}
+
+# Weather -> rate multipliers, applied after every bonus
+WEATHER_MULTIPLIERS = {
+    "mystical": {"mana": 3},
+    "stormy": {"mana": 1.5},
+    "rainy": {"health": 0.75},
+    "snowy": {"health": 0.5}
+}
+
+# Companion ability -> per-hour regeneration at full loyalty
+COMPANION_REGEN = {
+    "healing": {"health": 2},
+    "knowledge": {"mana": 1}
+}
+
+
+def hours_by_period(start, end, periods):
+    """Get how many of the hours from start to end fall in each period of the day."""
+    day = HOURS_PER_PERIOD * periods
+    days, rest = divmod(max(0, end - start), day)
+    spent = [days * HOURS_PER_PERIOD] * periods
+    time, end = start, start + rest
+    while time < end:
+        step = min((time // HOURS_PER_PERIOD + 1) * HOURS_PER_PERIOD, end) - time
+        spent[int(time // HOURS_PER_PERIOD) % periods] += step
+        time += step
+    return spent
+
+
+class RegenerationSystem:
+    """Regenerates the player's health and mana as game time passes."""
+
+    def __init__(self, systems):
+        self.systems = systems
+        self.fractions = {"health": 0.0, "mana": 0.0}  # Regained but not yet whole points
+        systems.time_system.add_time_listener(self.pass_time)
+
+    def steady_rates(self):
+        """Get the per-hour rates from gear and companions, which hold all day."""
+        stats = self.systems.stats_system.player_stats
+        rates = {resource: BASE_RATES[resource] + stats.get(f"{resource}_regen", 0) for resource in RESOURCES}
+        for companion in self.systems.companion_system.companions:
+            share = companion["loyalty"] / MAX_LOYALTY
+            for resource, rate in COMPANION_REGEN.get(companion["ability"], {}).items():
+                rates[resource] += rate * share
+        return rates
+
+    def period_rates(self):
+        """Get [{resource: per-hour rate}] for each period of the day in the current weather."""
+        steady = self.steady_rates()
+        multipliers = WEATHER_MULTIPLIERS.get(self.systems.weather_system.current_weather, {})
+        rates = []
+        for period in self.systems.time_system.day_cycle:
+            bonuses = PERIOD_BONUSES.get(period, {})
+            rates.append({resource: max(0, (steady[resource] + bonuses.get(resource, 0))
+                                        * multipliers.get(resource, 1))
+                          for resource in RESOURCES})
+        return rates
+
+    def current_rates(self):
+        """Get the per-hour rates right now."""
+        time_system = self.systems.time_system
+        period = int(time_system.game_time // HOURS_PER_PERIOD) % len(time_system.day_cycle)
+        return self.period_rates()[period]
+
+    def regained(self, start, end):
+        """Get {resource: amount} regained between two game times, before the maximum cap."""
+        rates = self.period_rates()
+        spent = hours_by_period(start, end, len(rates))
+        return {resource: sum(hours * period[resource] for hours, period in zip(spent, rates))
+                for resource in RESOURCES}
+
+    def pass_time(self, start, end):
+        """Regenerate for the time between two game times, carrying over fractions of a point."""
+        amounts = {}
+        for resource, amount in self.regained(start, end).items():
+            total = self.fractions[resource] + amount
+            # Allow for rounding error in rates such as 0.3 per hour
+            amounts[resource] = int(total + 1e-9)
+            self.fractions[resource] = max(0.0, total - amounts[resource])
+        self.systems.stats_system.regenerate(amounts["health"], amounts["mana"])
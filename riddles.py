@@ -0,0 +1,161 @@
+"""
+Riddle Bank for Mystic Quest
+============================
+Riddles indexed by theme and difficulty, asked without repeats and pitched
+at the player's skill.
+
+The bank file holds one JSON riddle per line. Building the bank reads each
+line once to index its id, theme, difficulty and position in the file, and
+keeps nothing else; the text of a riddle is read from its position only
+when it is asked, and recently asked riddles are kept in a small shared
+cache. The bank is shared by every session, so even a bank of thousands
+of riddles costs each session only a bitset of the riddle ids it has seen.
+"""
+
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+
+
+RIDDLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "riddles.jsonl")
+THEMES = ("wisdom", "courage", "mystery")
+MIN_DIFFICULTY = 1
+MAX_DIFFICULTY = 3
+
+
+class RiddleBank:
+    """An index of the riddles in a bank file, with their text loaded on demand."""
+
+    def __init__(self, path=RIDDLE_FILE, cache_size=64):
+        self.path = path
+        self.offsets = {}  # Riddle id -> byte offset of its line
+        self.by_key = {}  # (theme, difficulty) -> [riddle ids]
+        self.cache = OrderedDict()  # Riddle id -> riddle dict, least recently used first
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        with open(path, "rb") as bank_file:
+            offset = 0
+            for line in bank_file:
+                if line.strip():
+                    self.index(json.loads(line), offset)
+                offset += len(line)
+
+    def index(self, riddle, offset):
+        """Index one riddle's metadata."""
+        riddle_id = riddle["id"]
+        if riddle_id in self.offsets:
+            raise ValueError(f"Riddle {riddle_id} appears twice in {self.path}")
+        if not MIN_DIFFICULTY <= riddle["difficulty"] <= MAX_DIFFICULTY:
+            raise ValueError(f"Riddle {riddle_id} has an unknown difficulty")
+        self.offsets[riddle_id] = offset
+        self.by_key.setdefault((riddle["theme"], riddle["difficulty"]), []).append(riddle_id)
+
+    def riddle_ids(self, theme, difficulty):
+        """Get the ids of the riddles of a theme and difficulty."""
+        return self.by_key.get((theme, difficulty), [])
+
+    def get(self, riddle_id):
+        """Get a riddle's full text, reading it from the bank file if not cached."""
+        with self.lock:
+            riddle = self.cache.get(riddle_id)
+            if riddle is not None:
+                self.cache.move_to_end(riddle_id)
+                return riddle
+        with open(self.path, "rb") as bank_file:
+            bank_file.seek(self.offsets[riddle_id])
+            riddle = json.loads(bank_file.readline())
+        with self.lock:
+            self.cache[riddle_id] = riddle
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return riddle
+
+
+# Shared by every session
+RIDDLE_BANK = RiddleBank()
+
+
+def initial_rating(intelligence):
+    """Get a starting riddle rating from intelligence: 10 rates 1, 20 rates 3."""
+    return max(MIN_DIFFICULTY, min(MAX_DIFFICULTY, 1 + (intelligence - 10) / 5))
+
+
+def solve_chance(rating, difficulty):
+    """Get the expected chance of solving a riddle, Elo style, one level per factor of ten."""
+    return 1 / (1 + 10 ** (difficulty - rating))
+
+
+class RiddleSystem:
+    """The riddles a player has seen and how well they solve them.
+
+    Seen riddles are a bitset of riddle ids. The rating starts from
+    intelligence and moves towards the difficulties the player actually
+    solves, and each riddle is asked at the difficulty nearest the rating.
+    """
+
+    rating_step = 0.5
+
+    def __init__(self, systems, bank=RIDDLE_BANK):
+        self.systems = systems
+        self.bank = bank
+        self.seen = 0
+        self.rating = None  # Set from intelligence on the first riddle
+        self.asked = 0
+        self.solved = 0
+
+    def initialize(self):
+        """Start with no riddles seen."""
+        self.load_save_data(None)
+
+    def target_difficulty(self):
+        """Get the difficulty to ask next."""
+        if self.rating is None:
+            self.rating = initial_rating(self.systems.stats_system.player_stats["intelligence"])
+        return max(MIN_DIFFICULTY, min(MAX_DIFFICULTY, round(self.rating)))
+
+    def choose(self, theme, rng=random):
+        """Pick an unseen riddle of a theme at the player's level and mark it seen.
+
+        Falls back to the nearest difficulty with unseen riddles, and once a
+        theme is used up its riddles can be asked again.
+        """
+        target = self.target_difficulty()
+        difficulties = sorted(range(MIN_DIFFICULTY, MAX_DIFFICULTY + 1),
+                              key=lambda difficulty: (abs(difficulty - target), difficulty))
+        for difficulty in difficulties:
+            unseen = [riddle_id for riddle_id in self.bank.riddle_ids(theme, difficulty)
+                      if not self.seen >> riddle_id & 1]
+            if unseen:
+                riddle_id = rng.choice(unseen)
+                self.seen |= 1 << riddle_id
+                return self.bank.get(riddle_id)
+        theme_ids = [riddle_id for difficulty in difficulties for riddle_id in self.bank.riddle_ids(theme, difficulty)]
+        if not theme_ids:
+            raise ValueError(f"No riddles for the theme {theme}")
+        for riddle_id in theme_ids:
+            self.seen &= ~(1 << riddle_id)
+        return self.choose(theme, rng)
+
+    def record(self, riddle, solved):
+        """Record an answer, moving the rating by how surprising the result was."""
+        self.target_difficulty()
+        self.asked += 1
+        self.solved += bool(solved)
+        expected = solve_chance(self.rating, riddle["difficulty"])
+        self.rating = max(MIN_DIFFICULTY - 0.5, min(MAX_DIFFICULTY + 0.5,
+                                                    self.rating + self.rating_step * (solved - expected)))
+
+    def get_save_data(self):
+        """Get the riddle record for saving, with the seen bitset as hex."""
+        return {"seen": format(self.seen, "x"), "rating": self.rating,
+                "asked": self.asked, "solved": self.solved}
+
+    def load_save_data(self, data):
+        """Restore the riddle record from saved data."""
+        data = data or {}
+        self.seen = int(data.get("seen", "0"), 16)
+        self.rating = data.get("rating")
+        self.asked = data.get("asked", 0)
+        self.solved = data.get("solved", 0)
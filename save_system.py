@@ -8,29 +8,36 @@ import json
 import os
 from datetime import datetime
 
+from game_flags import GameState
+from metrics import metered_save
+from tracing import traced
+from world_map import START_LOCATION
+
 
 class SaveSystem:
     """Handle saving and loading game progress."""
     
     def __init__(self, game_engine):
         self.game = game_engine
-        self.save_directory = "saves"
-        self.ensure_save_directory()
+        self.save_directory = "saves"  # Created on the first save
         
     def ensure_save_directory(self):
         """Create saves directory if it doesn't exist."""
         if not os.path.exists(self.save_directory):
             os.makedirs(self.save_directory)
             
+    @metered_save("save")
+    @traced("save.save_game")
     def save_game(self, slot_name="quicksave"):
         """Save the current game state."""
         try:
+            self.ensure_save_directory()
             save_data = {
                 "timestamp": datetime.now().isoformat(),
                 "player_name": self.game.player_name,
                 "player_health": self.game.player_health,
                 "player_inventory": self.game.player_inventory,
-                "game_state": self.game.game_state,
+                "game_state": self.game.game_state.to_save_data(),
                 "version": "2.0"
             }
             
@@ -41,10 +48,19 @@ class SaveSystem:
                     "player_stats": systems.stats_system.player_stats,
                     "inventory_items": systems.inventory_system.items,
                     "known_spells": systems.magic_system.known_spells,
+                    "custom_spells": systems.magic_system.spell_database.overlay,
                     "companions": systems.companion_system.companions,
                     "achievements": list(systems.achievement_system.unlocked_achievements),
+                    "achievement_progress": systems.achievement_system.get_progress_data(),
                     "game_time": systems.time_system.game_time,
-                    "current_weather": systems.weather_system.current_weather
+                    "scheduled_events": systems.time_system.get_pending_events(),
+                    "active_effects": systems.effect_system.active_effects,
+                    "current_weather": systems.weather_system.current_weather,
+                    "location": systems.travel_system.location,
+                    "dungeon": systems.dungeon_system.get_save_data(),
+                    "equipment": systems.equipment_system.get_save_data(),
+                    "status": systems.player_status.get_save_data(),
+                    "riddles": systems.riddle_system.get_save_data()
                 })
             
             filename = f"{self.save_directory}/{slot_name}.json"
@@ -56,6 +72,8 @@ class SaveSystem:
         except Exception as e:
             return False, f"Failed to save game: {str(e)}"
             
+    @metered_save("load")
+    @traced("save.load_game")
     def load_game(self, slot_name="quicksave"):
         """Load a saved game state."""
         try:
@@ -71,18 +89,29 @@ class SaveSystem:
             self.game.player_name = save_data.get("player_name", "Adventurer")
             self.game.player_health = save_data.get("player_health", 100)
             self.game.player_inventory = save_data.get("player_inventory", [])
-            self.game.game_state = save_data.get("game_state", {})
+            self.game.game_state = GameState.from_save_data(save_data.get("game_state", {}))
             
             # Load enhanced systems data if available
             if hasattr(self.game, 'systems') and "player_stats" in save_data:
                 systems = self.game.systems
                 systems.stats_system.player_stats = save_data["player_stats"]
-                systems.inventory_system.items = save_data.get("inventory_items", {})
+                systems.inventory_system.load_items(save_data.get("inventory_items", {}))
+                systems.magic_system.spell_database.overlay = save_data.get("custom_spells", {})
                 systems.magic_system.known_spells = save_data.get("known_spells", ["heal"])
                 systems.companion_system.companions = save_data.get("companions", [])
                 systems.achievement_system.unlocked_achievements = set(save_data.get("achievements", []))
-                systems.time_system.game_time = save_data.get("game_time", 6)
+                systems.achievement_system.load_progress_data(save_data.get("achievement_progress", {}))
+                systems.time_system.set_time(save_data.get("game_time", 6))
+                systems.player_status.load_save_data(save_data.get("status"), systems.stats_system.player_stats)
+                systems.time_system.load_pending_events(save_data.get("scheduled_events", []))
+                systems.effect_system.active_effects = {
+                    name: tuple(expiry) for name, expiry in save_data.get("active_effects", {}).items()
+                }
                 systems.weather_system.current_weather = save_data.get("current_weather", "clear")
+                systems.travel_system.location = save_data.get("location", START_LOCATION)
+                systems.dungeon_system.load_save_data(save_data.get("dungeon"))
+                systems.equipment_system.load_save_data(save_data.get("equipment", []))
+                systems.riddle_system.load_save_data(save_data.get("riddles"))
             
             timestamp = save_data.get("timestamp", "Unknown")
             return True, f"Game loaded successfully from {slot_name}! (Saved: {timestamp[:19]})"
@@ -90,6 +119,7 @@ class SaveSystem:
         except Exception as e:
             return False, f"Failed to load game: {str(e)}"
             
+    @traced("save.list_saves")
     def list_saves(self):
         """List all available save files."""
         try:
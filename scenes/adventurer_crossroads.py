@@ -6,8 +6,9 @@ interact with their stories, learn from their experiences, and even compete
 in challenges.
 """
 
-import random
-import time
+from game_systems import GameEvent
+from metrics import metered_scene
+from tracing import traced
 
 
 class AdventurerCrossroadsScene:
@@ -19,7 +20,7 @@ class AdventurerCrossroadsScene:
             {
                 "name": "Lyra the Spellweaver",
                 "class": "Mage",
-                "level": random.randint(3, 8),
+                "level": self.game.rng.randint(3, 8),
                 "specialty": "Elemental Magic",
                 "story": "A master of fire and ice who seeks to balance opposing forces",
                 "challenge": "magical_duel",
@@ -28,7 +29,7 @@ class AdventurerCrossroadsScene:
             {
                 "name": "Thorne Ironshield",
                 "class": "Warrior",
-                "level": random.randint(4, 9),
+                "level": self.game.rng.randint(4, 9),
                 "specialty": "Combat Mastery",
                 "story": "A veteran warrior who has faced countless battles",
                 "challenge": "combat_trial",
@@ -37,7 +38,7 @@ class AdventurerCrossroadsScene:
             {
                 "name": "Whisper Shadowstep",
                 "class": "Rogue",
-                "level": random.randint(2, 7),
+                "level": self.game.rng.randint(2, 7),
                 "specialty": "Stealth & Agility",
                 "story": "A mysterious figure who moves like smoke through shadows",
                 "challenge": "stealth_test",
@@ -46,7 +47,7 @@ class AdventurerCrossroadsScene:
             {
                 "name": "Sage Moonwhisper",
                 "class": "Scholar",
-                "level": random.randint(5, 10),
+                "level": self.game.rng.randint(5, 10),
                 "specialty": "Ancient Knowledge",
                 "story": "A keeper of forgotten lore and ancient wisdom",
                 "challenge": "wisdom_trial",
@@ -55,7 +56,7 @@ class AdventurerCrossroadsScene:
             {
                 "name": "Lucky Goldleaf",
                 "class": "Treasure Hunter",
-                "level": random.randint(3, 6),
+                "level": self.game.rng.randint(3, 6),
                 "specialty": "Fortune & Discovery",
                 "story": "An adventurer blessed by fortune who finds treasure everywhere",
                 "challenge": "treasure_hunt",
@@ -63,9 +64,12 @@ class AdventurerCrossroadsScene:
             }
         ]
         
+    @metered_scene("adventurer_crossroads")
+    @traced("scene.adventurer_crossroads")
     def play(self):
         """Play the adventurer crossroads scene."""
         self.game.clear_screen()
+        self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="adventurer_crossroads")
         
         # Display crossroads ASCII art
         self.display_crossroads_art()
@@ -97,7 +101,7 @@ glory and discovery.
         print()
         
         # Select random adventurers to encounter
-        available_adventurers = random.sample(self.other_adventurers, 3)
+        available_adventurers = self.game.rng.sample(self.other_adventurers, 3)
         
         # Present choices
         print("┌─────────────────────────────────────────────────────────┐")
@@ -122,7 +126,7 @@ glory and discovery.
         # Get player choice
         while True:
             try:
-                choice = input(f"{self.game.player_name}, who do you approach? (1-4): ").strip()
+                choice = self.game.read_input(f"{self.game.player_name}, who do you approach? (1-4): ").strip()
                 
                 if choice == '1':
                     return self.interact_with_adventurer(available_adventurers[0], "friendly")
@@ -168,7 +172,7 @@ glory and discovery.
         self.game.clear_screen()
         
         print(f"👤 You approach {adventurer['name']}...")
-        time.sleep(1)
+        self.game.pause(1)
         
         # Display adventurer info
         print(f"\n{adventurer['name']} - Level {adventurer['level']} {adventurer['class']}")
@@ -250,7 +254,7 @@ share some of my luckiest discoveries with you!"
         print("└─────────────────────────────────────────────────────────┘")
         print()
         
-        choice = input("Your choice (1-3): ").strip()
+        choice = self.game.read_input("Your choice (1-3): ").strip()
         
         if choice == '1':
             # Experience gain
@@ -262,22 +266,10 @@ share some of my luckiest discoveries with you!"
             print("You gain valuable experience from their stories.")
             
         elif choice == '2':
-            # Item rewards
-            if adventurer['class'] == 'Mage':
-                items = ["magic_crystal", "wisdom_scroll"]
-            elif adventurer['class'] == 'Warrior':
-                items = ["healing_potion", "dragon_scale"]
-            elif adventurer['class'] == 'Rogue':
-                items = ["elven_cloak", "ancient_key"]
-            elif adventurer['class'] == 'Scholar':
-                items = ["wisdom_scroll", "fairy_dust"]
-            else:  # Treasure Hunter
-                items = ["healing_potion", "magic_crystal"]
-                
-            for item in items:
-                success, item_msg = self.game.systems.inventory_system.add_item(item)
-                if success:
-                    print(f"\n🎁 {item_msg}")
+            # Item rewards, from the loot table for the adventurer's class
+            loot_source = f"scene:adventurer_crossroads.gift.{adventurer['class']}"
+            for granted, item_msg in self.game.systems.loot_system.grant(loot_source):
+                print(f"\n🎁 {item_msg}" if granted else f"\n🎒 {item_msg}")
                     
         else:
             # Stat improvement
@@ -307,7 +299,7 @@ share some of my luckiest discoveries with you!"
                 print(f"\n🍀 {adventurer['name']} shares their fortune secrets!")
                 print("Luck +8!")
                 
-        input("\nPress Enter to continue...")
+        self.game.read_input("\nPress Enter to continue...")
         return f"befriended_{adventurer['class'].lower()}"
         
     def collaborative_interaction(self, adventurer):
@@ -342,13 +334,13 @@ either of us could alone!"
         """Collaborate on a magical ritual."""
         print("✨ Together, you attempt to perform an ancient magical ritual!")
         print("Your combined magical energies create something extraordinary...")
-        time.sleep(2)
+        self.game.pause(2)
         
         # Success based on intelligence
         intelligence = self.game.systems.stats_system.player_stats['intelligence']
         success_chance = min(0.9, 0.5 + (intelligence * 0.02))
         
-        if random.random() < success_chance:
+        if self.game.rng.random() < success_chance:
             print("\n🌟 SUCCESS! The ritual creates a powerful magical enhancement!")
             
             # Major magical benefits
@@ -379,9 +371,137 @@ either of us could alone!"
             print("🧠 You gain insight from the failed attempt!")
             print("💙 Your magical understanding still improves!")
             
-        input("\nPress Enter to continue...")
+        self.game.read_input("\nPress Enter to continue...")
         return "magical_collaboration"
         
+    def combat_collaboration(self, adventurer):
+        """Hold a pass together against a band of monsters."""
+        print(f"⚔️ You and {adventurer['name']} stand back to back as monsters close in!")
+        print("Steel rings out as you fight side by side...")
+        self.game.pause(2)
+        
+        # Success based on strength
+        stats = self.game.systems.stats_system.player_stats
+        success_chance = min(0.9, 0.5 + (stats['strength'] * 0.02))
+        
+        if self.game.rng.random() < success_chance:
+            print("\n🌟 SUCCESS! Not a single monster gets past you!")
+            
+            stats['strength'] += 6
+            stats['max_health'] += 25
+            stats['health'] = stats['max_health']
+            
+            print("💪 Fighting beside a veteran hardens your strikes!")
+            print("❤️ Your endurance grows with every blow you turn aside!")
+            
+            leveled_up, exp_msg = self.game.systems.stats_system.gain_experience(120)
+            print(f"⭐ {exp_msg}")
+            
+        else:
+            print(f"\n💥 The monsters break through, but {adventurer['name']} pulls you clear!")
+            
+            stats['strength'] += 2
+            stats['health'] = max(1, stats['health'] - 15)
+            
+            print("💪 You learn from every mistake in the melee!")
+            print("❤️ You lose 15 health in the retreat.")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "combat_collaboration"
+        
+    def stealth_collaboration(self, adventurer):
+        """Slip past a sleeping sentinel together."""
+        print(f"🌑 You follow {adventurer['name']} into the shadows around a slumbering sentinel...")
+        print("Every step must be silent...")
+        self.game.pause(2)
+        
+        # Success based on agility
+        stats = self.game.systems.stats_system.player_stats
+        success_chance = min(0.9, 0.5 + (stats['agility'] * 0.02))
+        
+        if self.game.rng.random() < success_chance:
+            print("\n🌟 SUCCESS! You reach the sentinel's hoard without a sound!")
+            
+            stats['agility'] += 6
+            stats['luck'] += 3
+            
+            print("🏃 Your footsteps become as quiet as a shadow's!")
+            print("🍀 Fortune favors the unseen!")
+            
+            for granted, item_msg in self.game.systems.loot_system.grant("scene:adventurer_crossroads.gift.Rogue"):
+                print(f"🎁 {item_msg}" if granted else f"🎒 {item_msg}")
+                
+        else:
+            print("\n💥 A loose stone clatters and the sentinel stirs - you both flee!")
+            
+            stats['agility'] += 2
+            
+            print("🏃 You learn how close a shadow must stay to the wall!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "stealth_collaboration"
+        
+    def research_collaboration(self, adventurer):
+        """Decipher a crumbling tablet together."""
+        print(f"📜 {adventurer['name']} unrolls a tablet covered in faded runes...")
+        print("Together you pore over the ancient script...")
+        self.game.pause(2)
+        
+        # Success based on intelligence
+        stats = self.game.systems.stats_system.player_stats
+        success_chance = min(0.9, 0.5 + (stats['intelligence'] * 0.02))
+        
+        if self.game.rng.random() < success_chance:
+            print("\n🌟 SUCCESS! The runes reveal a forgotten incantation!")
+            
+            stats['intelligence'] += 8
+            stats['max_mana'] += 15
+            
+            print("🧠 The tablet's lore settles into your mind!")
+            print("💙 Your magical capacity grows!")
+            
+            achievement_msg = self.game.systems.achievement_system.unlock_achievement("wise_one")
+            if achievement_msg:
+                print(f"\n{achievement_msg}")
+                
+        else:
+            print("\n💥 The tablet crumbles before you finish, but some runes stay with you!")
+            
+            stats['intelligence'] += 3
+            
+            print("🧠 You gain insight from the fragments!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "research_collaboration"
+        
+    def treasure_collaboration(self, adventurer):
+        """Follow a treasure map together."""
+        print(f"🗺️ {adventurer['name']} produces a tattered map with a glowing X...")
+        print("You set off together to find what it marks...")
+        self.game.pause(2)
+        
+        # Success based on luck
+        stats = self.game.systems.stats_system.player_stats
+        success_chance = min(0.9, 0.5 + (stats['luck'] * 0.02))
+        
+        if self.game.rng.random() < success_chance:
+            print("\n🌟 SUCCESS! You unearth a chest right where the map promised!")
+            
+            for granted, item_msg in self.game.systems.loot_system.grant("scene:adventurer_crossroads.treasure"):
+                print(f"🎁 {item_msg}" if granted else f"🎒 {item_msg}")
+                
+            stats['luck'] += 5
+            print("🍀 Your luck grows from the shared discovery!")
+            
+        else:
+            print("\n💥 The X marks only an empty hole - someone got here first!")
+            
+            stats['luck'] += 2
+            print("🍀 At least you learn to read a map's hidden signs!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "treasure_collaboration"
+        
     def challenge_interaction(self, adventurer):
         """Challenge an adventurer to a contest."""
         print(f"⚔️ You challenge {adventurer['name']} to a contest of skills!")
@@ -413,12 +533,12 @@ may the best adventurer win!"
         """Engage in a magical duel."""
         print("✨ The magical duel begins!")
         print("Spells fly through the air as you test your magical prowess!")
-        time.sleep(2)
+        self.game.pause(2)
         
         # Duel based on intelligence and mana
         player_power = (self.game.systems.stats_system.player_stats['intelligence'] + 
                        self.game.systems.stats_system.player_stats['mana'] // 5)
-        opponent_power = adventurer['level'] * 8 + random.randint(10, 30)
+        opponent_power = adventurer['level'] * 8 + self.game.rng.randint(10, 30)
         
         if player_power > opponent_power:
             print(f"\n🏆 Victory! You defeat {adventurer['name']} in magical combat!")
@@ -450,16 +570,106 @@ may the best adventurer win!"
             self.game.systems.stats_system.player_stats['intelligence'] += 3
             print("🧠 You gain insight from the challenge!")
             
-        input("\nPress Enter to continue...")
+        self.game.read_input("\nPress Enter to continue...")
         return "magical_duel_completed"
         
+    def contest(self, adventurer, stat, victory_text, defeat_text):
+        """Settle a contest of one stat against an adventurer; returns whether you won."""
+        player_power = self.game.systems.stats_system.player_stats[stat]
+        opponent_power = adventurer['level'] * 4 + self.game.rng.randint(5, 20)
+        
+        if player_power > opponent_power:
+            print(f"\n🏆 Victory! {victory_text}")
+            leveled_up, exp_msg = self.game.systems.stats_system.gain_experience(150)
+            print(f"⭐ {exp_msg}")
+            self.game.systems.stats_system.player_stats[stat] += 6
+            return True
+            
+        print(f"\n⚔️ {defeat_text}")
+        print("Though you don't win, you learn valuable lessons!")
+        leveled_up, exp_msg = self.game.systems.stats_system.gain_experience(75)
+        print(f"⭐ {exp_msg}")
+        self.game.systems.stats_system.player_stats[stat] += 3
+        return False
+        
+    def combat_trial(self, adventurer):
+        """Spar with a warrior."""
+        print("⚔️ The sparring match begins!")
+        print("Blades clash as you circle each other in the firelight!")
+        self.game.pause(2)
+        
+        if self.contest(adventurer, 'strength',
+                        f"You disarm {adventurer['name']} with a final blow!",
+                        f"{adventurer['name']} knocks the blade from your hand!"):
+            print("💪 Your combat prowess improves significantly!")
+        else:
+            print("💪 You gain strength from the challenge!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "combat_trial_completed"
+        
+    def stealth_test(self, adventurer):
+        """Race a rogue to steal a token unseen."""
+        print("🌑 The test begins: take the token from the campfire without being seen!")
+        print("You melt into the shadows...")
+        self.game.pause(2)
+        
+        if self.contest(adventurer, 'agility',
+                        f"You hold up the token before {adventurer['name']} even spots you!",
+                        f"{adventurer['name']} taps your shoulder from behind!"):
+            print("🏃 You move like smoke through the shadows!")
+        else:
+            print("🏃 You learn a few of the rogue's tricks!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "stealth_test_completed"
+        
+    def wisdom_trial(self, adventurer):
+        """Trade riddles with a scholar."""
+        print("📖 The trial of wisdom begins!")
+        print("Riddle answers riddle as the stars wheel overhead!")
+        self.game.pause(2)
+        
+        if self.contest(adventurer, 'intelligence',
+                        f"{adventurer['name']} cannot answer your final riddle!",
+                        f"{adventurer['name']} poses a riddle you cannot solve!"):
+            print("🧠 Your mind grows sharper than ever!")
+            achievement_msg = self.game.systems.achievement_system.unlock_achievement("wise_one")
+            if achievement_msg:
+                print(f"\n{achievement_msg}")
+        else:
+            print("🧠 You gain insight from the challenge!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "wisdom_trial_completed"
+        
+    def treasure_hunt_challenge(self, adventurer):
+        """Race a treasure hunter to a buried cache."""
+        print("🗺️ The race is on: first to find the buried cache keeps it!")
+        print("You dash off into the mists around the crossroads...")
+        self.game.pause(2)
+        
+        if self.contest(adventurer, 'luck',
+                        f"You strike the cache just as {adventurer['name']} arrives!",
+                        f"{adventurer['name']} holds up the cache with a grin!"):
+            for granted, item_msg in self.game.systems.loot_system.grant("scene:adventurer_crossroads.treasure"):
+                print(f"🎁 {item_msg}" if granted else f"🎒 {item_msg}")
+            achievement_msg = self.game.systems.achievement_system.unlock_achievement("treasure_hunter")
+            if achievement_msg:
+                print(f"\n{achievement_msg}")
+        else:
+            print("🍀 You learn where fortune likes to hide!")
+            
+        self.game.read_input("\nPress Enter to continue...")
+        return "treasure_hunt_completed"
+        
     def commune_with_spirit(self):
         """Commune with the crossroads spirit."""
         self.game.clear_screen()
         
         print("🔮 You approach the center of the crossroads...")
         print("A mystical spirit materializes before you...")
-        time.sleep(2)
+        self.game.pause(2)
         
         spirit_dialogue = f"""
 The Crossroads Spirit speaks in a voice like wind through ancient trees:
@@ -478,7 +688,7 @@ of every adventurer who has ever stood where you stand now."
         print()
         
         print("✨ The spirit channels the wisdom of all adventurers...")
-        time.sleep(2)
+        self.game.pause(2)
         
         # Massive benefits from collective wisdom
         stats = self.game.systems.stats_system.player_stats
@@ -511,11 +721,8 @@ of every adventurer who has ever stood where you stand now."
         print(f"⭐ {exp_msg}")
         
         # Add rare items
-        rare_items = ["shadow_gem", "dragon_scale", "fairy_dust"]
-        for item in rare_items:
-            success, item_msg = self.game.systems.inventory_system.add_item(item)
-            if success:
-                print(f"🎁 {item_msg}")
+        for granted, item_msg in self.game.systems.loot_system.grant("scene:adventurer_crossroads.legend"):
+            print(f"🎁 {item_msg}" if granted else f"🎒 {item_msg}")
                 
         # Unlock multiple achievements
         achievements_to_unlock = ["explorer", "wise_one", "collector"]
@@ -526,5 +733,5 @@ of every adventurer who has ever stood where you stand now."
                 
         print("\n🔮 The spirit fades, leaving you transformed by the encounter...")
         
-        input("\nPress Enter to continue...")
+        self.game.read_input("\nPress Enter to continue...")
         return "spirit_communion"
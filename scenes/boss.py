@@ -4,8 +4,31 @@ Boss Scene for Mystic Quest
 The climactic encounter with the Shadow Guardian - the final challenge.
 """
 
-import time
-import random
+from game_systems import GameEvent
+from story_rules import RuleSet
+from metrics import metered_scene
+from tracing import traced
+
+
+# Boss encounter routes, checked in priority order. Each rule names the
+# BossScene method that plays the route.
+BOSS_ENCOUNTER_RULES = RuleSet([
+    {"name": "peaceful_resolution", "priority": 10,
+     "any_flags": ["knows_peace_ritual", "saw_true_self", "knows_guardian_history"]},
+    {"name": "power_confrontation", "priority": 20,
+     "any_flags": ["has_fairy_blessing", "crystal_power", "passed_wolf_trial"]},
+    {"name": "wisdom_confrontation", "priority": 30,
+     "any_flags": ["has_fairy_wisdom", "studied_crystal", "knows_binding_spell"]},
+    {"name": "combat_encounter", "priority": 100}
+])
+
+# How a power confrontation ends, depending on which power was gained
+POWER_VICTORY_RULES = RuleSet([
+    {"name": "balanced_power_victory", "priority": 10, "values": {"crystal_power": "balanced"}},
+    {"name": "fairy_blessed_victory", "priority": 20, "all_flags": ["has_fairy_blessing"]},
+    {"name": "strength_victory", "priority": 30, "all_flags": ["passed_wolf_trial"]},
+    {"name": "power_struggle", "priority": 100}
+])
 
 
 class BossScene:
@@ -14,10 +37,15 @@ class BossScene:
     def __init__(self, game_engine):
         self.game = game_engine
         
+    @metered_scene("boss")
+    @traced("scene.boss")
     def play(self):
         """Play the boss scene and return the result."""
         self.game.clear_screen()
         
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="shadow_guardian_lair")
+            
         # Display boss ASCII art
         self.game.ascii_art.display_boss()
         
@@ -55,27 +83,14 @@ for centuries...
     def determine_boss_encounter(self):
         """Determine the type of boss encounter based on player's journey."""
         
-        # Check for peaceful resolution options first
-        if (self.game.game_state.get("knows_peace_ritual") or 
-            self.game.game_state.get("saw_true_self") or
-            self.game.game_state.get("knows_guardian_history")):
-            return self.peaceful_resolution()
-            
-        # Check for special powers or advantages
-        elif (self.game.game_state.get("has_fairy_blessing") or 
-              self.game.game_state.get("crystal_power") or
-              self.game.game_state.get("passed_wolf_trial")):
-            return self.power_confrontation()
-            
-        # Check for wisdom-based approaches
-        elif (self.game.game_state.get("has_fairy_wisdom") or
-              self.game.game_state.get("studied_crystal") or
-              self.game.game_state.get("knows_binding_spell")):
-            return self.wisdom_confrontation()
-            
-        # Default combat encounter
-        else:
-            return self.combat_encounter()
+        encounter = BOSS_ENCOUNTER_RULES.evaluate(self.game.game_state, self.player_stats())
+        return getattr(self, encounter)()
+        
+    def player_stats(self):
+        """Get the player stats the routing rules can check."""
+        if hasattr(self.game, 'systems'):
+            return self.game.systems.stats_system.player_stats
+        return {"health": self.game.player_health}
             
     def peaceful_resolution(self):
         """Handle peaceful resolution of the boss encounter."""
@@ -110,7 +125,7 @@ centuries, someone has spoken to it without fear or aggression.
         
         while True:
             try:
-                choice = input("What do you say to the Shadow Guardian? (1-3): ").strip()
+                choice = self.game.read_input("What do you say to the Shadow Guardian? (1-3): ").strip()
                 
                 if choice in ['1', '2', '3']:
                     return self.resolve_peacefully(choice)
@@ -192,7 +207,11 @@ an ancient wound and made the world a brighter place.
         """
         
         self.game.print_with_delay(final_resolution, 0.02)
-        time.sleep(2)
+        self.game.pause(2)
+        
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.CHOICE_MADE, choice="peaceful_resolution", tags=["peaceful"])
+            
         return "peaceful_victory"
         
     def power_confrontation(self):
@@ -217,14 +236,8 @@ form. The very air trembles with the clash of opposing forces!
         self.game.print_with_delay(power_story, 0.02)
         
         # Determine outcome based on specific powers
-        if self.game.game_state.get("crystal_power") == "balanced":
-            return self.balanced_power_victory()
-        elif self.game.game_state.get("has_fairy_blessing"):
-            return self.fairy_blessed_victory()
-        elif self.game.game_state.get("passed_wolf_trial"):
-            return self.strength_victory()
-        else:
-            return self.power_struggle()
+        victory = POWER_VICTORY_RULES.evaluate(self.game.game_state, self.player_stats())
+        return getattr(self, victory)()
             
     def balanced_power_victory(self):
         """Victory through balanced crystal power."""
@@ -246,7 +259,7 @@ You have achieved victory not through destruction, but through restoration!
         """
         
         self.game.print_with_delay(victory_text, 0.02)
-        time.sleep(2)
+        self.game.pause(2)
         return "power_victory"
         
     def fairy_blessed_victory(self):
@@ -267,7 +280,7 @@ life can grow. Victory through transformation!
         """
         
         self.game.print_with_delay(victory_text, 0.02)
-        time.sleep(2)
+        self.game.pause(2)
         return "nature_victory"
         
     def strength_victory(self):
@@ -288,9 +301,29 @@ Victory through proven worth and courage!
         """
         
         self.game.print_with_delay(victory_text, 0.02)
-        time.sleep(2)
+        self.game.pause(2)
         return "strength_victory"
         
+    def power_struggle(self):
+        """A costly victory with unbalanced crystal power."""
+        struggle_text = f"""
+🌀 THE UNBALANCED STORM 🌀
+
+{self.game.player_name}, the crystal power surges through you, wild and 
+untamed. It lashes out at the Guardian, but it tears at you as well, 
+and every blow you land costs you dearly.
+
+The Guardian staggers under the onslaught. "Such power... without 
+balance it will consume you as it consumed me..."
+
+With a final desperate surge you force the Guardian to its knees. 
+Victory is yours, though the storm within you has left its mark.
+        """
+        
+        self.game.print_with_delay(struggle_text, 0.02)
+        self.game.pause(2)
+        return "hard_victory"
+        
     def wisdom_confrontation(self):
         """Handle wisdom-based confrontation."""
         self.game.clear_screen()
@@ -324,7 +357,11 @@ Victory through enlightenment!
         """
         
         self.game.print_with_delay(wisdom_resolution, 0.02)
-        time.sleep(2)
+        self.game.pause(2)
+        
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.CHOICE_MADE, choice="wisdom_confrontation", tags=["wisdom"])
+            
         return "wisdom_victory"
         
     def combat_encounter(self):
@@ -345,26 +382,79 @@ to overcome even the greatest darkness.
         
         self.game.print_with_delay(combat_story, 0.02)
         
-        # Random combat outcome based on health and choices
-        if self.game.player_health >= 80:
+        # Fight with the combat engine when the enhanced systems exist,
+        # otherwise pick a random outcome based on health
+        if hasattr(self.game, 'systems'):
+            combat_result = self.fight_guardian()
+        elif self.game.player_health >= 80:
             combat_result = "victory"
         elif self.game.player_health >= 50:
-            combat_result = random.choice(["victory", "hard_victory"])
+            combat_result = self.game.rng.choice(["victory", "hard_victory"])
         else:
-            combat_result = random.choice(["hard_victory", "defeat"])
+            combat_result = self.game.rng.choice(["hard_victory", "defeat"])
             
         if combat_result == "victory":
             print(f"\n⚔️ {self.game.player_name} fights with incredible determination!")
             print("Through sheer courage and will, you overcome the Shadow Guardian!")
-            time.sleep(2)
+            self.game.pause(2)
             return "combat_victory"
         elif combat_result == "hard_victory":
             print(f"\n💪 {self.game.player_name} achieves victory, but at great cost...")
             print("You are wounded but victorious. Sometimes winning requires sacrifice.")
-            time.sleep(2)
+            self.game.pause(2)
             return "hard_victory"
         else:
             print(f"\n💀 Despite {self.game.player_name}'s best efforts, the Guardian proves too powerful...")
             print("But your courage has not gone unnoticed. Even in defeat, you have honor.")
-            time.sleep(2)
+            self.game.pause(2)
             return "honorable_defeat"
+            
+    def fight_guardian(self):
+        """Run a turn-based battle against the Shadow Guardian."""
+        guardian = {"name": "Shadow Guardian", "health": 160, "attack": 18, "agility": 9}
+        systems = self.game.systems
+        battle = systems.combat_system.start_battle(systems, guardian, log=print)
+        print(f"\n{systems.combat_system.start_combat(guardian)}")
+        
+        result = battle.run(self.choose_combat_action)
+        battle.apply_result(result)
+        
+        if result["winner"] != "player":
+            return "defeat"
+        if result["player_health"] * 2 >= self.game.systems.stats_system.player_stats["max_health"]:
+            return "victory"
+        return "hard_victory"
+        
+    def choose_combat_action(self, battle):
+        """Ask the player what to do on their turn."""
+        player = battle.player
+        enemy = battle.living("enemy")[0]
+        print()
+        print(f"❤️ {player['health']}/{player['max_health']} | 💙 {player['mana']}/{player['max_mana']}"
+              f" | {enemy['name']}: {max(0, enemy['health'])}/{enemy['max_health']}")
+        print("1. Attack  2. Cast Spell  3. Use Item")
+        
+        while True:
+            choice = self.game.read_input("Your action (1-3): ").strip()
+            if choice == '1':
+                return ("attack",)
+            elif choice == '2':
+                spells = self.game.systems.magic_system.known_spells
+                for i, spell_id in enumerate(spells, 1):
+                    spell = self.game.systems.magic_system.spell_database[spell_id]
+                    print(f"  {i}. {spell['name']} (Cost: {spell['cost']} mana)")
+                number = self.game.read_input(f"Spell number (1-{len(spells)}): ").strip()
+                if number.isdigit() and 1 <= int(number) <= len(spells):
+                    return ("spell", spells[int(number) - 1])
+                print("Invalid spell!")
+            elif choice == '3':
+                items = [item_id for item_id, quantity in battle.items.items() if quantity > 0]
+                for i, item_id in enumerate(items, 1):
+                    item = self.game.systems.inventory_system.item_database[item_id]
+                    print(f"  {i}. {item['name']} x{battle.items[item_id]}")
+                number = self.game.read_input(f"Item number (1-{len(items)}): ").strip()
+                if number.isdigit() and 1 <= int(number) <= len(items):
+                    return ("item", items[int(number) - 1])
+                print("Invalid item!")
+            else:
+                print("Please enter 1, 2, or 3.")
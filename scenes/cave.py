@@ -4,8 +4,9 @@ Cave Scene for Mystic Quest
 The mysterious crystal cave path with underground adventures and discoveries.
 """
 
-import time
-import random
+from game_systems import GameEvent
+from metrics import metered_scene
+from tracing import traced
 
 
 class CaveScene:
@@ -14,10 +15,15 @@ class CaveScene:
     def __init__(self, game_engine):
         self.game = game_engine
         
+    @metered_scene("cave")
+    @traced("scene.cave")
     def play(self):
         """Play the cave scene and return the result."""
         self.game.clear_screen()
         
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="crystal_cave")
+            
         # Display cave ASCII art
         self.game.ascii_art.display_cave()
         
@@ -65,7 +71,7 @@ mountain's heart...
         # Get player choice
         while True:
             try:
-                choice = input("Which passage through the cave calls to you? (1-3): ").strip()
+                choice = self.game.read_input("Which passage through the cave calls to you? (1-3): ").strip()
                 
                 if choice == '1':
                     return self.crystal_hall_encounter()
@@ -121,11 +127,11 @@ hollow space behind it, almost like a hidden passage...
         
         while True:
             try:
-                choice = input("What do you do with the crystal orb? (1-4): ").strip()
+                choice = self.game.read_input("What do you do with the crystal orb? (1-4): ").strip()
                 
                 if choice == '1':
                     # Random outcome - power can be dangerous
-                    power_outcome = random.choice(["overwhelming", "controlled", "corrupted"])
+                    power_outcome = self.game.rng.choice(["overwhelming", "controlled", "corrupted"])
                     
                     if power_outcome == "overwhelming":
                         self.game.player_inventory.append("Crystal Power")
@@ -133,7 +139,7 @@ hollow space behind it, almost like a hidden passage...
                         print(f"\n⚡ {self.game.player_name} grasps the crystal orb!")
                         print("Incredible energy surges through you! You feel invincible,")
                         print("but the power is almost too much to control...")
-                        time.sleep(2)
+                        self.game.pause(2)
                         return "boss"  # Powerful but unstable for boss fight
                         
                     elif power_outcome == "controlled":
@@ -142,7 +148,7 @@ hollow space behind it, almost like a hidden passage...
                         print(f"\n⚡ {self.game.player_name} carefully channels the crystal's energy!")
                         print("You feel the power flow through you in perfect harmony.")
                         print("Strength and wisdom unite within your spirit!")
-                        time.sleep(2)
+                        self.game.pause(2)
                         return "boss"  # Perfect balance for boss fight
                         
                     else:  # corrupted
@@ -150,7 +156,7 @@ hollow space behind it, almost like a hidden passage...
                         self.game.game_state["crystal_power"] = "corrupted"
                         print(f"\n💀 The crystal's power overwhelms {self.game.player_name}!")
                         print("Dark energy courses through you. You feel powerful but changed...")
-                        time.sleep(2)
+                        self.game.pause(2)
                         return "boss"  # Corrupted power for boss fight
                         
                 elif choice == '2':
@@ -159,7 +165,7 @@ hollow space behind it, almost like a hidden passage...
                     print(f"\n🔍 {self.game.player_name} studies the crystal's intricate patterns...")
                     print("You learn the secret of controlling crystal energy without being")
                     print("consumed by it. Knowledge proves more valuable than raw power.")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "boss"  # Wisdom advantage in boss fight
                     
                 elif choice == '3':
@@ -170,7 +176,7 @@ hollow space behind it, almost like a hidden passage...
                     print(f"\n🚫 {self.game.player_name} steps back from the crystal orb.")
                     print("'Some powers are too dangerous to wield,' you whisper.")
                     print("The crystals seem to approve of your restraint, glowing warmly.")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "peaceful"  # Wisdom leads to peaceful path
                     
                 else:
@@ -216,12 +222,12 @@ with wisdom, for what lies ahead will test more than your courage."
         
         while True:
             try:
-                choice = input("What do you do in the crystal passage? (1-3): ").strip()
+                choice = self.game.read_input("What do you do in the crystal passage? (1-3): ").strip()
                 
                 if choice == '1':
                     print(f"\n🚶 {self.game.player_name} follows the mysterious passage...")
                     print("The golden light grows brighter as you approach your destiny...")
-                    time.sleep(2)
+                    self.game.pause(2)
                     
                     # Enter treasure room with crystal guidance
                     self.game.game_state["found_via_crystals"] = True
@@ -240,7 +246,7 @@ with wisdom, for what lies ahead will test more than your courage."
                     print(f"\n🎵 {self.game.player_name} listens carefully to the crystal song...")
                     print("The harmonious tones fill you with peace and understanding.")
                     print("You feel attuned to the mountain's ancient wisdom.")
-                    time.sleep(2)
+                    self.game.pause(2)
                     
                     # Still go to treasure room but with special advantage
                     treasure_scene = TreasureScene(self.game)
@@ -254,7 +260,7 @@ with wisdom, for what lies ahead will test more than your courage."
                 elif choice == '3':
                     print(f"\n🔙 {self.game.player_name} returns to the Crystal Hall...")
                     print("Perhaps some mysteries are meant for another time.")
-                    time.sleep(1)
+                    self.game.pause(1)
                     # Return to original crystal hall choice
                     return self.crystal_hall_encounter()
                     
@@ -303,7 +309,7 @@ The choice of how to use this knowledge is yours alone."
         
         while True:
             try:
-                choice = input("What knowledge do you seek from the ancient symbols? (1-3): ").strip()
+                choice = self.game.read_input("What knowledge do you seek from the ancient symbols? (1-3): ").strip()
                 
                 if choice == '1':
                     self.game.player_inventory.append("Binding Spell")
@@ -311,7 +317,7 @@ The choice of how to use this knowledge is yours alone."
                     print(f"\n📖 {self.game.player_name} learns the ancient spell of binding!")
                     print("The words of power burn themselves into your memory.")
                     print("You now possess the ability to control magical forces!")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "boss"  # Magical advantage in boss fight
                     
                 elif choice == '2':
@@ -320,7 +326,7 @@ The choice of how to use this knowledge is yours alone."
                     print(f"\n💭 {self.game.player_name} learns the tragic tale of the Shadow Guardian...")
                     print("You discover that the guardian was once a protector who became")
                     print("corrupted by centuries of isolation. Understanding brings compassion.")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "boss"  # Empathy advantage in boss fight
                     
                 elif choice == '3':
@@ -329,7 +335,7 @@ The choice of how to use this knowledge is yours alone."
                     print(f"\n🕊️ {self.game.player_name} learns the sacred ritual of peaceful resolution...")
                     print("The ancient words teach you that some conflicts can be ended")
                     print("not through victory, but through understanding and compassion.")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "peaceful"  # Direct path to peaceful ending
                     
                 else:
@@ -378,7 +384,7 @@ discover about themselves."
         
         while True:
             try:
-                choice = input("How do you interact with the underground lake? (1-3): ").strip()
+                choice = self.game.read_input("How do you interact with the underground lake? (1-3): ").strip()
                 
                 if choice == '1':
                     self.game.game_state["visited_shrine"] = True
@@ -386,7 +392,7 @@ discover about themselves."
                     print(f"\n🚤 {self.game.player_name} crosses the mystical lake...")
                     print("At the shrine, you find an ancient blessing that fills you")
                     print("with courage and determination. You are ready for any challenge!")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "boss"  # Blessed for boss fight
                     
                 elif choice == '2':
@@ -396,7 +402,7 @@ discover about themselves."
                     print(f"\n💧 {self.game.player_name} drinks from the sacred waters...")
                     print("The water tastes like liquid starlight! All your wounds heal,")
                     print("and you feel purified in body and spirit.")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "boss"  # Fully healed for boss fight
                     
                 elif choice == '3':
@@ -405,7 +411,7 @@ discover about themselves."
                     print("In the water, you see not just your face, but your true self -")
                     print("your hopes, fears, and the strength that lies within.")
                     print("You realize that the greatest battles are won with wisdom, not force.")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "peaceful"  # Self-knowledge leads to peace
                     
                 else:
@@ -0,0 +1,115 @@
+"""
+Dungeon Scene for Mystic Quest
+==============================
+The Crystal Depths, a procedurally generated dungeon below the crystal cave
+that is different on every delve.
+"""
+
+from dungeon import ROOM_KINDS
+from game_systems import GameEvent
+from metrics import metered_scene
+from tracing import traced
+
+
+RETREAT_HEALTH = 25  # Percent of maximum health the player crawls out with after a defeat
+
+
+class DungeonScene:
+    """A delve through the generated floors of the Crystal Depths."""
+
+    def __init__(self, game_engine):
+        self.game = game_engine
+
+    @metered_scene("dungeon")
+    @traced("scene.dungeon")
+    def play(self):
+        """Play the dungeon scene and return the result."""
+        self.game.clear_screen()
+        systems = self.game.systems
+        systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="crystal_depths")
+        dungeon = systems.dungeon_system
+
+        if not dungeon.in_dungeon():
+            dungeon.enter()
+            self.game.print_with_delay(f"""
+{self.game.player_name}, a crack in the cave floor opens onto stairs that were
+not there yesterday. The Crystal Depths shift with every visit, and the
+miners say no two delves are ever the same...
+            """, 0.02)
+        else:
+            print(f"🕯️ You return to floor {dungeon.depth} of the Crystal Depths.")
+
+        while True:
+            floor = dungeon.floor()
+            print()
+            self.game.print_border('-', 60)
+            print(f"⛏️ Floor {dungeon.depth}, room {dungeon.room + 1} of {floor.room_count()}: "
+                  f"a {ROOM_KINDS[floor.kinds[dungeon.room]]}")
+
+            enemy = dungeon.encounter()
+            if enemy and not self.fight(enemy):
+                dungeon.leave()
+                stats = systems.stats_system.player_stats
+                stats["health"] = max(stats["health"], stats["max_health"] * RETREAT_HEALTH // 100)
+                print("\n💀 You crawl back to the surface, battered but alive.")
+                self.game.pause(2)
+                return "dungeon_defeated"
+
+            item_id = dungeon.room_loot()
+            if item_id:
+                success, message = systems.inventory_system.add_item(item_id)
+                if success:
+                    dungeon.take_loot()
+                    print(f"💰 You find treasure! {message}")
+                else:
+                    print(f"💰 You find treasure, but must leave it here: {message}")
+
+            exits = dungeon.exits()
+            options = [(f"Go to room {room + 1}", "move", room) for room in exits]
+            if dungeon.at_stairs():
+                options.append((f"Descend to floor {dungeon.depth + 1}", "descend", None))
+            options.append(("Climb back to the surface", "leave", None))
+            print()
+            for i, (label, _, _) in enumerate(options, 1):
+                print(f"{i}. {label}")
+
+            action, room = self.choose(options)
+            if action == "move":
+                dungeon.move(room)
+            elif action == "descend":
+                dungeon.descend()
+                print(f"\n🪜 You descend to floor {dungeon.depth}. The air grows colder...")
+            else:
+                deepest = dungeon.depth
+                dungeon.leave()
+                print(f"\n🌄 You climb back into daylight, having reached floor {deepest}.")
+                self.game.pause(2)
+                return "dungeon_explored"
+
+    def choose(self, options):
+        """Ask which option to take and return its (action, room)."""
+        while True:
+            try:
+                choice = int(self.game.read_input(f"\nWhat will you do? (1-{len(options)}): "))
+                if 1 <= choice <= len(options):
+                    return options[choice - 1][1:]
+                print("Invalid choice!")
+            except ValueError:
+                print("Please enter a valid number!")
+
+    def fight(self, enemy):
+        """Fight a room's encounter; returns True if the player won."""
+        systems = self.game.systems
+        print(f"\n{systems.combat_system.start_combat(enemy)}")
+        battle = systems.combat_system.start_battle(systems, enemy, log=print, rng=systems.rng)
+        result = battle.run()
+        battle.apply_result(result)
+        if result["winner"] != "player":
+            return False
+        systems.dungeon_system.defeat_encounter()
+        leveled_up, exp_msg = systems.stats_system.gain_experience(enemy["attack"] * 2)
+        print(exp_msg)
+        if systems.loot_system.has_table(f"enemy:{enemy['name']}"):
+            for granted, message in systems.loot_system.grant(f"enemy:{enemy['name']}"):
+                print(f"💰 The {enemy['name']} drops something! {message}")
+        return True
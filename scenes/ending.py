@@ -4,7 +4,46 @@ Ending Scene for Mystic Quest
 Multiple endings based on the player's choices and outcomes throughout the game.
 """
 
-import time
+from game_flags import FLAG_REGISTRY
+from story_rules import RuleSet
+from metrics import metered_scene
+from tracing import traced
+
+
+# Story flags shown as special achievements in the final statistics
+FINAL_STAT_FLAGS = [
+    (FLAG_REGISTRY.bit("has_fairy_blessing"), "  ✨ Blessed by the Fairies"),
+    (FLAG_REGISTRY.bit("passed_wolf_trial"), "  🐺 Passed the Wolf's Trial"),
+    (FLAG_REGISTRY.bit("crystal_power"), "  💎 Mastered Crystal Power"),
+    (FLAG_REGISTRY.bit("knows_guardian_history"), "  📚 Learned Ancient History"),
+    (FLAG_REGISTRY.bit("inner_peace"), "  🧘 Achieved Inner Peace"),
+    (FLAG_REGISTRY.bit("treasure_master"), "  🧩 Master of Ancient Riddles"),
+    (FLAG_REGISTRY.bit("found_secret_garden"), "  🌸 Discovered the Secret Garden"),
+    (FLAG_REGISTRY.bit("infinite_wisdom"), "  🔮 Gained Infinite Wisdom"),
+    (FLAG_REGISTRY.bit("has_destiny_compass"), "  🧭 Bearer of the Destiny Compass"),
+    (FLAG_REGISTRY.bit("knows_complete_history"), "  📖 Scholar of Ancient Lore")
+]
+
+
+# Endings by boss or side-quest outcome, checked in priority order. Each rule
+# names the EndingScene method that plays the ending.
+ENDING_RULES = RuleSet([
+    {"name": "peaceful_victory_ending", "priority": 10, "outcomes": ["peaceful_victory"]},
+    {"name": "power_victory_ending", "priority": 10, "outcomes": ["power_victory"]},
+    {"name": "nature_victory_ending", "priority": 10, "outcomes": ["nature_victory"]},
+    {"name": "strength_victory_ending", "priority": 10, "outcomes": ["strength_victory"]},
+    {"name": "wisdom_victory_ending", "priority": 10, "outcomes": ["wisdom_victory"]},
+    {"name": "combat_victory_ending", "priority": 10, "outcomes": ["combat_victory"]},
+    {"name": "hard_victory_ending", "priority": 10, "outcomes": ["hard_victory"]},
+    {"name": "honorable_defeat_ending", "priority": 10, "outcomes": ["honorable_defeat"]},
+    {"name": "peaceful_path_ending", "priority": 10, "outcomes": ["peaceful"]},
+    {"name": "restful_ending", "priority": 10, "outcomes": ["rest"]},
+    {"name": "treasure_master_ending", "priority": 10, "outcomes": ["treasure_master"]},
+    {"name": "secret_garden_ending", "priority": 10, "outcomes": ["secret_garden"]},
+    {"name": "ancient_knowledge_ending", "priority": 10, "outcomes": ["ancient_knowledge"]},
+    {"name": "wise_restraint_ending", "priority": 10, "outcomes": ["wise_restraint"]},
+    {"name": "default_ending", "priority": 1000}
+])
 
 
 class EndingScene:
@@ -13,41 +52,16 @@ class EndingScene:
     def __init__(self, game_engine):
         self.game = game_engine
         
+    @metered_scene("ending")
+    @traced("scene.ending")
     def play(self, outcome):
         """Play the appropriate ending based on the outcome."""
         self.game.clear_screen()
         
         # Route to appropriate ending
-        if outcome == "peaceful_victory":
-            self.peaceful_victory_ending()
-        elif outcome == "power_victory":
-            self.power_victory_ending()
-        elif outcome == "nature_victory":
-            self.nature_victory_ending()
-        elif outcome == "strength_victory":
-            self.strength_victory_ending()
-        elif outcome == "wisdom_victory":
-            self.wisdom_victory_ending()
-        elif outcome == "combat_victory":
-            self.combat_victory_ending()
-        elif outcome == "hard_victory":
-            self.hard_victory_ending()
-        elif outcome == "honorable_defeat":
-            self.honorable_defeat_ending()
-        elif outcome == "peaceful":
-            self.peaceful_path_ending()
-        elif outcome == "rest":
-            self.restful_ending()
-        elif outcome == "treasure_master":
-            self.treasure_master_ending()
-        elif outcome == "secret_garden":
-            self.secret_garden_ending()
-        elif outcome == "ancient_knowledge":
-            self.ancient_knowledge_ending()
-        elif outcome == "wise_restraint":
-            self.wise_restraint_ending()
-        else:
-            self.default_ending()
+        stats = self.game.systems.stats_system.player_stats if hasattr(self.game, 'systems') else {}
+        ending = ENDING_RULES.evaluate(self.game.game_state, stats, outcome)
+        getattr(self, ending)()
             
     def peaceful_victory_ending(self):
         """Ending for peaceful resolution of the boss fight."""
@@ -410,37 +424,12 @@ that every person's journey is unique and valuable.
         achievement_count = 0
         
         # Check for various achievements
-        if self.game.game_state.get("has_fairy_blessing"):
-            print("  ✨ Blessed by the Fairies")
-            achievement_count += 1
-        if self.game.game_state.get("passed_wolf_trial"):
-            print("  🐺 Passed the Wolf's Trial")
-            achievement_count += 1
-        if self.game.game_state.get("crystal_power"):
-            print("  💎 Mastered Crystal Power")
-            achievement_count += 1
-        if self.game.game_state.get("knows_guardian_history"):
-            print("  📚 Learned Ancient History")
-            achievement_count += 1
-        if self.game.game_state.get("inner_peace"):
-            print("  🧘 Achieved Inner Peace")
-            achievement_count += 1
-        if self.game.game_state.get("treasure_master"):
-            print("  🧩 Master of Ancient Riddles")
-            achievement_count += 1
-        if self.game.game_state.get("found_secret_garden"):
-            print("  🌸 Discovered the Secret Garden")
-            achievement_count += 1
-        if self.game.game_state.get("infinite_wisdom"):
-            print("  🔮 Gained Infinite Wisdom")
-            achievement_count += 1
-        if self.game.game_state.get("has_destiny_compass"):
-            print("  🧭 Bearer of the Destiny Compass")
-            achievement_count += 1
-        if self.game.game_state.get("knows_complete_history"):
-            print("  📖 Scholar of Ancient Lore")
-            achievement_count += 1
-            
+        flags = self.game.game_state.bits
+        for bit, label in FINAL_STAT_FLAGS:
+            if flags & bit:
+                print(label)
+                achievement_count += 1
+                
         if achievement_count == 0:
             print("  🌟 Forged Your Own Path")
             
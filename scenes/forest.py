@@ -4,8 +4,9 @@ Forest Scene for Mystic Quest
 The enchanted forest path with magical encounters and choices.
 """
 
-import time
-import random
+from game_systems import GameEvent
+from metrics import metered_scene
+from tracing import traced
 
 
 class ForestScene:
@@ -14,10 +15,15 @@ class ForestScene:
     def __init__(self, game_engine):
         self.game = game_engine
         
+    @metered_scene("forest")
+    @traced("scene.forest")
     def play(self):
         """Play the forest scene and return the result."""
         self.game.clear_screen()
         
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="enchanted_forest")
+            
         # Display forest ASCII art
         self.game.ascii_art.display_forest()
         
@@ -63,7 +69,7 @@ Suddenly, you come upon a clearing where three paths diverge...
         # Get player choice
         while True:
             try:
-                choice = input("Which path through the forest calls to you? (1-3): ").strip()
+                choice = self.game.read_input("Which path through the forest calls to you? (1-3): ").strip()
                 
                 if choice == '1':
                     return self.fairy_glade_encounter()
@@ -119,14 +125,14 @@ As she speaks, you notice something glinting behind an ancient oak tree...
         
         while True:
             try:
-                choice = input("What is your response to the fairy queen? (1-4): ").strip()
+                choice = self.game.read_input("What is your response to the fairy queen? (1-4): ").strip()
                 
                 if choice == '1':
                     self.game.player_inventory.append("Fairy Blessing")
                     self.game.game_state["has_fairy_blessing"] = True
                     print(f"\n✨ The fairies surround {self.game.player_name} with sparkling light!")
                     print("You feel magical energy flowing through your veins...")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "boss"  # Leads to boss encounter
                     
                 elif choice == '2':
@@ -134,7 +140,7 @@ As she speaks, you notice something glinting behind an ancient oak tree...
                     print(f"\n🧠 The fairy queen whispers ancient secrets to {self.game.player_name}...")
                     print("'Beware the Shadow Guardian, but remember - not all battles")
                     print("are won with strength alone. Sometimes, understanding is key.'")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "boss"  # Leads to boss encounter with wisdom
                     
                 elif choice == '3':
@@ -143,7 +149,7 @@ As she speaks, you notice something glinting behind an ancient oak tree...
                 elif choice == '4':
                     print(f"\n🙏 {self.game.player_name} bows respectfully to the fairy queen.")
                     print("'Your respect honors us, mortal. May fortune smile upon your path.'")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "peaceful"  # Peaceful ending
                     
                 else:
@@ -191,12 +197,12 @@ honor, brave {self.game.player_name}!"
         
         while True:
             try:
-                choice = input("What do you do with the mysterious key? (1-3): ").strip()
+                choice = self.game.read_input("What do you do with the mysterious key? (1-3): ").strip()
                 
                 if choice == '1':
                     print(f"\n🗝️ {self.game.player_name} uses the crystal key...")
                     print("The air shimmers and a doorway of pure light appears!")
-                    time.sleep(2)
+                    self.game.pause(2)
                     
                     # Enter treasure room
                     treasure_scene = TreasureScene(self.game)
@@ -215,7 +221,7 @@ honor, brave {self.game.player_name}!"
                     print("Her eyes fill with tears of joy: 'Such selflessness! You have")
                     print("given me the power to restore our ancient sanctuary. Take this")
                     print("blessing - it will serve you better than any treasure!'")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "boss"  # Special fairy blessing for boss
                     
                 elif choice == '3':
@@ -224,7 +230,7 @@ honor, brave {self.game.player_name}!"
                     print(f"\n💎 {self.game.player_name} carefully pockets the crystal key...")
                     print("'A wise choice,' the fairy queen nods. 'Some treasures are")
                     print("best saved for the right moment. The key will serve you well.'")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "boss"  # Key might be useful later
                     
                 else:
@@ -273,23 +279,23 @@ that sleeps within these stones?"
         
         while True:
             try:
-                choice = input("How do you respond to the spirit wolf? (1-3): ").strip()
+                choice = self.game.read_input("How do you respond to the spirit wolf? (1-3): ").strip()
                 
                 if choice == '1':
                     # Random trial outcome
-                    trial_success = random.choice([True, False])
+                    trial_success = self.game.rng.choice([True, False])
                     if trial_success:
                         self.game.player_inventory.append("Ancient Strength")
                         self.game.game_state["passed_wolf_trial"] = True
                         print(f"\n⚔️ {self.game.player_name} faces the trial with unwavering courage!")
                         print("The ancient stones glow, and you feel incredible strength flow through you!")
-                        time.sleep(2)
+                        self.game.pause(2)
                         return "boss"  # Strong for boss fight
                     else:
                         self.game.player_health -= 20
                         print(f"\n💔 The trial tests {self.game.player_name} harshly...")
                         print("You emerge wounded but wiser. Sometimes failure teaches us most.")
-                        time.sleep(2)
+                        self.game.pause(2)
                         return "boss"  # Weakened but still continues
                         
                 elif choice == '2':
@@ -298,13 +304,13 @@ that sleeps within these stones?"
                     print(f"\n🤝 {self.game.player_name} offers kindness instead of seeking power...")
                     print("The spirit wolf's eyes shine with gratitude. 'Your heart is pure.")
                     print("Take this blessing - it will serve you when darkness comes.'")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "boss"  # Special advantage in boss fight
                     
                 elif choice == '3':
                     print(f"\n🚶 {self.game.player_name} bows to the spirit wolf and departs.")
                     print("'Wisdom knows when to seek power and when to walk away.'")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "peaceful"  # Peaceful ending
                     
                 else:
@@ -351,14 +357,14 @@ The water shows you visions of possible futures...
         
         while True:
             try:
-                choice = input("What do you choose to do by the brook? (1-3): ").strip()
+                choice = self.game.read_input("What do you choose to do by the brook? (1-3): ").strip()
                 
                 if choice == '1':
                     self.game.game_state["saw_future_visions"] = True
                     print(f"\n🔮 {self.game.player_name} gazes into the mystical waters...")
                     print("You see glimpses of a great shadow that threatens the land,")
                     print("but also the light that can banish it. Knowledge is power.")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "boss"  # Goes to boss with foresight
                     
                 elif choice == '2':
@@ -366,7 +372,7 @@ The water shows you visions of possible futures...
                     self.game.player_health = min(100, self.game.player_health + 30)
                     print(f"\n🌺 {self.game.player_name} carefully gathers the magical blooms...")
                     print("The flowers pulse with healing energy. You feel refreshed and renewed!")
-                    time.sleep(2)
+                    self.game.pause(2)
                     return "boss"  # Goes to boss with healing items
                     
                 elif choice == '3':
@@ -374,7 +380,7 @@ The water shows you visions of possible futures...
                     print(f"\n💧 {self.game.player_name} drinks from the sacred brook...")
                     print("A profound sense of peace fills your soul. You understand that")
                     print("true strength comes from harmony, not conflict.")
-                    time.sleep(3)
+                    self.game.pause(3)
                     return "peaceful"  # Achieves peaceful ending
                     
                 else:
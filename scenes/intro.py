@@ -4,7 +4,8 @@ Intro Scene for Mystic Quest
 The opening scene where the adventure begins and the player makes their first choice.
 """
 
-import time
+from metrics import metered_scene
+from tracing import traced
 
 
 class IntroScene:
@@ -13,6 +14,8 @@ class IntroScene:
     def __init__(self, game_engine):
         self.game = game_engine
         
+    @metered_scene("intro")
+    @traced("scene.intro")
     def play(self):
         """Play the intro scene and return the player's choice."""
         self.game.clear_screen()
@@ -61,19 +64,19 @@ the thrill of adventure. Your journey begins now...
         # Get player choice
         while True:
             try:
-                choice = input(f"{self.game.player_name}, what is your choice? (1-3): ").strip()
+                choice = self.game.read_input(f"{self.game.player_name}, what is your choice? (1-3): ").strip()
                 
                 if choice == '1':
                     print(f"\n🌲 {self.game.player_name} steps into the Enchanted Forest...")
-                    time.sleep(1.5)
+                    self.game.pause(1.5)
                     return 1
                 elif choice == '2':
                     print(f"\n🕳️ {self.game.player_name} descends into the Crystal Cave...")
-                    time.sleep(1.5)
+                    self.game.pause(1.5)
                     return 2
                 elif choice == '3':
                     print(f"\n🏕️ {self.game.player_name} chooses the path of contemplation...")
-                    time.sleep(1.5)
+                    self.game.pause(1.5)
                     return 3
                 else:
                     print("Please enter 1, 2, or 3 to choose your path.")
@@ -4,8 +4,9 @@ Mystical Library Scene for Mystic Quest
 A magical library where knowledge and spells can be discovered.
 """
 
-import random
-import time
+from game_systems import GameEvent
+from metrics import metered_scene
+from tracing import traced
 
 
 class MysticalLibraryScene:
@@ -14,9 +15,12 @@ class MysticalLibraryScene:
     def __init__(self, game_engine):
         self.game = game_engine
         
+    @metered_scene("mystical_library")
+    @traced("scene.mystical_library")
     def play(self):
         """Play the mystical library scene."""
         self.game.clear_screen()
+        self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="mystical_library")
         
         # Display library ASCII art
         self.display_library_art()
@@ -62,7 +66,7 @@ that seem to whisper secrets of forgotten magic.
         # Get player choice
         while True:
             try:
-                choice = input(f"{self.game.player_name}, what do you choose? (1-3): ").strip()
+                choice = self.game.read_input(f"{self.game.player_name}, what do you choose? (1-3): ").strip()
                 
                 if choice == '1':
                     return self.study_tomes()
@@ -99,15 +103,15 @@ that seem to whisper secrets of forgotten magic.
         self.game.clear_screen()
         
         print("📚 You approach the floating tomes...")
-        time.sleep(1)
+        self.game.pause(1)
         
         # Random spell learning
-        available_spells = ["fireball", "shield", "insight", "teleport"]
+        available_spells = ["fireball", "shield", "insight", "teleport", "renew"]
         learned_spells = []
         
         for spell_id in available_spells:
             if spell_id not in self.game.systems.magic_system.known_spells:
-                if random.random() < 0.6:  # 60% chance to learn each spell
+                if self.game.rng.random() < 0.6:  # 60% chance to learn each spell
                     spell_msg = self.game.systems.magic_system.learn_spell(spell_id)
                     learned_spells.append(spell_msg)
                     
@@ -115,7 +119,7 @@ that seem to whisper secrets of forgotten magic.
             print("\n✨ The ancient knowledge flows into your mind!")
             for msg in learned_spells:
                 print(f"  {msg}")
-                time.sleep(1)
+                self.game.pause(1)
         else:
             print("\n📖 You study the tomes but find no new spells to learn.")
             print("However, you gain valuable magical knowledge!")
@@ -129,9 +133,8 @@ that seem to whisper secrets of forgotten magic.
         print("🧠 Your intelligence increases by 3!")
         
         # Add magical item
-        success, item_msg = self.game.systems.inventory_system.add_item("wisdom_scroll")
-        if success:
-            print(f"📜 {item_msg}")
+        for granted, item_msg in self.game.systems.loot_system.grant("scene:mystical_library.study_reward"):
+            print(f"📜 {item_msg}" if granted else f"🎒 {item_msg}")
             
         # Achievement check
         if len(learned_spells) >= 2:
@@ -139,7 +142,8 @@ that seem to whisper secrets of forgotten magic.
             if achievement_msg:
                 print(f"\n{achievement_msg}")
                 
-        input("\nPress Enter to continue...")
+        self.game.systems.event_bus.publish(GameEvent.CHOICE_MADE, choice="studied_tomes", tags=["wisdom"])
+        self.game.read_input("\nPress Enter to continue...")
         return "library_studied"
         
     def speak_with_owl(self):
@@ -147,7 +151,7 @@ that seem to whisper secrets of forgotten magic.
         self.game.clear_screen()
         
         print("🦉 You approach the majestic owl...")
-        time.sleep(1)
+        self.game.pause(1)
         
         owl_dialogue = f"""
 The owl's eyes gleam with ancient wisdom as it speaks in a voice like 
@@ -174,7 +178,7 @@ potential within you. Would you accept my guidance on your journey?"
         print("└─────────────────────────────────────────────────────────┘")
         print()
         
-        choice = input("Your response (1-3): ").strip()
+        choice = self.game.read_input("Your response (1-3): ").strip()
         
         if choice == '1':
             # Recruit owl companion
@@ -211,7 +215,7 @@ potential within you. Would you accept my guidance on your journey?"
             leveled_up, exp_msg = self.game.systems.stats_system.gain_experience(50)
             print(f"\n⭐ {exp_msg}")
             
-        input("\nPress Enter to continue...")
+        self.game.read_input("\nPress Enter to continue...")
         return "owl_encountered"
         
     def search_secrets(self):
@@ -219,7 +223,7 @@ potential within you. Would you accept my guidance on your journey?"
         self.game.clear_screen()
         
         print("🔍 You begin searching the library for hidden secrets...")
-        time.sleep(1)
+        self.game.pause(1)
         
         # Random discoveries
         discoveries = []
@@ -228,13 +232,13 @@ potential within you. Would you accept my guidance on your journey?"
         luck = self.game.systems.stats_system.player_stats["luck"]
         discovery_chance = min(0.8, 0.4 + (luck * 0.02))  # Higher luck = better chance
         
-        if random.random() < discovery_chance:
+        if self.game.rng.random() < discovery_chance:
             discoveries.append("secret_passage")
             
-        if random.random() < 0.6:
+        if self.game.rng.random() < 0.6:
             discoveries.append("hidden_tome")
             
-        if random.random() < 0.4:
+        if self.game.rng.random() < 0.4:
             discoveries.append("magical_artifact")
             
         if not discoveries:
@@ -252,13 +256,8 @@ potential within you. Would you accept my guidance on your journey?"
                     print("   It leads to a secret chamber filled with ancient treasures.")
                     
                     # Add rare items
-                    success, item_msg = self.game.systems.inventory_system.add_item("ancient_key")
-                    if success:
-                        print(f"   🗝️ {item_msg}")
-                        
-                    success, item_msg = self.game.systems.inventory_system.add_item("shadow_gem")
-                    if success:
-                        print(f"   💎 {item_msg}")
+                    for granted, item_msg in self.game.systems.loot_system.grant("scene:mystical_library.secret_chamber"):
+                        print(f"   💎 {item_msg}" if granted else f"   🎒 {item_msg}")
                         
                 elif discovery == "hidden_tome":
                     print("\n📖 You find a hidden tome of powerful magic!")
@@ -275,13 +274,8 @@ potential within you. Would you accept my guidance on your journey?"
                     print("\n🔮 You discover a powerful magical artifact!")
                     
                     # Add magical items
-                    success, item_msg = self.game.systems.inventory_system.add_item("magic_crystal")
-                    if success:
-                        print(f"   💎 {item_msg}")
-                        
-                    success, item_msg = self.game.systems.inventory_system.add_item("fairy_dust")
-                    if success:
-                        print(f"   ✨ {item_msg}")
+                    for granted, item_msg in self.game.systems.loot_system.grant("scene:mystical_library.artifact"):
+                        print(f"   ✨ {item_msg}" if granted else f"   🎒 {item_msg}")
                         
         # Gain experience
         exp_amount = 60 + (len(discoveries) * 20)
@@ -294,5 +288,5 @@ potential within you. Would you accept my guidance on your journey?"
             if achievement_msg:
                 print(f"\n{achievement_msg}")
                 
-        input("\nPress Enter to continue...")
+        self.game.read_input("\nPress Enter to continue...")
         return "secrets_discovered"
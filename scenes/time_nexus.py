@@ -5,8 +5,9 @@ A unique scene where players can experience different time periods and make
 choices that affect the past, present, and future.
 """
 
-import random
-import time
+from game_systems import GameEvent
+from metrics import metered_scene
+from tracing import traced
 
 
 class TimeNexusScene:
@@ -16,9 +17,12 @@ class TimeNexusScene:
         self.game = game_engine
         self.temporal_energy = 100
         
+    @metered_scene("time_nexus")
+    @traced("scene.time_nexus")
     def play(self):
         """Play the time nexus scene."""
         self.game.clear_screen()
+        self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="time_nexus")
         
         # Display time nexus ASCII art
         self.display_nexus_art()
@@ -70,7 +74,7 @@ ripple through the streams of time itself."
         # Get player choice
         while True:
             try:
-                choice = input(f"{self.game.player_name}, what temporal path do you choose? (1-4): ").strip()
+                choice = self.game.read_input(f"{self.game.player_name}, what temporal path do you choose? (1-4): ").strip()
                 
                 if choice == '1':
                     return self.journey_to_past()
@@ -112,17 +116,17 @@ ripple through the streams of time itself."
         self.game.clear_screen()
         
         print("⏪ The nexus swirls, pulling you backward through time...")
-        time.sleep(2)
+        self.game.pause(2)
         
         print("\n🐉 You emerge in the Age of Dragons!")
         print("The world is young, magic flows freely, and mighty dragons")
         print("soar through crystal-clear skies. Ancient civilizations")
         print("are just beginning to harness the primal forces of creation.")
         
-        time.sleep(2)
+        self.game.pause(2)
         
         # Ancient encounter
-        encounter = random.choice([
+        encounter = self.game.rng.choice([
             "dragon_meeting",
             "first_mage",
             "primordial_magic",
@@ -166,7 +170,7 @@ echo through the centuries."
         print("└─────────────────────────────────────────────────────────┘")
         print()
         
-        choice = input("Your choice (1-3): ").strip()
+        choice = self.game.read_input("Your choice (1-3): ").strip()
         
         if choice == '1':
             # Massive stat boost
@@ -213,12 +217,14 @@ echo through the centuries."
             print("🍀 Your luck increases dramatically from future knowledge!")
             
         # Dragon scale gift
-        success, item_msg = self.game.systems.inventory_system.add_item("dragon_scale")
-        if success:
-            print(f"\n🐉 {item_msg}")
-            print("This scale will protect you from the greatest dangers!")
-            
-        input("\nPress Enter to return to your time...")
+        for granted, item_msg in self.game.systems.loot_system.grant("scene:time_nexus.dragon_gift"):
+            if granted:
+                print(f"\n🐉 {item_msg}")
+                print("This scale will protect you from the greatest dangers!")
+            else:
+                print(f"\n🎒 {item_msg}")
+            
+        self.game.read_input("\nPress Enter to return to your time...")
         return "dragon_blessed"
         
     def meet_first_mage(self):
@@ -249,7 +255,7 @@ accelerate magical development by centuries!"
         print("└─────────────────────────────────────────────────────────┘")
         print()
         
-        choice = input("Your choice (1-3): ").strip()
+        choice = self.game.read_input("Your choice (1-3): ").strip()
         
         if choice == '1':
             print("\n🧙‍♂️ You share advanced magical techniques!")
@@ -303,20 +309,80 @@ accelerate magical development by centuries!"
             spell_msg = self.game.systems.magic_system.learn_spell("primal_force")
             print(f"⚡ {spell_msg}")
             
-        input("\nPress Enter to return to your time...")
+        self.game.read_input("\nPress Enter to return to your time...")
         return "first_mage_met"
         
+    def experience_primordial_magic(self):
+        """Bathe in the raw magic of the young world."""
+        print("\n🌋 You stumble into a valley where raw magic wells up from the earth!")
+        print("Rivers of light braid through the air, untouched by any spell.")
+        
+        print("\nYou open yourself to the primordial currents...")
+        self.game.pause(2)
+        
+        # The currents favor a trained mind
+        stats = self.game.systems.stats_system.player_stats
+        control_chance = min(0.9, 0.4 + (stats["intelligence"] * 0.02))
+        
+        if self.game.rng.random() < control_chance:
+            print("\n✨ You shape the raw magic and it flows into you!")
+            
+            stats["max_mana"] += 40
+            stats["mana"] = stats["max_mana"]
+            stats["intelligence"] += 10
+            print("💙 Your mana capacity increases by 40!")
+            print("🧠 Your intelligence increases by 10!")
+            
+            self.game.systems.magic_system.spell_database["primal_force"] = {
+                "name": "Primal Force", "cost": 5, "effect": "raw_magic", 
+                "description": "Channel raw magical energy"
+            }
+            spell_msg = self.game.systems.magic_system.learn_spell("primal_force")
+            print(f"⚡ {spell_msg}")
+            
+        else:
+            print("\n💥 The raw magic surges beyond your control and hurls you back!")
+            
+            stats["health"] = max(1, stats["health"] - 20)
+            stats["max_mana"] += 15
+            print("❤️ You lose 20 health, but some of the power lingers.")
+            print("💙 Your mana capacity increases by 15!")
+            
+        self.game.read_input("\nPress Enter to return to your time...")
+        return "primordial_magic_experienced"
+        
+    def discover_ancient_artifact(self):
+        """Find an artifact in the ruins of the first civilization."""
+        print("\n🏛️ You wander into the ruins of a city older than history!")
+        print("Half-buried among the stones, something glints with ancient power.")
+        
+        self.game.pause(2)
+        
+        print("\nYou brush away the dust of ages...")
+        for granted, item_msg in self.game.systems.loot_system.grant("scene:time_nexus.ancient_artifact"):
+            print(f"\n🏺 {item_msg}" if granted else f"\n🎒 {item_msg}")
+            
+        leveled_up, exp_msg = self.game.systems.stats_system.gain_experience(250)
+        print(f"\n⭐ {exp_msg}")
+        
+        achievement_msg = self.game.systems.achievement_system.unlock_achievement("treasure_hunter")
+        if achievement_msg:
+            print(f"\n{achievement_msg}")
+            
+        self.game.read_input("\nPress Enter to return to your time...")
+        return "artifact_discovered"
+        
     def glimpse_future(self):
         """Glimpse the distant future."""
         self.game.clear_screen()
         
         print("⏩ The nexus propels you forward through time...")
-        time.sleep(2)
+        self.game.pause(2)
         
         print("\n🌟 You witness a possible future!")
         
         # Random future scenarios
-        future_scenario = random.choice([
+        future_scenario = self.game.rng.choice([
             "utopian_future",
             "magical_renaissance", 
             "cosmic_adventure",
@@ -367,9 +433,8 @@ accelerate magical development by centuries!"
             print("\nYour future self gives you a cosmic artifact:")
             
             # Add cosmic items
-            success, item_msg = self.game.systems.inventory_system.add_item("shadow_gem")
-            if success:
-                print(f"🌌 {item_msg}")
+            for granted, item_msg in self.game.systems.loot_system.grant("scene:time_nexus.cosmic_artifact"):
+                print(f"🌌 {item_msg}" if granted else f"🎒 {item_msg}")
                 
             # Learn teleportation
             spell_msg = self.game.systems.magic_system.learn_spell("teleport")
@@ -400,7 +465,7 @@ accelerate magical development by centuries!"
                     self.game.systems.magic_system.learn_spell(spell_id)
             print("✨ You understand all forms of magic!")
             
-        input("\nPress Enter to return to your time...")
+        self.game.read_input("\nPress Enter to return to your time...")
         return "future_glimpsed"
         
     def alter_history(self):
@@ -408,7 +473,7 @@ accelerate magical development by centuries!"
         self.game.clear_screen()
         
         print("🔄 You focus on a moment from your own past...")
-        time.sleep(2)
+        self.game.pause(2)
         
         print("\nYou can change one decision from your adventure so far.")
         print("This will create a temporal paradox, but the nexus will stabilize it.")
@@ -421,12 +486,15 @@ accelerate magical development by centuries!"
         print("│  2. Make a better first impression (Boost charisma)     │")
         print("│  3. Study harder in the past (Gain extra experience)    │")
         print("│  4. Be more careful with resources (Restore items)      │")
+        print("│  5. Return to an earlier moment (Rewind time)           │")
         print("└─────────────────────────────────────────────────────────┘")
         print()
         
-        choice = input("Your alteration (1-4): ").strip()
+        choice = self.game.read_input("Your alteration (1-5): ").strip()
         
-        if choice == '1':
+        if choice == '5':
+            return self.rewind_history()
+        elif choice == '1':
             # Full heal
             stats = self.game.systems.stats_system.player_stats
             stats["health"] = stats["max_health"]
@@ -466,11 +534,8 @@ accelerate magical development by centuries!"
             print("\n⏰ You're more careful with your resources in the past!")
             
             # Add useful items
-            items_to_add = ["healing_potion", "magic_crystal", "fairy_dust"]
-            for item in items_to_add:
-                success, item_msg = self.game.systems.inventory_system.add_item(item)
-                if success:
-                    print(f"📦 {item_msg}")
+            for granted, item_msg in self.game.systems.loot_system.grant("scene:time_nexus.restored_supplies"):
+                print(f"📦 {item_msg}" if granted else f"🎒 {item_msg}")
                     
         # Temporal energy cost
         print("\n⚡ The temporal alteration drains some of your life force...")
@@ -483,7 +548,31 @@ accelerate magical development by centuries!"
         stats["mana"] = min(stats["max_mana"], stats["mana"] + 20)
         print("💙 But you gain temporal resistance! +20 max mana!")
         
-        input("\nPress Enter to stabilize the timeline...")
+        self.game.read_input("\nPress Enter to stabilize the timeline...")
+        return "history_altered"
+        
+    def rewind_history(self):
+        """Return the whole world to an earlier checkpoint."""
+        history = getattr(self.game, 'history', None)
+        moments = history.timeline()[-6:-1] if history else []
+        if not moments:
+            print("\n⏰ The threads of your past are too faint to follow.")
+            self.game.read_input("\nPress Enter to continue...")
+            return "history_unchanged"
+            
+        print("\n⏪ The moments of your journey shimmer before you:")
+        for index, snapshot in enumerate(reversed(moments), 1):
+            print(f"  {index}. {snapshot.label}")
+        choice = self.game.read_input(f"\nWhich moment do you return to? (1-{len(moments)}): ").strip()
+        if not choice.isdigit() or not 1 <= int(choice) <= len(moments):
+            print("\n⏰ You let the moment pass, and the present holds firm.")
+            self.game.read_input("\nPress Enter to continue...")
+            return "history_unchanged"
+            
+        snapshot = moments[-int(choice)]
+        history.restore(snapshot)
+        print(f"\n🔄 Time unravels... you stand once more at: {snapshot.label}")
+        self.game.read_input("\nPress Enter to stabilize the timeline...")
         return "history_altered"
         
     def absorb_temporal_energy(self):
@@ -492,13 +581,13 @@ accelerate magical development by centuries!"
         
         print("⚡ You reach out to absorb the raw temporal energy...")
         print("The power is intoxicating but dangerous!")
-        time.sleep(2)
+        self.game.pause(2)
         
         # Risk/reward scenario
         luck = self.game.systems.stats_system.player_stats["luck"]
         success_chance = min(0.8, 0.3 + (luck * 0.02))
         
-        if random.random() < success_chance:
+        if self.game.rng.random() < success_chance:
             print("\n✨ You successfully channel the temporal energy!")
             print("Power beyond imagination flows through you!")
             
@@ -545,5 +634,5 @@ accelerate magical development by centuries!"
             spell_msg = self.game.systems.magic_system.learn_spell("insight")
             print(f"✨ {spell_msg}")
             
-        input("\nPress Enter to leave the unstable nexus...")
+        self.game.read_input("\nPress Enter to leave the unstable nexus...")
         return "temporal_energy_absorbed"
@@ -4,8 +4,10 @@ Hidden Treasure Room Scene for Mystic Quest
 A secret chamber with riddles, puzzles, and ancient treasures.
 """
 
-import time
-import random
+from game_systems import GameEvent
+from metrics import metered_scene
+from riddles import RIDDLE_BANK, THEMES
+from tracing import traced
 
 
 class TreasureScene:
@@ -15,11 +17,17 @@ class TreasureScene:
         self.game = game_engine
         self.riddles_solved = 0
         self.max_riddles = 3
+        self.orb_marks = {"wisdom": "🔵", "courage": "🟡", "mystery": "🔴"}
         
+    @metered_scene("treasure")
+    @traced("scene.treasure")
     def play(self):
         """Play the treasure room scene and return the result."""
         self.game.clear_screen()
         
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.LOCATION_VISITED, location="treasure_chamber")
+            
         # Display treasure room discovery
         self.game.ascii_art.display_treasure()
         
@@ -69,7 +77,7 @@ correctly, and great rewards await. Choose poorly, and leave empty-handed."
         
         while True:
             try:
-                choice = input("What do you choose to do in the treasure chamber? (1-4): ").strip()
+                choice = self.game.read_input("What do you choose to do in the treasure chamber? (1-4): ").strip()
                 
                 if choice == '1':
                     return self.riddle_trial()
@@ -106,85 +114,51 @@ The first orb pulses with blue light, ready to present its riddle.
         
         self.game.print_with_delay(trial_intro, 0.02)
         
-        # Define riddles with multiple choice answers
-        riddles = [
-            {
-                "question": """
-🔵 RIDDLE OF WISDOM 🔵
-
-"I have cities, but no houses dwell within.
-I have mountains, but no trees therein.
-I have water, but no fish swim free.
-I have roads, but no travelers you'll see.
-What am I?"
-                """,
-                "options": ["1. A painting", "2. A map", "3. A dream", "4. A book"],
-                "correct": 2,
-                "explanation": "A map shows cities, mountains, water, and roads, but contains none of the living things themselves!"
-            },
-            {
-                "question": """
-🟡 RIDDLE OF COURAGE 🟡
-
-"The more you take away from me,
-The bigger and deeper I will be.
-I can be round, I can be square,
-But I'm always empty, that I declare.
-What am I?"
-                """,
-                "options": ["1. A hole", "2. A shadow", "3. A secret", "4. A wound"],
-                "correct": 1,
-                "explanation": "A hole gets bigger the more you dig out of it, and it's always empty space!"
-            },
-            {
-                "question": """
-🔴 RIDDLE OF MYSTERY 🔴
-
-"I speak without a mouth and hear without ears.
-I have no body, but come alive with fears.
-In mountains I boom, in caves I hide,
-By your voice I'm multiplied.
-What am I?"
-                """,
-                "options": ["1. A ghost", "2. An echo", "3. The wind", "4. A memory"],
-                "correct": 2,
-                "explanation": "An echo repeats your voice without having a mouth, and grows stronger in mountains and caves!"
-            }
-        ]
-        
-        # Present each riddle
-        for i, riddle in enumerate(riddles):
-            if not self.present_riddle(riddle, i + 1):
+        # Present each orb's riddle
+        for i, theme in enumerate(THEMES):
+            riddle = self.choose_riddle(theme)
+            solved = self.present_riddle(riddle, i + 1)
+            if hasattr(self.game, 'systems'):
+                self.game.systems.riddle_system.record(riddle, solved)
+            if not solved:
                 # Failed riddle - offer consolation prize
                 return self.partial_reward()
-            else:
-                self.riddles_solved += 1
+            self.riddles_solved += 1
                 
         # All riddles solved successfully
         return self.complete_victory()
         
+    def choose_riddle(self, theme):
+        """Choose an orb's riddle as it lights up, unseen and at the player's level when possible."""
+        if hasattr(self.game, 'systems'):
+            systems = self.game.systems
+            return systems.riddle_system.choose(theme, systems.rng)
+        return RIDDLE_BANK.get(self.game.rng.choice(RIDDLE_BANK.riddle_ids(theme, 2)))
+        
     def present_riddle(self, riddle, riddle_number):
         """Present a single riddle and get the player's answer."""
         print()
         self.game.print_border('-', 60)
+        mark = self.orb_marks[riddle["theme"]]
+        print(f"\n{mark} RIDDLE OF {riddle['theme'].upper()} {mark}\n")
         print(riddle["question"])
         print()
         
-        for option in riddle["options"]:
-            print(f"  {option}")
+        for number, option in enumerate(riddle["options"], 1):
+            print(f"  {number}. {option}")
         print()
         
         attempts = 2  # Give player 2 attempts per riddle
         
         for attempt in range(attempts):
             try:
-                answer = input(f"Your answer for riddle {riddle_number} (1-4): ").strip()
+                answer = self.game.read_input(f"Your answer for riddle {riddle_number} (1-4): ").strip()
                 
                 if answer in ['1', '2', '3', '4']:
                     if int(answer) == riddle["correct"]:
                         print(f"\n✅ Correct! {riddle['explanation']}")
                         print(f"The orb glows brilliantly and {self.game.player_name} feels wiser!")
-                        time.sleep(2)
+                        self.game.pause(2)
                         return True
                     else:
                         if attempt < attempts - 1:
@@ -192,7 +166,7 @@ What am I?"
                             print("Think carefully about the riddle's clues...")
                         else:
                             print(f"\n❌ Incorrect. The answer was {riddle['correct']}: {riddle['explanation']}")
-                            time.sleep(2)
+                            self.game.pause(2)
                             return False
                 else:
                     print("Please enter 1, 2, 3, or 4.")
@@ -245,7 +219,11 @@ wisely, for with great power comes great responsibility."
         self.game.game_state["has_master_key"] = True
         self.game.game_state["infinite_wisdom"] = True
         
-        time.sleep(3)
+        self.game.pause(3)
+        
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.CHOICE_MADE, choice="solved_all_riddles", tags=["treasure", "wisdom"])
+            
         return "treasure_master"
         
     def partial_reward(self):
@@ -281,7 +259,11 @@ TREASURES GAINED:
         self.game.player_health = min(100, self.game.player_health + 20)
         self.game.game_state["found_treasure"] = True
         
-        time.sleep(2)
+        self.game.pause(2)
+        
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.CHOICE_MADE, choice="partial_treasure", tags=["treasure"])
+            
         return "partial_treasure"
         
     def examine_chamber(self):
@@ -321,7 +303,7 @@ Your careful observation is rewarded! You discover:
         
         while True:
             try:
-                choice = input("What hidden discovery interests you most? (1-4): ").strip()
+                choice = self.game.read_input("What hidden discovery interests you most? (1-4): ").strip()
                 
                 if choice == '1':
                     return self.secret_garden()
@@ -369,7 +351,7 @@ GARDEN BLESSINGS RECEIVED:
         self.game.game_state["found_secret_garden"] = True
         self.game.game_state["inner_peace"] = True
         
-        time.sleep(2)
+        self.game.pause(2)
         return "secret_garden"
         
     def study_murals(self):
@@ -404,7 +386,7 @@ KNOWLEDGE GAINED:
         self.game.game_state["knows_secret_paths"] = True
         self.game.game_state["knows_prophecy"] = True
         
-        time.sleep(2)
+        self.game.pause(2)
         return "ancient_knowledge"
         
     def search_compartments(self):
@@ -445,7 +427,7 @@ ARTIFACTS ACQUIRED:
         self.game.game_state["can_pick_locks"] = True
         self.game.game_state["has_stealth"] = True
         
-        time.sleep(2)
+        self.game.pause(2)
         return "hidden_artifacts"
         
     def attempt_theft(self):
@@ -463,7 +445,7 @@ the chamber's magic responds to your intentions...
         self.game.print_with_delay(theft_text, 0.02)
         
         # Random outcome for theft attempt
-        theft_outcome = random.choice(["caught", "partial_success", "curse"])
+        theft_outcome = self.game.rng.choice(["caught", "partial_success", "curse"])
         
         if theft_outcome == "caught":
             caught_text = f"""
@@ -483,7 +465,7 @@ lesson about the nature of true treasure.
             
             self.game.print_with_delay(caught_text, 0.02)
             self.game.game_state["attempted_theft"] = True
-            time.sleep(2)
+            self.game.pause(2)
             return "theft_failed"
             
         elif theft_outcome == "partial_success":
@@ -504,7 +486,7 @@ GAINED: A few gold coins and a lesson in restraint.
             self.game.print_with_delay(partial_text, 0.02)
             self.game.player_inventory.append("Handful of Gold")
             self.game.game_state["minor_theft"] = True
-            time.sleep(2)
+            self.game.pause(2)
             return "minor_theft"
             
         else:  # curse
@@ -525,7 +507,7 @@ You feel the weight of the curse, but also the wisdom it brings.
             self.game.print_with_delay(curse_text, 0.02)
             self.game.player_health -= 10
             self.game.game_state["cursed_by_greed"] = True
-            time.sleep(2)
+            self.game.pause(2)
             return "cursed"
             
     def leave_chamber(self):
@@ -554,5 +536,9 @@ RECEIVED: Destiny Compass - "It points not to treasure, but to purpose."
         self.game.game_state["showed_restraint"] = True
         self.game.game_state["has_destiny_compass"] = True
         
-        time.sleep(2)
+        self.game.pause(2)
+        
+        if hasattr(self.game, 'systems'):
+            self.game.systems.event_bus.publish(GameEvent.CHOICE_MADE, choice="showed_restraint", tags=["wisdom", "peaceful"])
+            
         return "wise_restraint"
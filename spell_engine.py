@@ -0,0 +1,200 @@
+"""
+Spell Engine for Mystic Quest
+=============================
+Status effects with durations, stacking rules and damage or healing over
+time, and spell cooldowns, all counted in ticks of a TickScheduler.
+
+The same scheduler runs on game hours, advanced by the TimeSystem, and on
+battle rounds, advanced by a battle's initiative clock. Each entity keeps
+its effects in one small table along with the net health change per tick
+of everything on it, so a tick adds one number per affected entity however
+many stacks it carries. Only effects that actually run out are visited,
+popped from a heap of expiry ticks.
+"""
+
+import heapq
+
+
+# Status -> (health change per tick for each stack, max stacks, stacking rule).
+# "refresh" keeps one stack and the longer duration, "stack" adds stacks up
+# to the max and keeps the longer duration, "extend" adds the new duration
+# to what is left.
+STATUS_EFFECTS = {
+    "burning": (-4, 3, "stack"),
+    "poisoned": (-3, 5, "stack"),
+    "regenerating": (5, 1, "extend"),
+    "shielded": (0, 1, "refresh"),
+    "weakened": (0, 1, "refresh"),
+    "frozen": (0, 1, "refresh")
+}
+
+
+class StatusEffects:
+    """The active status effects and spell cooldowns of one entity.
+
+    ``owner`` is the dict whose "health", capped at "max_health", the
+    effects change. ``active`` maps status -> [stacks, expiry tick,
+    sequence], and ``cooldowns`` maps spell id -> tick it is ready again.
+    """
+
+    def __init__(self, scheduler, owner):
+        self.scheduler = scheduler
+        self.owner = owner
+        self.active = {}
+        self.cooldowns = {}
+        self.health_per_tick = 0
+
+    def __contains__(self, name):
+        return name in self.active
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def __len__(self):
+        return len(self.active)
+
+    def stacks(self, name):
+        """Get the stacks of a status, or 0 if it is not active."""
+        return self.active[name][0] if name in self.active else 0
+
+    def remaining(self, name):
+        """Get the ticks left on a status, or 0 if it is not active."""
+        return self.active[name][1] - self.scheduler.now if name in self.active else 0
+
+    def apply(self, name, duration, stacks=1):
+        """Apply a status for a number of ticks by its stacking rule; returns a message."""
+        return self.scheduler.apply(self, name, duration, stacks)
+
+    def remove(self, name):
+        """End a status early."""
+        self.scheduler.remove(self, name)
+
+    def clear(self):
+        """End every status and cooldown."""
+        for name in list(self.active):
+            self.remove(name)
+        self.cooldowns = {}
+
+    def ready(self, spell_id):
+        """Check whether a spell is off cooldown."""
+        return self.cooldowns.get(spell_id, 0) <= self.scheduler.now
+
+    def cooldown_left(self, spell_id):
+        """Get the ticks until a spell is ready again."""
+        return max(0, self.cooldowns.get(spell_id, 0) - self.scheduler.now)
+
+    def start_cooldown(self, spell_id, ticks):
+        """Put a spell on cooldown for a number of ticks."""
+        if ticks > 0:
+            self.cooldowns[spell_id] = self.scheduler.now + ticks
+
+    def get_save_data(self):
+        """Get the statuses and cooldowns still running, with absolute ticks."""
+        now = self.scheduler.now
+        return {
+            "effects": {name: [stacks, expires] for name, (stacks, expires, _) in self.active.items()},
+            "cooldowns": {spell_id: ready for spell_id, ready in self.cooldowns.items() if ready > now}
+        }
+
+    def load_save_data(self, data, owner):
+        """Restore statuses and cooldowns onto an owner, after the scheduler's clock is set."""
+        self.clear()
+        self.owner = owner
+        data = data or {}
+        for name, (stacks, expires) in data.get("effects", {}).items():
+            if expires > self.scheduler.now:
+                self.scheduler.apply(self, name, expires - self.scheduler.now, stacks)
+        self.cooldowns = dict(data.get("cooldowns", {}))
+
+
+class TickScheduler:
+    """A clock of whole ticks that runs status effects on many entities.
+
+    A status applied for n ticks acts on each of the next n ticks and ends
+    on the last of them.
+    """
+
+    def __init__(self, now=0):
+        self.now = now
+        self.expiries = []  # Heap of (expiry tick, sequence, StatusEffects, status)
+        self.ticking = set()  # StatusEffects whose health changes every tick
+        self.sequence = 0
+
+    def reset(self, now=0):
+        """Set the clock, forgetting every scheduled expiry."""
+        self.now = now
+        self.expiries = []
+        self.ticking = set()
+
+    def adjust_health_per_tick(self, effects, change):
+        """Change an entity's net health per tick, tracking which entities tick."""
+        effects.health_per_tick += change
+        if effects.health_per_tick:
+            self.ticking.add(effects)
+        else:
+            self.ticking.discard(effects)
+
+    def apply(self, effects, name, duration, stacks=1):
+        """Apply a status to an entity; see StatusEffects.apply."""
+        if name not in STATUS_EFFECTS:
+            raise ValueError(f"Unknown status effect: {name}")
+        if duration < 1:
+            raise ValueError("A status effect must last at least one tick")
+        change, max_stacks, rule = STATUS_EFFECTS[name]
+        current = effects.active.get(name)
+        old_stacks, old_expiry = (current[0], current[1]) if current else (0, self.now)
+        if rule == "stack":
+            new_stacks = min(max_stacks, old_stacks + stacks)
+        else:
+            new_stacks = min(max_stacks, stacks)
+        if rule == "extend":
+            expires = old_expiry + duration
+        else:
+            expires = max(old_expiry, self.now + duration)
+
+        self.sequence += 1
+        effects.active[name] = [new_stacks, expires, self.sequence]
+        heapq.heappush(self.expiries, (expires, self.sequence, effects, name))
+        if change and new_stacks != old_stacks:
+            self.adjust_health_per_tick(effects, change * (new_stacks - old_stacks))
+        stack_text = f" x{new_stacks}" if new_stacks > 1 else ""
+        return f"{effects.owner.get('name', 'You')} is {name}{stack_text} for {expires - self.now} turn(s)!"
+
+    def remove(self, effects, name):
+        """End a status; its heap entry is skipped when it comes up."""
+        current = effects.active.pop(name, None)
+        if current and STATUS_EFFECTS[name][0]:
+            self.adjust_health_per_tick(effects, -STATUS_EFFECTS[name][0] * current[0])
+
+    def advance_to(self, tick):
+        """Advance the clock, applying health over time and ending expired statuses.
+
+        Runs in segments between expiries, so a long jump costs one update
+        per ticking entity per segment rather than per tick. Health stays
+        between 0 and max_health, and owners already at 0 health are left
+        alone. Returns (changes, expired): the total health change of each
+        entity, as {StatusEffects: change}, and the [(StatusEffects,
+        status)] that ended.
+        """
+        changes = {}
+        expired = []
+        expiries = self.expiries
+        while self.now < tick:
+            until = min(tick, expiries[0][0]) if expiries else tick
+            until = max(until, self.now + 1)
+            elapsed = until - self.now
+            for effects in self.ticking:
+                owner = effects.owner
+                if owner["health"] <= 0:
+                    continue
+                old_health = owner["health"]
+                owner["health"] = max(0, min(owner["max_health"], old_health + effects.health_per_tick * elapsed))
+                changes[effects] = changes.get(effects, 0) + owner["health"] - old_health
+            self.now = until
+            while expiries and expiries[0][0] <= until:
+                _, sequence, effects, name = heapq.heappop(expiries)
+                current = effects.active.get(name)
+                if current and current[2] == sequence:
+                    self.remove(effects, name)
+                    expired.append((effects, name))
+        return changes, expired
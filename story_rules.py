@@ -0,0 +1,211 @@
+"""
+Story Routing Rules for Mystic Quest
+====================================
+Declarative condition rules for choosing boss encounters and endings. Rule
+tables are compiled once into flag masks so the live game and batch
+simulations pick a route in a single pass, and a static checker reports
+rules that can never fire or that overlap with others.
+
+A rule is a dict with a "name" (the route it selects) and a "priority"
+(lower runs first), plus any of these conditions:
+
+    any_flags   - at least one of these flags is set
+    all_flags   - every one of these flags is set
+    none_flags  - none of these flags is set
+    values      - flags holding exactly these non-boolean values
+    min_stats   - player stats at or above these values
+    max_stats   - player stats at or below these values
+    outcomes    - the outcome string being routed is one of these
+"""
+
+import sys
+
+from game_flags import FLAG_REGISTRY
+
+
+class RuleSet:
+    """A compiled, priority-ordered table of routing rules."""
+    
+    def __init__(self, rules, registry=FLAG_REGISTRY):
+        self.registry = registry
+        self.rules = sorted(rules, key=lambda rule: rule["priority"])
+        self.compiled = [self.compile_rule(rule) for rule in self.rules]
+        
+        # Rules with an outcome condition only ever run for those outcomes,
+        # so each outcome gets its own pre-merged, priority-ordered bucket
+        self.general_rules = [compiled for compiled in self.compiled if compiled[7] is None]
+        self.outcome_buckets = {}
+        for compiled in self.compiled:
+            for outcome in compiled[7] or ():
+                self.outcome_buckets.setdefault(outcome, [])
+        for outcome, bucket in self.outcome_buckets.items():
+            bucket.extend(compiled for compiled in self.compiled
+                          if compiled[7] is None or outcome in compiled[7])
+        
+    def compile_rule(self, rule):
+        """Turn a rule dict into a tuple of masks and bounds."""
+        mask = self.registry.mask
+        outcomes = rule.get("outcomes")
+        return (
+            mask(*rule.get("any_flags", ())),
+            mask(*rule.get("all_flags", ())),
+            mask(*rule.get("none_flags", ())),
+            tuple(rule.get("values", {}).items()),
+            tuple(rule.get("min_stats", {}).items()),
+            tuple(rule.get("max_stats", {}).items()),
+            rule["name"],
+            frozenset(outcomes) if outcomes is not None else None
+        )
+        
+    def evaluate(self, game_state, stats=None, outcome=None):
+        """Get the name of the first rule matching the state, or None."""
+        return self.evaluate_bits(game_state.bits, game_state.values, stats or {}, outcome)
+        
+    def evaluate_bits(self, bits, values, stats, outcome=None):
+        """Evaluate against a raw flag bitset, for batch simulation."""
+        bucket = self.outcome_buckets.get(outcome, self.general_rules)
+        for any_mask, all_mask, none_mask, rule_values, min_stats, max_stats, name, _ in bucket:
+            if any_mask and not bits & any_mask:
+                continue
+            if bits & all_mask != all_mask or bits & none_mask:
+                continue
+            if rule_values and any(values.get(flag) != value for flag, value in rule_values):
+                continue
+            if min_stats and any(stats.get(stat, 0) < bound for stat, bound in min_stats):
+                continue
+            if max_stats and any(stats.get(stat, 0) > bound for stat, bound in max_stats):
+                continue
+            return name
+        return None
+        
+    def evaluate_many(self, states, outcome=None):
+        """Evaluate a batch of (bits, values, stats) states."""
+        evaluate_bits = self.evaluate_bits
+        return [evaluate_bits(bits, values, stats, outcome) for bits, values, stats in states]
+        
+    def check(self):
+        """Statically check the table for unreachable and overlapping rules.
+        
+        Returns a list of (kind, message) tuples, where kind is
+        "unreachable", "ambiguous" (overlapping rules with equal priority)
+        or "overlap" (overlapping rules resolved by priority).
+        """
+        problems = []
+        for index, rule in enumerate(self.compiled):
+            name = rule[6]
+            if not self.satisfiable(rule):
+                problems.append(("unreachable", f"{name}: its conditions contradict each other"))
+                continue
+            for earlier_index in range(index):
+                earlier = self.compiled[earlier_index]
+                if self.rules[earlier_index]["priority"] < self.rules[index]["priority"] and self.covers(earlier, rule):
+                    problems.append(("unreachable", f"{name}: always preceded by {earlier[6]}"))
+                    break
+            else:
+                if self.is_default(rule):
+                    # A catch-all rule overlapping everything is its purpose
+                    continue
+                for earlier_index in range(index):
+                    earlier = self.compiled[earlier_index]
+                    if not self.satisfiable(self.combine(earlier, rule)):
+                        continue
+                    if self.rules[earlier_index]["priority"] == self.rules[index]["priority"]:
+                        problems.append(("ambiguous", f"{name} and {earlier[6]} can both match at equal priority"))
+                    elif not self.is_default(earlier):
+                        problems.append(("overlap", f"{name} overlaps {earlier[6]}, which takes priority"))
+        return problems
+        
+    def is_default(self, rule):
+        """Check whether a compiled rule has no conditions at all."""
+        return not any(rule[:6]) and rule[7] is None
+        
+    def satisfiable(self, rule):
+        """Check whether some state could match a compiled rule."""
+        any_mask, all_mask, none_mask, values, min_stats, max_stats, name, outcomes = rule
+        if all_mask & none_mask:
+            return False
+        # Flags are independent, so each any-mask only needs a flag that may be set
+        if any(not mask & ~none_mask for mask in any_masks(any_mask)):
+            return False
+        seen_values = {}
+        for flag, value in values:
+            if seen_values.setdefault(flag, value) != value:
+                return False
+            if not value and all_mask & self.registry.bit(flag):
+                return False
+            if value and none_mask & self.registry.bit(flag):
+                return False
+        lower = {}
+        for stat, bound in min_stats:
+            lower[stat] = max(bound, lower.get(stat, bound))
+        for stat, bound in max_stats:
+            if bound < lower.get(stat, bound):
+                return False
+        return outcomes is None or bool(outcomes)
+        
+    def combine(self, first, second):
+        """Conjoin two compiled rules into one, for overlap checks.
+        
+        The combined rule keeps the any-masks of both as a tuple, since
+        needing one flag of each is not the same as any single mask.
+        """
+        if first[7] is None:
+            outcomes = second[7]
+        elif second[7] is None:
+            outcomes = first[7]
+        else:
+            outcomes = first[7] & second[7]
+        return (any_masks(first[0]) + any_masks(second[0]), first[1] | second[1], first[2] | second[2],
+                first[3] + second[3], first[4] + second[4], first[5] + second[5],
+                f"{first[6]}+{second[6]}", outcomes)
+        
+    def covers(self, earlier, rule):
+        """Check whether every state matching rule also matches earlier."""
+        e_any, e_all, e_none, e_values, e_min, e_max, _, e_outcomes = earlier
+        r_any, r_all, r_none, r_values, r_min, r_max, _, r_outcomes = rule
+        if e_outcomes is not None and (r_outcomes is None or not r_outcomes <= e_outcomes):
+            return False
+        if e_all & ~r_all or e_none & ~r_none:
+            return False
+        if e_any and not (r_all & e_any or (r_any and not r_any & ~e_any)):
+            return False
+        if not set(e_values) <= set(r_values):
+            return False
+        r_lower = dict(r_min)
+        if any(r_lower.get(stat, float("-inf")) < bound for stat, bound in e_min):
+            return False
+        r_upper = dict(r_max)
+        if any(r_upper.get(stat, float("inf")) > bound for stat, bound in e_max):
+            return False
+        return True
+
+
+def any_masks(any_mask):
+    """Get the any-masks of a compiled rule as a tuple; combined rules hold several."""
+    if isinstance(any_mask, tuple):
+        return any_mask
+    return (any_mask,) if any_mask else ()
+
+
+def check_rule_tables(tables):
+    """Check named rule tables and print a report. Returns the problem count."""
+    problem_count = 0
+    for table_name, rule_set in tables.items():
+        problems = rule_set.check()
+        print(f"{table_name}: {len(rule_set.rules)} rules, {len(problems)} findings")
+        for kind, message in problems:
+            print(f"  [{kind}] {message}")
+            if kind != "overlap":
+                problem_count += 1
+    return problem_count
+
+
+if __name__ == "__main__":
+    from scenes.boss import BOSS_ENCOUNTER_RULES, POWER_VICTORY_RULES
+    from scenes.ending import ENDING_RULES
+    
+    sys.exit(1 if check_rule_tables({
+        "boss encounter": BOSS_ENCOUNTER_RULES,
+        "power victory": POWER_VICTORY_RULES,
+        "ending": ENDING_RULES
+    }) else 0)
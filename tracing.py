@@ -0,0 +1,165 @@
+"""
+Tracing for Mystic Quest
+========================
+Lightweight spans around scenes, renders, saves and input waits, to find
+where players and the engine spend their time.
+
+Tracing is off by default and a disabled span costs one attribute check.
+Set MYSTIC_QUEST_TRACE to a file path to trace a whole run: spans are
+written there as JSON lines on exit and a summary is printed.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+
+class NullSpan:
+    """Span used while tracing is disabled; does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    """A timed section of work, nested under whatever span was open."""
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        stack = self.tracer.open_spans()
+        self.parent = stack[-1].span_id if stack else None
+        self.span_id = next(self.tracer.span_ids)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        self.tracer.open_spans().pop()
+        record = {
+            "id": self.span_id,
+            "parent": self.parent,
+            "name": self.name,
+            "start": self.start - self.tracer.started,
+            "duration": duration,
+            "thread": threading.get_ident()
+        }
+        if exc_type:
+            record["error"] = exc_type.__name__
+        if self.attributes:
+            record["attributes"] = self.attributes
+        self.tracer.records.append(record)
+        return False
+
+    def set(self, **attributes):
+        """Attach attributes found out while the span is open."""
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Collects spans in memory until they are exported."""
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self.started = time.perf_counter()
+        self.span_ids = iter(range(1, 1 << 62))
+        self.local = threading.local()
+
+    def enable(self):
+        """Start recording spans."""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans; recorded ones are kept."""
+        self.enabled = False
+
+    def open_spans(self):
+        """Get this thread's stack of open spans."""
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def span(self, name, **attributes):
+        """Open a span, for use as a context manager."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attributes)
+
+    def export_jsonl(self, path):
+        """Write every recorded span to a JSON-lines file."""
+        with open(path, 'w') as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+    def summary(self):
+        """Aggregate spans by name: count, total, mean, p50, p95 and max seconds."""
+        durations = {}
+        for record in self.records:
+            durations.setdefault(record["name"], []).append(record["duration"])
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "total": sum(values),
+                "mean": sum(values) / len(values),
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max": values[-1]
+            }
+        return summary
+
+    def format_summary(self):
+        """Get the summary as a table, slowest total first."""
+        summary = self.summary()
+        lines = [f"{'span':<32} {'count':>7} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{name:<32} {stats['count']:>7} {stats['total']:>9.3f} "
+                         f"{stats['mean'] * 1000:>9.2f} {stats['p95'] * 1000:>9.2f} {stats['max'] * 1000:>9.2f}")
+        return "\n".join(lines)
+
+
+TRACER = Tracer()
+
+
+def traced(name):
+    """Decorate a function so each call is a span when tracing is enabled."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+            with Span(TRACER, name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def export_trace(path):
+    """Write the trace file and print the summary, at exit."""
+    TRACER.export_jsonl(path)
+    print(f"\n📈 Trace of {len(TRACER.records)} spans written to {path}")
+    print(TRACER.format_summary())
+
+
+if os.environ.get("MYSTIC_QUEST_TRACE"):
+    TRACER.enable()
+    atexit.register(export_trace, os.environ["MYSTIC_QUEST_TRACE"])
@@ -0,0 +1,309 @@
+"""
+World Map for Mystic Quest
+==========================
+The places of the world as a graph of roads, each road taking some game
+hours to travel. Routes are planned with A*, estimating the hours left from
+the straight-line distance between map positions, and are cached until the
+map changes.
+
+The SceneRouter sends a scene's result on to the next stop, so the story
+scenes chain together as the player travels.
+"""
+
+import heapq
+import importlib
+import math
+from types import MappingProxyType
+
+
+class WorldMap:
+    """Locations joined by roads with travel times in game hours.
+
+    Every change to the map bumps ``version``; cached routes are only
+    reused while the version they were planned for is current.
+    """
+
+    def __init__(self):
+        self.locations = {}  # Location id -> {"name", "position", "scene", "destination"}
+        self.roads = {}  # Adjacency index: location id -> {neighbour: hours}
+        self.version = 0
+        self.route_cache = {}
+        self.cache_version = 0
+        self.hours_per_distance = None
+
+    def add_location(self, location_id, name, position, scene=None, destination=True):
+        """Add a location at an (x, y) map position.
+
+        ``scene`` is the dotted path of the scene class played on arrival;
+        locations that are not destinations cannot be picked to travel to.
+        """
+        if location_id in self.locations:
+            raise ValueError(f"Location {location_id} is already on the map")
+        self.locations[location_id] = {
+            "name": name,
+            "position": tuple(position),
+            "scene": scene,
+            "destination": destination
+        }
+        self.roads[location_id] = {}
+        self.version += 1
+
+    def add_road(self, start, end, hours, two_way=True):
+        """Join two locations with a road taking the given game hours."""
+        self.check_location(start)
+        self.check_location(end)
+        if hours <= 0:
+            raise ValueError(f"Road from {start} to {end} must take some time")
+        self.roads[start][end] = hours
+        if two_way:
+            self.roads[end][start] = hours
+        self.version += 1
+
+    def remove_road(self, start, end, two_way=True):
+        """Remove the road between two locations."""
+        self.roads[start].pop(end, None)
+        if two_way:
+            self.roads[end].pop(start, None)
+        self.version += 1
+
+    def check_location(self, location_id):
+        """Raise ValueError if a location is not on the map."""
+        if location_id not in self.locations:
+            raise ValueError(f"Unknown location: {location_id}")
+
+    def name(self, location_id):
+        """Get a location's display name."""
+        return self.locations[location_id]["name"]
+
+    def neighbours(self, location_id):
+        """Get {neighbour: hours} for the roads leaving a location."""
+        self.check_location(location_id)
+        return MappingProxyType(self.roads[location_id])
+
+    def cached(self, key, plan):
+        """Get a cached route query, planning it if the map changed since."""
+        if self.cache_version != self.version:
+            self.route_cache.clear()
+            self.hours_per_distance = None
+            self.cache_version = self.version
+        if key not in self.route_cache:
+            self.route_cache[key] = plan()
+        return self.route_cache[key]
+
+    def distance(self, start, end):
+        """Get the straight-line distance between two locations."""
+        (x1, y1), (x2, y2) = self.locations[start]["position"], self.locations[end]["position"]
+        return math.hypot(x2 - x1, y2 - y1)
+
+    def estimate(self, start, goal):
+        """Estimate the hours from start to goal without overestimating.
+
+        Distance is scaled by the fewest hours per unit of distance of any
+        road, so no route can beat the estimate.
+        """
+        if self.hours_per_distance is None:
+            ratios = [hours / self.distance(start_id, end_id)
+                      for start_id, ends in self.roads.items()
+                      for end_id, hours in ends.items() if self.distance(start_id, end_id)]
+            self.hours_per_distance = min(ratios, default=0)
+        return self.distance(start, goal) * self.hours_per_distance
+
+    def shortest_route(self, start, goal):
+        """Get (hours, [locations]) for the quickest route, or None if unreachable."""
+        self.check_location(start)
+        self.check_location(goal)
+        return self.cached(("route", start, goal), lambda: self.plan_route(start, goal))
+
+    def plan_route(self, start, goal):
+        """Plan a route with A* search."""
+        best_hours = {start: 0}
+        previous = {}
+        frontier = [(self.estimate(start, goal), 0, start)]
+        while frontier:
+            _, hours, location = heapq.heappop(frontier)
+            if location == goal:
+                path = [goal]
+                while path[-1] != start:
+                    path.append(previous[path[-1]])
+                return hours, path[::-1]
+            if hours > best_hours[location]:
+                continue  # Stale entry
+            for neighbour, road_hours in self.roads[location].items():
+                arrival = hours + road_hours
+                if arrival < best_hours.get(neighbour, math.inf):
+                    best_hours[neighbour] = arrival
+                    previous[neighbour] = location
+                    heapq.heappush(frontier, (arrival + self.estimate(neighbour, goal), arrival, neighbour))
+        return None
+
+    def travel_times(self, start):
+        """Get {location: hours} to every reachable location, with Dijkstra's algorithm."""
+        self.check_location(start)
+        return self.cached(("times", start), lambda: self.plan_travel_times(start))
+
+    def plan_travel_times(self, start):
+        """Find the quickest hours from start to every location."""
+        best_hours = {start: 0}
+        frontier = [(0, start)]
+        while frontier:
+            hours, location = heapq.heappop(frontier)
+            if hours > best_hours[location]:
+                continue
+            for neighbour, road_hours in self.roads[location].items():
+                arrival = hours + road_hours
+                if arrival < best_hours.get(neighbour, math.inf):
+                    best_hours[neighbour] = arrival
+                    heapq.heappush(frontier, (arrival, neighbour))
+        return MappingProxyType(best_hours)
+
+
+# Location id -> (name, position, scene class, destination)
+WORLD_LOCATIONS = {
+    "willowmere": ("Willowmere Village", (0, 0), None, True),
+    "enchanted_forest": ("Enchanted Forest", (3, 2), "scenes.forest.ForestScene", True),
+    "crystal_cave": ("Crystal Cave", (4, -3), "scenes.cave.CaveScene", True),
+    "crystal_depths": ("Crystal Depths", (5, -5), "scenes.dungeon.DungeonScene", True),
+    "adventurer_crossroads": ("Adventurer's Crossroads", (6, 0),
+                              "scenes.adventurer_crossroads.AdventurerCrossroadsScene", True),
+    "mystical_library": ("Mystical Library", (9, 3), "scenes.mystical_library.MysticalLibraryScene", True),
+    "treasure_chamber": ("Treasure Chamber", (10, -2), "scenes.treasure.TreasureScene", True),
+    "time_nexus": ("Time Nexus", (13, 4), "scenes.time_nexus.TimeNexusScene", True),
+    "shadow_guardian_lair": ("Shadow Guardian's Lair", (14, -1), "scenes.boss.BossScene", False)
+}
+
+# (start, end, hours); every road runs both ways
+WORLD_ROADS = [
+    ("willowmere", "enchanted_forest", 4),
+    ("willowmere", "crystal_cave", 5),
+    ("willowmere", "adventurer_crossroads", 6),
+    ("enchanted_forest", "adventurer_crossroads", 3),
+    ("enchanted_forest", "mystical_library", 7),
+    ("crystal_cave", "adventurer_crossroads", 4),
+    ("crystal_cave", "crystal_depths", 2),
+    ("crystal_cave", "treasure_chamber", 7),
+    ("adventurer_crossroads", "mystical_library", 4),
+    ("adventurer_crossroads", "treasure_chamber", 5),
+    ("mystical_library", "time_nexus", 5),
+    ("treasure_chamber", "shadow_guardian_lair", 4),
+    ("time_nexus", "shadow_guardian_lair", 6)
+]
+
+START_LOCATION = "willowmere"
+
+# Route target that plays the ending where the player stands
+JOURNEYS_END = "journeys_end"
+
+# (location, scene result) -> next stop; "*" matches any result.
+# Results without a route leave the player where they are.
+SCENE_ROUTES = {
+    ("enchanted_forest", "boss"): "shadow_guardian_lair",
+    ("crystal_cave", "boss"): "shadow_guardian_lair",
+    ("shadow_guardian_lair", "*"): JOURNEYS_END,
+    ("mystical_library", "library_studied"): "time_nexus",
+    ("mystical_library", "secrets_discovered"): "treasure_chamber",
+    ("time_nexus", "temporal_energy_absorbed"): "shadow_guardian_lair",
+    ("time_nexus", "dragon_blessed"): "shadow_guardian_lair",
+    ("adventurer_crossroads", "magical_collaboration"): "mystical_library",
+    ("treasure_chamber", "cursed"): "shadow_guardian_lair"
+}
+
+
+def build_world_map(locations=WORLD_LOCATIONS, roads=WORLD_ROADS):
+    """Build a world map from location and road tables."""
+    world_map = WorldMap()
+    for location_id, (name, position, scene, destination) in locations.items():
+        world_map.add_location(location_id, name, position, scene, destination)
+    for start, end, hours in roads:
+        world_map.add_road(start, end, hours)
+    return world_map
+
+
+# The world is shared by every session; players only differ in where they are
+WORLD_MAP = build_world_map()
+
+
+class TravelSystem:
+    """The player's place on the world map and the journeys between places."""
+
+    def __init__(self, systems, world_map=WORLD_MAP):
+        self.systems = systems
+        self.world_map = world_map
+        self.location = START_LOCATION
+
+    def initialize(self):
+        """Start the player in the village."""
+        self.location = START_LOCATION
+
+    def location_name(self):
+        """Get the name of the player's current location."""
+        return self.world_map.name(self.location)
+
+    def is_instant(self):
+        """Check whether the teleport spell makes the next journey instant."""
+        return self.systems.effect_system.is_active("instant_travel")
+
+    def destinations(self):
+        """Get [(location id, hours)] for places the player can travel to, nearest first."""
+        locations = self.world_map.locations
+        times = self.world_map.travel_times(self.location)
+        return sorted(((location_id, hours) for location_id, hours in times.items()
+                       if location_id != self.location and locations[location_id]["destination"]),
+                      key=lambda destination: (destination[1], destination[0]))
+
+    def travel(self, destination):
+        """Travel to a location, advancing game time by the route's hours.
+
+        Returns (hours, path, fired events). An active instant_travel effect
+        makes the journey take no time and is used up.
+        """
+        route = self.world_map.shortest_route(self.location, destination)
+        if route is None:
+            raise ValueError(f"No road leads from {self.location} to {destination}")
+        hours, path = route
+        if self.is_instant():
+            hours = 0
+            self.systems.effect_system.end_effect("instant_travel")
+        fired_events = self.systems.time_system.advance_time(hours)
+        self.location = destination
+        return hours, path, fired_events
+
+
+class SceneRouter:
+    """Sends each scene's result on to the next stop of the journey."""
+
+    def __init__(self, routes=SCENE_ROUTES, world_map=WORLD_MAP):
+        for (location, _), stop in routes.items():
+            world_map.check_location(location)
+            if stop != JOURNEYS_END:
+                world_map.check_location(stop)
+        self.routes = routes
+        self.world_map = world_map
+        self.scene_classes = {}
+
+    def next_stop(self, location, result):
+        """Get the stop a scene result leads to, or None to stay put."""
+        stop = self.routes.get((location, result))
+        if stop is None:
+            stop = self.routes.get((location, "*"))
+        return stop
+
+    def scene_class(self, location):
+        """Get the scene class played at a location, or None."""
+        if location not in self.scene_classes:
+            path = self.world_map.locations[location]["scene"]
+            scene_class = None
+            if path:
+                module_name, class_name = path.rsplit(".", 1)
+                scene_class = getattr(importlib.import_module(module_name), class_name)
+            self.scene_classes[location] = scene_class
+        return self.scene_classes[location]
+
+    def play(self, game_engine, location):
+        """Play the scene at a location and return its result, or None if it has none."""
+        scene_class = self.scene_class(location)
+        if scene_class is None:
+            return None
+        return scene_class(game_engine).play()
+
+
+SCENE_ROUTER = SceneRouter()